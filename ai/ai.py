@@ -1,90 +1,770 @@
 import time
+import threading
+import multiprocessing
 
+from concurrent.futures import CancelledError, ProcessPoolExecutor
 from random import Random
-from .heuristics import KatsHeuristic
+from .heuristics import KatsHeuristic, IncrementalHeuristic, BatchHeuristic, DEFAULT_WEIGHTS, np
+from .transposition import *
+from .opening_book import OpeningBook
+from .evaluation_cache import EvaluationCache
+from .search_stats import SearchStats
 from board_state.state_space_generator import *
+from board_state.bitboard_generator import BitboardGenerator
+
+# the move generators the search can use. The bitboard generator generates the same moves about twice as fast when
+# every move is generated (see engine/perft.py), but in the search it generates the quiet moves in a different order,
+# which searches more nodes, so the compact generator is the default.
+GENERATOR_BACKENDS = {"compact": StateSpaceGenerator, "bitboard": BitboardGenerator}
+
+# the algorithms the search can use, see Minimax.search_node
+SEARCH_ALGORITHMS = ("alpha_beta", "pvs")
+
+# the time, in seconds, the search leaves of the turn timer to apply its move
+TURN_TIMER_RESERVE = 1
+
+# the half width of the window around the previous iteration's value the first root move is searched with by pvs
+ASPIRATION_WINDOW = 25
+
+# the most plies of sumitos pushing a game piece off searched past the depth of the iteration by the quiescence search
+QUIESCENCE_DEPTH = 4
+
+# the number of the opponent's likeliest replies searched while pondering, and the depth of the search predicting them
+PONDER_REPLIES = 2
+PONDER_PREDICTION_DEPTH = 2
+
+# the bound of a value stored in the transposition table from the perspective of the other turn_color
+FLIPPED_BOUND = {EXACT: EXACT, LOWER_BOUND: UPPER_BOUND, UPPER_BOUND: LOWER_BOUND}
 
 
 class Minimax:
 
-    def __init__(self, max_depth=3):
-        self.max_depth = max_depth
+    def __init__(self, max_depth=10, tt_size_mb=16, workers=0, weights=None, backend="compact",
+                 batch_evaluation=False, move_ordering=True, search="pvs",
+                 quiescence=True, opening_book=None, profile=False, stats_path=None,
+                 eval_cache_entries=0):
+        self.max_depth = max_depth  # the deepest iteration of the iterative deepening search
+        self.weights = weights  # the weights of the heuristic, or None for the default weights
+        self.backend = backend  # the name of the move generator in GENERATOR_BACKENDS
+        self.search = search  # the algorithm in SEARCH_ALGORITHMS
+        self.search_depth = 1  # the depth of the current iteration
+        self.aspiration_value = None  # the value of the previous iteration's best move, the center of pvs' window
+        self.quiescence = quiescence  # if sumitos are searched past the depth of the iteration, see quiescence_search
+        # the most a sumito can raise the value of a position, besides the game piece it may push off, for delta pruning
+        weights = DEFAULT_WEIGHTS if weights is None else weights
+        self.delta_margin = 5 * weights["push"] + 2 * weights["center"] + 4 * weights["group"]
+        self.capture_value = weights["score"]
         self.pruned = 0
+        self.generator = None  # walks the search tree by applying and undoing moves on a single board
+        self.evaluator = None  # keeps the heuristic's terms up to date with the generator's board
+        # evaluates the leaves below each node one ply above them together, see search_frontier (requires numpy). The
+        # leaves of the quiescence search are its stand pat values, evaluated one at a time, so the two can't be combined
+        if batch_evaluation and quiescence:
+            raise ValueError("batch_evaluation requires quiescence=False")
+        self.batch_evaluator = BatchHeuristic(weights) if batch_evaluation else None
+        # the values of the leaves evaluated, kept between searches, or None if eval_cache_entries is 0. The incremental
+        # evaluator takes about as long as a lookup in the cache, so the cache only pays off for a more expensive
+        # evaluation and is off by default, see get_value
+        self.evaluation_cache = EvaluationCache(eval_cache_entries) if eval_cache_entries > 0 else None
+
+        # moves that caused beta cutoffs are searched first at other nodes, see order_moves
+        self.move_ordering = move_ordering
+        self.killer_moves = []  # the two latest quiet moves that caused a cutoff at each depth
+        self.history = {}  # the cutoffs caused by each (cells, direction) of a quiet move, weighted by the depth left
+        self.transposition_table = TranspositionTable(tt_size_mb)
+        self.tt_stats = None  # transposition table counters of the latest search
+        self.stats = None  # the SearchStats of the latest search
+        self.stats_path = stats_path  # the file the stats of each search are appended to as a JSON line, or None
+        self.profile = profile  # if the move generation, evaluation, and make/unmake are timed, see profile_search
+        if profile:
+            self.profile_search()
+        self.root_color = None
+        self.timed_out = False  # set when the turn timer cuts a search short, so its values aren't stored
+        self.stop_event = threading.Event()  # set from another thread to stop the search, see stop
+        self.completed_depth = 0  # the depth of the last completed iteration of the latest search
+        self.root_values = {}  # the value of each root move from the last completed iteration of the latest search
+
+        # the book moves are played instead of searching, see probe_opening_book
+        self.opening_book_path = opening_book  # the path of the opening book, or None
+        self.opening_book = None  # the OpeningBook, opened by the first search
+        self.book_move = False  # set when the latest move was played from the opening book
+
+        # the root moves are split across a process pool if workers is greater than 0, see search_root_in_parallel
+        self.workers = workers
+        self.executor = None
+        self.shared_alpha = None  # the best root value found by any of the workers during the current iteration
+        self.shared_stop = None  # set with stop_event, so the workers stop their root moves too, see stop
+        self.root_futures = []  # the futures of the root moves of the current iteration, cancelled by stop
 
     def alpha_beta(self, state):
-        self.pruned = 0
-        a, b, value = float('-inf'), float('inf'), float('-inf')
-        generator = StateSpaceGenerator(state[1], state[2])
-        next_states = generator.run_generation()
-        next_states_values_dict = {}
-        for next_state in next_states:
-            # print(next_state[0])
-            next_depth_state = next_state[0], next_state[1], self.get_opposite_color(state[2]), state[3] + 1
-            #print("min start", (time.perf_counter() - state[4]))
-            value = max(value, self.min_value(next_depth_state, a, b, state[4], state[5]))
-            #print("min END", (time.perf_counter() - state[4]))
-            a = max(a, value)
-            next_states_values_dict.update({value: next_depth_state})
-            time_taken = time.perf_counter() - state[4]
-            #print(" ",time_taken)
-            if time_taken + 1 > state[5]:
+        """
+        Searches for the AI's move using iterative deepening, starting from a depth of 1 and searching one ply
+        deeper each iteration until the turn timer, less a second to apply the move, would be exceeded. The best move
+        from the last completed iteration is played, and each iteration searches the previous iteration's best moves
+        first.
+        :param state: a list, of the move, game board, turn_color, depth, start time, and turn timer
+        :return: a tuple, of the move in move notation, the updated game board, and the SearchStats of the search
+        """
+        start, time_limit = state[4], state[5]
+        self.reset_search()
+
+        conversion_start = time.perf_counter()
+        board = CompactBoard.from_game_board(state[1])  # the search is performed on the compact board
+        self.stats.times["conversion"] += time.perf_counter() - conversion_start
+        self.set_root(board, state[2])
+        root_moves = list(self.generator.iter_moves())
+
+        book_move = self.probe_opening_book(root_moves)
+        if book_move is not None:
+            return self.finish_search(state, book_move, None, start)
+
+        options = [(None, root_moves[0])]
+        previous_iteration_time = None
+        for depth in range(1, self.max_depth + 1):
+            iteration_start = time.perf_counter()
+            self.search_depth = depth
+            if self.workers > 0:
+                move_values = self.search_root_in_parallel(state, root_moves, start, time_limit)
+            else:
+                move_values = self.search_root(state, root_moves, start, time_limit)
+
+            if self.timed_out:
+                # an incomplete iteration is only used if no iteration was completed
+                if self.completed_depth == 0 and move_values:
+                    options = self.get_best_options(move_values)
+                break
+
+            options = self.get_best_options(move_values)
+            self.completed_depth = depth
+            self.root_values = move_values
+            self.aspiration_value = options[0][0]
+
+            # orders the root moves from best to worst for the next iteration, principal variation first
+            root_moves.sort(key=lambda move: move_values[move], reverse=True)
+            iteration_time = time.perf_counter() - iteration_start
+            self.stats.complete_iteration(iteration_time)
+
+            # predicts the time of the next iteration from the growth of the search time between iterations
+            if previous_iteration_time:
+                branching_factor = iteration_time / previous_iteration_time
+            else:
+                branching_factor = len(root_moves)
+            previous_iteration_time = max(iteration_time, 1e-6)
+            time_taken = time.perf_counter() - start
+            if time_taken + iteration_time * branching_factor + TURN_TIMER_RESERVE > time_limit:
                 break
 
-        # print([x for x, y in next_states_values_dict.items()])
-        max_val = min([x for x in next_states_values_dict.keys()])  # finds the lowest valued item in list
-        options = [x for x in next_states_values_dict.items() if
-                   x[0] == max_val]  # finds all item with same value as max_val
-        # print(options)
         choice = self.random_choice(options)  # randomly selects move from options
         #print(self.pruned)  # prints number of nodes pruned
-        return choice[1][0], choice[1][1]  # returns updated game board to game.py on line 249 within game.py
+        return self.finish_search(state, choice[1], choice[0], start)
+
+    def finish_search(self, state, move, value, start):
+        """
+        Fills in the stats of the search, and writes them to the stats file if there is one.
+        :param state: a list, of the move, game board, turn_color, depth, start time, and turn timer
+        :param move: a tuple, of the move played
+        :param value: the value of the move, or None if it wasn't searched
+        :param start: a float, the start time of the turn
+        :return: a tuple, of the move in move notation, the updated game board, and the SearchStats of the search
+        """
+        conversion_start = time.perf_counter()
+        updated_board = self.generator.get_child_board(move).to_game_board(state[1])
+        self.stats.times["conversion"] += time.perf_counter() - conversion_start
+
+        self.tt_stats = self.transposition_table.get_stats()
+        stats = self.stats
+        stats.tt = self.tt_stats
+        if self.evaluation_cache is not None:
+            stats.eval_cache = self.evaluation_cache.get_stats()
+        stats.pruned = self.pruned
+        stats.color = state[2]
+        stats.move = self.generator.get_move_notation(move)
+        stats.value = value
+        stats.completed_depth = self.completed_depth
+        stats.book_move = self.book_move
+        stats.time_taken = time.perf_counter() - start
+        if self.stats_path is not None:
+            stats.write_json_line(self.stats_path)
+
+        # returns the move in move notation and the updated game board to game.py on line 249 within game.py
+        return stats.move, updated_board, stats
+
+    def reset_search(self):
+        """
+        Resets the counters, killer moves, and history scores of the search before searching a new position.
+        """
+        self.pruned = 0
+        self.timed_out = False
+        self.completed_depth = 0
+        self.root_values = {}
+        self.book_move = False
+        self.aspiration_value = None
+        self.transposition_table.reset_stats()
+        if self.evaluation_cache is not None:
+            self.evaluation_cache.reset_stats()
+        self.killer_moves = [[None, None] for _ in range(self.max_depth + 1)]
+        self.history = {}
+        self.stats = SearchStats(self.max_depth + QUIESCENCE_DEPTH)
+
+    def get_settings(self):
+        """
+        Gets the settings the search was created with, to create the same search again, or in another process.
+        :return: a dictionary, of the keyword arguments of Minimax
+        """
+        return {"max_depth": self.max_depth, "tt_size_mb": self.transposition_table.size_mb, "weights": self.weights,
+                "backend": self.backend, "batch_evaluation": self.batch_evaluator is not None,
+                "move_ordering": self.move_ordering, "search": self.search,
+                "quiescence": self.quiescence, "opening_book": self.opening_book_path, "profile": self.profile,
+                "eval_cache_entries": self.evaluation_cache.entries if self.evaluation_cache is not None else 0,
+                "workers": self.workers, "stats_path": self.stats_path}
+
+    def probe_opening_book(self, root_moves):
+        """
+        Looks up the root board in the opening book. The book move is only played if it's one of the root moves, in
+        case of a collision between position hashes.
+        :param root_moves: a list, of the moves for the AI
+        :return: a tuple, of the book move, or None if the root board isn't in the book
+        """
+        if self.opening_book_path is None:
+            return None
+        if self.opening_book is None:
+            self.opening_book = OpeningBook(self.opening_book_path)
+
+        entry = self.opening_book.probe(self.generator.board.zobrist)
+        if entry is None or entry[0] not in root_moves:
+            return None
+        self.book_move = True
+        return entry[0]
+
+    def search_root(self, state, root_moves, start, time_limit):
+        """
+        Searches each of the root moves to the depth of the current iteration. With pvs, the first root move is
+        searched with an aspiration window around the previous iteration's value, and the other root moves are first
+        searched with a null window to prove that they're worse than the best move so far.
+        :param state: a list, of the move, game board, turn_color, depth, start time, and turn timer
+        :param root_moves: a list, of the moves for the AI
+        :param start: a float, the start time of the turn
+        :param time_limit: an int, the turn timer
+        :return: a dictionary, of the value of each root move searched
+        """
+        move_values = {}
+        value = float('-inf')
+        for next_move in root_moves:
+            # print(next_move)
+            if self.search != "pvs":
+                next_value = self.search_root_move(next_move, value - 1, float('inf'), start, time_limit)
+            elif not move_values:
+                next_value = self.search_root_move_in_window(next_move, start, time_limit)
+            else:
+                # moves of equal value to the best move are re-searched for an exact value for the tie break
+                next_value = self.search_root_move(next_move, value - 1, value, start, time_limit)
+                if next_value >= value:
+                    next_value = self.search_root_move(next_move, value - 1, float('inf'), start, time_limit)
+
+            if self.timed_out:
+                break
+            move_values[next_move] = next_value
+            value = max(value, next_value)
+
+            if self.is_out_of_time(start, time_limit):
+                break
+
+        return move_values
+
+    def search_root_move(self, move, a, b, start, time_limit):
+        """
+        Searches a root move to the depth of the current iteration.
+        :param move: a tuple, of the root move
+        :param a: the alpha bound, 1 below the best value found for the other root moves searched so far, so moves of
+                  equal value get exact values for the tie break
+        :param b: the beta bound
+        :param start: a float, the start time of the turn
+        :param time_limit: an int, the turn timer
+        :return: the value of the move, exact if it's within the window
+        """
+        undo = self.apply_move(move)
+        depth_state = move, self.generator.board, self.get_opposite_color(self.root_color), 1
+        value = self.search_node(depth_state, a, b, start, time_limit)
+        self.undo_move(undo)
+        return value
+
+    def search_root_move_in_window(self, move, start, time_limit):
+        """
+        Searches the first root move with an aspiration window around the previous iteration's value, and searches it
+        again with a full window if its value falls outside of the aspiration window.
+        :param move: a tuple, of the root move
+        :param start: a float, the start time of the turn
+        :param time_limit: an int, the turn timer
+        :return: the exact value of the move
+        """
+        if self.aspiration_value is not None:
+            a = self.aspiration_value - ASPIRATION_WINDOW
+            b = self.aspiration_value + ASPIRATION_WINDOW
+            value = self.search_root_move(move, a, b, start, time_limit)
+            if a < value < b:
+                return value
+        return self.search_root_move(move, float('-inf'), float('inf'), start, time_limit)
+
+    def search_node(self, depth_state, a, b, start, time_limit):
+        """
+        Searches the position with the search's algorithm, either the max_value and min_value pair of alpha-beta or
+        principal_variation_search.
+        :param depth_state: a tuple, of the move, board, turn_color, and depth of the position
+        :param a: the alpha bound
+        :param b: the beta bound
+        :param start: a float, the start time of the turn
+        :param time_limit: an int, the turn timer
+        :return: the value of the position from the perspective of the AI's turn_color
+        """
+        maximizing = depth_state[2] == self.root_color
+        if self.search == "pvs":
+            if maximizing:
+                return self.principal_variation_search(depth_state, a, b, 1, start, time_limit)
+            return -self.principal_variation_search(depth_state, -b, -a, -1, start, time_limit)
+
+        if maximizing:
+            return self.max_value(depth_state, a, b, start, time_limit)
+        return self.min_value(depth_state, a, b, start, time_limit)
+
+    def search_root_in_parallel(self, state, root_moves, start, time_limit):
+        """
+        Searches each of the root moves to the depth of the current iteration, split across a process pool. Each root
+        move is searched by the next free worker in the order of the root moves, with the best value found by any
+        worker so far as its alpha bound. The values of the root moves that can be the best move are exact regardless
+        of which worker searched them, so the best moves are the same as the serial search.
+        :param state: a list, of the move, game board, turn_color, depth, start time, and turn timer
+        :param root_moves: a list, of the moves for the AI
+        :param start: a float, the start time of the turn
+        :param time_limit: an int, the turn timer
+        :return: a dictionary, of the value of each root move searched
+        """
+        if self.executor is None:
+            self.shared_alpha = multiprocessing.Value('d', float('-inf'))
+            self.shared_stop = multiprocessing.Event()
+            # the workers search serially, and their searches are part of this search's stats
+            worker_settings = dict(self.get_settings(), workers=0, stats_path=None)
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_initialize_worker,
+                                                initargs=(worker_settings, self.shared_alpha, self.shared_stop))
+        self.shared_alpha.value = float('-inf')
+        if self.stop_event.is_set():
+            self.shared_stop.set()
+        else:
+            self.shared_stop.clear()
+
+        # the processes don't share the turn's start time, so the end of the turn is passed as a wall clock time
+        deadline = time.time() + time_limit - (time.perf_counter() - start)
+        cells = bytes(self.generator.board.cells)
+        futures = [self.executor.submit(_search_root_move_in_worker, cells, state[2], self.search_depth, move,
+                                        deadline) for move in root_moves]
+        self.root_futures = futures
+
+        move_values = {}
+        for future in futures:
+            try:
+                move, value, timed_out, pruned, worker_stats = future.result()
+            except CancelledError:  # the search was stopped before the worker started the root move
+                self.timed_out = True
+                break
+            # the parent's transposition table isn't probed, its counters are the sum of the workers' counters
+            self.pruned += pruned
+            self.stats.add_worker_stats(worker_stats)
+            self.transposition_table.add_stats(worker_stats.tt)
+            if timed_out:
+                self.timed_out = True
+                break
+            move_values[move] = value
+
+        # the remaining root moves aren't searched once a worker has run out of time
+        for future in futures:
+            future.cancel()
+        self.root_futures = []
+
+        return move_values
+
+    def close(self):
+        """
+        Shuts down the process pool of the parallel root search, if one was started, and closes the opening book.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+        if self.opening_book is not None:
+            self.opening_book.close()
+            self.opening_book = None
+
+    def set_root(self, board, color, turn=None):
+        """
+        Sets up the search's generator and evaluator for the root board.
+        :param board: a CompactBoard, of the root board
+        :param color: a string, the AI's turn_color
+        :param turn: a string, the turn_color of the player to move, or None if it's the AI
+        """
+        # values are stored relative to the AI's turn_color, so they can't be reused when searching for the other color
+        if color != self.root_color:
+            self.transposition_table.clear()
+            self.root_color = color
+
+        self.generator = GENERATOR_BACKENDS[self.backend](board, color if turn is None else turn)
+        self.evaluator = IncrementalHeuristic(self.generator.board, self.weights)
+
+    @staticmethod
+    def get_best_options(move_values):
+        """
+        Gets all of the moves with the best value.
+        :param move_values: a dictionary, of the value of each root move
+        :return: a list, of (value, move) tuples
+        """
+        max_val = max(move_values.values())
+        return [(value, move) for move, value in move_values.items() if value == max_val]
+
+    def is_out_of_time(self, start, time_limit):
+        """
+        Checks if the search has to stop to leave TURN_TIMER_RESERVE of the turn timer to apply the move, or was asked
+        to stop by another thread, and if so flags the search as timed out.
+        :param start: a float, the start time of the turn
+        :param time_limit: an int, the turn timer
+        :return: a boolean
+        """
+        if time.perf_counter() - start + TURN_TIMER_RESERVE > time_limit or self.stop_event.is_set():
+            self.timed_out = True
+        return self.timed_out
+
+    def stop(self):
+        """
+        Asks the search running on another thread to stop. A search for a move stops as if the turn timer ran out,
+        playing the best move of the last completed iteration. The workers of a parallel root search stop the root
+        moves they're searching, and the root moves they haven't started are cancelled.
+        """
+        self.stop_event.set()
+        if self.shared_stop is not None:
+            self.shared_stop.set()
+        for future in self.root_futures:
+            future.cancel()
+
+    def ponder(self, board, color, replies=PONDER_REPLIES):
+        """
+        Searches the position while the opponent is thinking about its move, until it's stopped or the max depth is
+        reached. The opponent's likeliest replies are predicted with a shallow search of every reply, and then the
+        position after each of the predicted replies is searched the same as the search for the AI's next move would,
+        one iteration at a time for each reply. If the opponent makes one of the predicted replies, the next search
+        finds the values of the iterations completed while pondering in the transposition table.
+        :param board: a CompactBoard, of the position after the AI's move
+        :param color: a string, the AI's turn_color
+        :param replies: an int, the number of predicted replies searched, or None to search every reply
+        """
+        self.reset_search()
+        self.set_root(board, color, self.get_opposite_color(color))
+        start = time.perf_counter()
+
+        # the opponent's likeliest replies are the worst for the AI
+        self.search_depth = PONDER_PREDICTION_DEPTH
+        reply_values = {}
+        for reply in self.generator.iter_moves():
+            undo = self.apply_move(reply)
+            depth_state = reply, self.generator.board, color, 1
+            reply_values[reply] = self.search_node(depth_state, float('-inf'), float('inf'), start, float('inf'))
+            self.undo_move(undo)
+            if self.is_out_of_time(start, float('inf')):
+                return
+        predicted_replies = sorted(reply_values, key=reply_values.get)[:replies]
+
+        root_moves = {}
+        aspiration_values = dict.fromkeys(predicted_replies)
+        for reply in predicted_replies:
+            undo = self.apply_move(reply)
+            root_moves[reply] = list(self.generator.iter_moves())
+            self.undo_move(undo)
+
+        for depth in range(1, self.max_depth + 1):
+            self.search_depth = depth
+            for reply in predicted_replies:
+                undo = self.apply_move(reply)
+                self.aspiration_value = aspiration_values[reply]
+                move_values = self.search_root(None, root_moves[reply], start, float('inf'))
+                self.undo_move(undo)
+                if self.timed_out:
+                    return
+
+                aspiration_values[reply] = max(move_values.values())
+                root_moves[reply].sort(key=lambda move: move_values[move], reverse=True)
+            self.completed_depth = depth
 
     def max_value(self, depth_state, a, b, start, time_limit):
+        if self.timed_out:  # the value is discarded once the search has timed out
+            return 0
+
+        self.stats.nodes[depth_state[3]] += 1
         if self.is_terminal(depth_state):  # if depth is equal to max depth
+            if self.quiescence:
+                return self.quiescence_search(depth_state, a, b, 1)
             value = self.get_value(depth_state)
             # print("Max value", value)
             return value
 
+        tt_value, a, b, tt_move = self.probe_transposition_table(depth_state, a, b)
+        if tt_value is not None:
+            return tt_value
+
+        if self.batch_evaluator is not None and depth_state[3] + 1 == self.search_depth:
+            return self.search_frontier(depth_state, True)
+
+        a_original = a
         v = float('-inf')
+        best_move = None
 
-        next_states = self.get_next_states(depth_state)
-        for next_state in next_states:
-            next_depth_state = next_state[0], next_state[1], self.get_opposite_color(depth_state[2]), depth_state[3] + 1
-            v = max(v, self.min_value(next_depth_state, a, b, start, time_limit))
+        next_moves = self.get_next_moves(tt_move, depth_state[3])
+        for index, next_move in enumerate(next_moves):
+            undo = self.apply_move(next_move)
+            next_depth_state = next_move, depth_state[1], self.get_opposite_color(depth_state[2]), depth_state[3] + 1
+            next_value = self.min_value(next_depth_state, a, b, start, time_limit)
+            self.undo_move(undo)
+            if next_value > v:
+                v = next_value
+                best_move = next_move
             if v >= b:
                 self.pruned += 1
+                self.record_cutoff(depth_state, next_move, index, tt_move)
+                self.store_in_transposition_table(depth_state, v, LOWER_BOUND, best_move)
                 return v
             a = max(a, v)
 
-            time_taken = time.perf_counter() - start
-            #print("time taken ",time_taken)
-            if time_taken + 1 > time_limit:
+            if self.is_out_of_time(start, time_limit):
                 break
+
+        self.store_in_transposition_table(depth_state, v, UPPER_BOUND if v <= a_original else EXACT, best_move)
         return v
 
     def min_value(self, depth_state, a, b, start, time_limit):
+        if self.timed_out:  # the value is discarded once the search has timed out
+            return 0
+
+        self.stats.nodes[depth_state[3]] += 1
         if self.is_terminal(depth_state):  # if depth is equal to max depth
+            if self.quiescence:
+                return -self.quiescence_search(depth_state, -b, -a, -1)
             value = self.get_value(depth_state)
             # print("Min value", value)
             return value
 
+        tt_value, a, b, tt_move = self.probe_transposition_table(depth_state, a, b)
+        if tt_value is not None:
+            return tt_value
+
+        if self.batch_evaluator is not None and depth_state[3] + 1 == self.search_depth:
+            return self.search_frontier(depth_state, False)
+
+        b_original = b
         v = float('inf')
+        best_move = None
 
-        next_states = self.get_next_states(depth_state)
-        for next_state in next_states:
-            next_depth_state = next_state[0], next_state[1], self.get_opposite_color(depth_state[2]), depth_state[3] + 1
-            v = min(v, self.max_value(next_depth_state, a, b, start, time_limit))
+        next_moves = self.get_next_moves(tt_move, depth_state[3])
+        for index, next_move in enumerate(next_moves):
+            undo = self.apply_move(next_move)
+            next_depth_state = next_move, depth_state[1], self.get_opposite_color(depth_state[2]), depth_state[3] + 1
+            next_value = self.max_value(next_depth_state, a, b, start, time_limit)
+            self.undo_move(undo)
+            if next_value < v:
+                v = next_value
+                best_move = next_move
             if v <= a:
                 self.pruned += 1
+                self.record_cutoff(depth_state, next_move, index, tt_move)
+                self.store_in_transposition_table(depth_state, v, UPPER_BOUND, best_move)
                 return v
             b = min(b, v)
 
-            time_taken = time.perf_counter() - start
-            #print("time taken ",time_taken)
-            if time_taken + 1 > time_limit:
+            if self.is_out_of_time(start, time_limit):
                 break
+
+        self.store_in_transposition_table(depth_state, v, LOWER_BOUND if v >= b_original else EXACT, best_move)
+        return v
+
+    def search_frontier(self, depth_state, maximizing):
+        """
+        Searches a node one ply above the leaves by evaluating every one of its children in a single call to the batch
+        evaluator. The children are all evaluated, so the value is exact regardless of the alpha-beta window. A node
+        without any moves is evaluated itself.
+        :param depth_state: a tuple, of the move, board, turn_color, and depth of the node
+        :param maximizing: a boolean, True if the node is a max node
+        :return: the value of the node
+        """
+        moves = list(self.generator.iter_moves())
+        if not moves:
+            return self.get_value(depth_state)
+        self.stats.nodes[depth_state[3] + 1] += len(moves)
+        cells = self.generator.board.cells
+        root_code = COLOR_CODES[self.root_color]
+        boards = np.empty((len(moves), NUM_OF_CELLS), dtype=np.uint8)
+        pushes = np.zeros(len(moves), dtype=bool)
+
+        # only the generator's board is needed for the children, the incremental evaluator isn't updated
+        for index, move in enumerate(moves):
+            undo = self.generator.apply_move(move)
+            boards[index] = np.frombuffer(cells, dtype=np.uint8)
+            if move[3] > 0:
+                leading_code = cells[StateSpaceGenerator.get_leading_opposing_piece(move)]
+                pushes[index] = leading_code != root_code and leading_code != EMPTY
+            self.generator.undo_move(undo)
+
+        values = self.batch_evaluator.weighted_heuristic(boards, pushes, self.root_color)
+        best_index = int(values.argmax() if maximizing else values.argmin())
+        value = int(values[best_index])
+        self.store_in_transposition_table(depth_state, value, EXACT, moves[best_index])
+        return value
+
+    def principal_variation_search(self, depth_state, a, b, sign, start, time_limit):
+        """
+        Searches the position with principal variation search, in negamax form so the same function searches the
+        positions of both turn_colors. The first move is searched with the full window, and the remaining moves are
+        searched with a null window to prove that they're no better, and searched again with the full window if
+        they are.
+        :param depth_state: a tuple, of the move, board, turn_color, and depth of the position
+        :param a: the alpha bound, from the perspective of the turn_color
+        :param b: the beta bound, from the perspective of the turn_color
+        :param sign: an int, 1 if the turn_color is the AI's turn_color, otherwise -1
+        :param start: a float, the start time of the turn
+        :param time_limit: an int, the turn timer
+        :return: the value of the position from the perspective of the turn_color
+        """
+        if self.timed_out:  # the value is discarded once the search has timed out
+            return 0
+
+        self.stats.nodes[depth_state[3]] += 1
+        if self.is_terminal(depth_state):
+            if self.quiescence:
+                return self.quiescence_search(depth_state, a, b, sign)
+            return sign * self.get_value(depth_state)
+
+        # the transposition table's values are from the perspective of the AI's turn_color
+        if sign > 0:
+            tt_value, a, b, tt_move = self.probe_transposition_table(depth_state, a, b)
+        else:
+            tt_value, root_a, root_b, tt_move = self.probe_transposition_table(depth_state, -b, -a)
+            a, b = -root_b, -root_a
+        if tt_value is not None:
+            return sign * tt_value
+
+        if self.batch_evaluator is not None and depth_state[3] + 1 == self.search_depth:
+            return sign * self.search_frontier(depth_state, sign > 0)
+
+        a_original = a
+        v = float('-inf')
+        best_move = None
+
+        next_moves = self.get_next_moves(tt_move, depth_state[3])
+        for index, next_move in enumerate(next_moves):
+            undo = self.apply_move(next_move)
+            next_depth_state = next_move, depth_state[1], self.get_opposite_color(depth_state[2]), depth_state[3] + 1
+            if index == 0:
+                next_value = -self.principal_variation_search(next_depth_state, -b, -a, -sign, start, time_limit)
+            else:
+                next_value = -self.principal_variation_search(next_depth_state, -a - 1, -a, -sign, start,
+                                                              time_limit)
+                if a < next_value < b:
+                    next_value = -self.principal_variation_search(next_depth_state, -b, -next_value, -sign, start,
+                                                                  time_limit)
+            self.undo_move(undo)
+            if next_value > v:
+                v = next_value
+                best_move = next_move
+            if v >= b:
+                self.pruned += 1
+                self.record_cutoff(depth_state, next_move, index, tt_move)
+                self.store_in_transposition_table(depth_state, sign * v,
+                                                  LOWER_BOUND if sign > 0 else UPPER_BOUND, best_move)
+                return v
+            a = max(a, v)
+
+            if self.is_out_of_time(start, time_limit):
+                break
+
+        bound = UPPER_BOUND if v <= a_original else EXACT
+        self.store_in_transposition_table(depth_state, sign * v, bound if sign > 0 else FLIPPED_BOUND[bound],
+                                          best_move)
+        return v
+
+    def quiescence_search(self, depth_state, a, b, sign):
+        """
+        Searches only the sumitos that push a game piece off of the game board from a position at the depth of the
+        iteration, until none are left or QUIESCENCE_DEPTH plies past the depth of the iteration, so the value of a
+        position in the middle of an exchange of pushes isn't taken as final. The player to move can stand pat, keeping
+        the position's own value instead of making a sumito, and the sumitos aren't searched if pushing off a game piece
+        can't raise the value to alpha even with the delta_margin. Like the other searches, the position itself is counted
+        by its caller, and the search counts the positions of the sumitos it searches.
+        :param depth_state: a tuple, of the move, board, turn_color, and depth of the position
+        :param a: the alpha bound, from the perspective of the turn_color
+        :param b: the beta bound, from the perspective of the turn_color
+        :param sign: an int, 1 if the turn_color is the AI's turn_color, otherwise -1
+        :return: the value of the position from the perspective of the turn_color
+        """
+        if self.timed_out:  # the value is discarded once the search has timed out
+            return 0
+
+        stand_pat = sign * self.get_value(depth_state)
+        if stand_pat >= b or depth_state[3] >= self.search_depth + QUIESCENCE_DEPTH:
+            return stand_pat
+        if stand_pat + self.capture_value + self.delta_margin <= a:
+            return stand_pat  # not even pushing a game piece off of the game board can reach alpha
+        a = max(a, stand_pat)
+
+        v = stand_pat
+        # the sumitos that push a game piece off of the game board are generated first, the other moves never are
+        for next_move in self.get_next_moves():
+            if not self.generator.is_capture(next_move):
+                break
+
+            undo = self.apply_move(next_move)
+            next_depth_state = next_move, depth_state[1], self.get_opposite_color(depth_state[2]), depth_state[3] + 1
+            self.stats.nodes[next_depth_state[3]] += 1
+            next_value = -self.quiescence_search(next_depth_state, -b, -a, -sign)
+            self.undo_move(undo)
+            if next_value > v:
+                v = next_value
+            if v >= b:
+                return v
+            a = max(a, v)
+
         return v
 
+    def probe_transposition_table(self, depth_state, a, b):
+        """
+        Looks up the position in the transposition table. A stored value from a search at least as deep is returned if
+        it's exact or falls outside of the alpha-beta window, otherwise a stored bound narrows the window.
+        :param depth_state: a tuple, of the move, board, turn_color, and depth of the position
+        :param a: the alpha bound
+        :param b: the beta bound
+        :return: a tuple of (the stored value or None, alpha bound, beta bound, best move stored or None)
+        """
+        entry = self.transposition_table.probe(depth_state[1].zobrist)
+        if entry is None:
+            return None, a, b, None
+
+        if entry[1] >= self.search_depth - depth_state[3]:
+            if entry[3] == EXACT:
+                return entry[2], a, b, entry[4]
+            elif entry[3] == LOWER_BOUND:
+                a = max(a, entry[2])
+            else:
+                b = min(b, entry[2])
+
+            if a >= b:
+                return entry[2], a, b, entry[4]
+
+        return None, a, b, entry[4]
+
+    def store_in_transposition_table(self, depth_state, value, bound, best_move):
+        """
+        Stores the result of searching the position in the transposition table, unless the turn timer cut the search
+        short.
+        :param depth_state: a tuple, of the move, board, turn_color, and depth of the position
+        :param value: the value found for the position
+        :param bound: an int, the bound type of the value
+        :param best_move: a tuple, of the best move found
+        """
+        if not self.timed_out:
+            self.transposition_table.store(depth_state[1].zobrist, self.search_depth - depth_state[3], value, bound,
+                                           best_move)
+
     @staticmethod
     def get_opposite_color(color):
         if color == 'black':
@@ -93,21 +773,207 @@ class Minimax:
             return 'black'
 
     def is_terminal(self, depth_state):
-        if depth_state[3] == self.max_depth:
+        if depth_state[3] >= self.search_depth:
             return True
         return False
 
-    @staticmethod
-    def get_value(state):
-        return KatsHeuristic.weighted_heuristic(state)
+    def get_value(self, state):
+        """
+        Evaluates the position from the perspective of the AI's turn_color, so the values of every iteration are
+        comparable regardless of which player moves last. The score is the same as
+        KatsHeuristic.weighted_heuristic((move, board, turn_color)), using the evaluator's incrementally updated terms.
+
+        The values are cached by the position's Zobrist hash and the AI's turn_color. The push term also depends on
+        whether the last move was a sumito rewarded by push_eval, so that's part of the key too.
+        """
+        if self.evaluation_cache is None:
+            return self.evaluator.weighted_heuristic(state[0], self.root_color)
+
+        move = state[0]
+        board = self.generator.board
+        root_code = COLOR_CODES[self.root_color]
+        push = False
+        if move[3] > 0:
+            leading_code = board.cells[StateSpaceGenerator.get_leading_opposing_piece(move)]
+            push = leading_code != root_code and leading_code != EMPTY
+        key = board.zobrist << 3 | root_code << 1 | push
+
+        value = self.evaluation_cache.probe(key)
+        if value is None:
+            value = self.evaluator.weighted_heuristic(move, self.root_color)
+            self.evaluation_cache.store(key, value)
+        return value
+
+    def apply_move(self, move):
+        """
+        Applies the move to the search's board, and updates the evaluator.
+        :param move: a tuple, of the move
+        :return: a tuple, the undo record to pass to undo_move
+        """
+        undo = self.generator.apply_move(move)
+        self.evaluator.apply_move(undo[1])
+        return undo
+
+    def undo_move(self, undo):
+        """
+        Undoes a move applied with apply_move on the search's board, and restores the evaluator.
+        :param undo: a tuple, the undo record returned by apply_move
+        """
+        self.generator.undo_move(undo)
+        self.evaluator.undo_move()
 
     @staticmethod
     def random_choice(list):
         choice_index = Random.randint(Random(), 0, len(list) - 1)
         return list[choice_index]
 
-    @staticmethod
-    def get_next_states(state):
-        generator = StateSpaceGenerator(state[1], state[2])
-        next_states = generator.run_generation()
-        return next_states
+    def get_next_moves(self, first_move=None, depth=None):
+        """
+        Lazily generates the moves for the board and turn of the search's generator, so moves after a cutoff are
+        never generated. With move ordering the sumitos, and then the remaining moves, are ordered by order_moves.
+        :param first_move: a tuple, of a move to search first (e.g. the best move stored in the transposition table)
+        :param depth: an int, the depth of the node the moves are searched from
+        :return: a generator of moves
+        """
+        if self.move_ordering and depth is not None:
+            return self.generator.iter_moves(lambda moves: self.order_moves(moves, first_move, depth))
+        if first_move is None:
+            return self.generator.iter_moves()
+        return self.generator.iter_moves(lambda moves: sorted(moves, key=lambda move: move != first_move))
+
+    def order_moves(self, moves, first_move, depth):
+        """
+        Orders the moves with the first move first, then the killer moves of the depth, then the remaining moves by
+        their history score. The sort is stable, so moves of equal score keep the generator's order.
+        :param moves: a list, of the moves
+        :param first_move: a tuple, of a move to search first, or None
+        :param depth: an int, the depth of the node the moves are searched from
+        :return: a list, of the ordered moves
+        """
+        killers = self.killer_moves[depth]
+        history = self.history
+        return sorted(moves, key=lambda move: (move != first_move, move not in killers,
+                                               -history.get((move[1], move[2]), 0)))
+
+    def record_cutoff(self, depth_state, move, index, tt_move):
+        """
+        Records a move that caused a beta cutoff. A quiet move becomes a killer move of the depth, and its history
+        score is increased by the square of the depth left below the node, so cutoffs near the root count the most.
+        :param depth_state: a tuple, of the move, board, turn_color, and depth of the node
+        :param move: a tuple, of the move that caused the cutoff
+        :param index: an int, the number of moves searched before the move
+        :param tt_move: a tuple, of the best move stored in the transposition table for the node, or None
+        """
+        stats = self.stats
+        depth = depth_state[3]
+        killers = self.killer_moves[depth]
+        history_key = move[1], move[2]
+
+        stats.cutoffs += 1
+        if index == 0:
+            stats.first_move_cutoffs += 1
+        if move == tt_move:
+            stats.tt_move_cutoffs += 1
+        elif move in killers:
+            stats.killer_cutoffs += 1
+        elif history_key in self.history:
+            stats.history_cutoffs += 1
+
+        # sumitos are already searched before the quiet moves
+        if move[3] == 0:
+            if move != killers[0]:
+                killers[1] = killers[0]
+                killers[0] = move
+            depth_left = self.search_depth - depth
+            self.history[history_key] = self.history.get(history_key, 0) + depth_left * depth_left
+
+    def profile_search(self):
+        """
+        Replaces the move generation, evaluation, and make/unmake methods of the instance with ones that time them into
+        the search's stats. The time to make and unmake moves includes updating the incremental evaluator.
+        """
+        for name, category in (("get_value", "evaluation"), ("apply_move", "make_unmake"),
+                               ("undo_move", "make_unmake")):
+            setattr(self, name, self.time_method(getattr(self, name), category))
+        self.get_next_moves = self.time_moves(self.get_next_moves)
+
+    def time_method(self, method, category):
+        """
+        Wraps a method to add the time taken by each call to a time category of the search's stats.
+        :param method: a function, the bound method
+        :param category: a string, the time category in TIME_CATEGORIES
+        :return: a function
+        """
+        def timed_method(*args):
+            method_start = time.perf_counter()
+            result = method(*args)
+            self.stats.times[category] += time.perf_counter() - method_start
+            return result
+        return timed_method
+
+    def time_moves(self, method):
+        """
+        Wraps get_next_moves to add the time taken to generate each move to the search's stats, without the time spent
+        searching the moves between them.
+        :param method: a function, the bound get_next_moves method
+        :return: a function
+        """
+        def timed_moves(*args):
+            moves = method(*args)
+            while True:
+                generation_start = time.perf_counter()
+                move = next(moves, None)
+                self.stats.times["generation"] += time.perf_counter() - generation_start
+                if move is None:
+                    return
+                yield move
+        return timed_moves
+
+
+# the Minimax instance and shared alpha bound of each process of the parallel root search's process pool
+_worker_minimax = None
+_worker_alpha = None
+
+
+def _initialize_worker(settings, shared_alpha, shared_stop):
+    """
+    Creates the Minimax instance for a process of the parallel root search's process pool. The transposition table of
+    the instance is kept between the iterations and turns searched by the process.
+    :param settings: a dictionary, of the settings of the Minimax instance from Minimax.get_settings
+    :param shared_alpha: a multiprocessing.Value, of the best root value found by any of the workers
+    :param shared_stop: a multiprocessing.Event, set when the search is stopped, checked by is_out_of_time in place of
+                        the instance's own stop_event
+    """
+    global _worker_minimax, _worker_alpha
+    _worker_minimax = Minimax(**settings)
+    _worker_minimax.stop_event = shared_stop
+    _worker_alpha = shared_alpha
+
+
+def _search_root_move_in_worker(cells, color, depth, move, deadline):
+    """
+    Searches a root move within a process of the parallel root search's process pool.
+    :param cells: a bytes, of the cells of the root board
+    :param color: a string, the AI's turn_color
+    :param depth: an int, the depth of the current iteration
+    :param move: a tuple, of the root move
+    :param deadline: a float, the wall clock time of the end of the turn
+    :return: a tuple, of the move, its value, if the search timed out, the number of nodes pruned, and the SearchStats
+             of the search, with the counters of the worker's transposition table
+    """
+    minimax = _worker_minimax
+    minimax.set_root(CompactBoard(cells), color)
+    minimax.reset_search()
+    minimax.search_depth = depth
+
+    start = time.perf_counter()
+    value = minimax.search_root_move(move, _worker_alpha.value - 1, float('inf'), start, deadline - time.time())
+
+    # shares the value with the other workers, to narrow the window of the root moves they search next
+    if not minimax.timed_out:
+        with _worker_alpha.get_lock():
+            if value > _worker_alpha.value:
+                _worker_alpha.value = value
+
+    minimax.stats.tt = minimax.transposition_table.get_stats()
+    return move, value, minimax.timed_out, minimax.pruned, minimax.stats
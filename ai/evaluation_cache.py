@@ -0,0 +1,77 @@
+from collections import OrderedDict
+
+# the number of entries kept by the evaluation cache of the search by default
+DEFAULT_CACHE_ENTRIES = 1 << 16
+
+
+class EvaluationCache:
+    """
+    Encapsulates a bounded cache of the heuristic values of the leaves of the search, keyed by the Zobrist hash of the
+    position (which includes the player to move) and the turn_color the position was evaluated for.
+
+    Unlike the transposition table, the cache doesn't depend on the depth or window a position was searched with, so
+    every leaf reached again is a hit, even with the transposition table's cutoffs and move ordering turned off. Once the
+    cache is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, entries=DEFAULT_CACHE_ENTRIES):
+        self.entries = entries  # the most entries kept
+        self.values = OrderedDict()  # the value of each key, from the least to the most recently used
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def probe(self, key: int):
+        """
+        Looks up the value of a position, marking it as the most recently used.
+
+        :param key: an int, the key of the position, see Minimax.get_value
+        :return: the value of the position, or None if it isn't cached
+        """
+        value = self.values.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.values.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def store(self, key: int, value):
+        """
+        Stores the value of a position, evicting the least recently used entry if the cache is full.
+
+        :param key: an int, the key of the position
+        :param value: the value of the position
+        """
+        self.values[key] = value
+        if len(self.values) > self.entries:
+            self.values.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Removes every entry from the cache, and resets the counters.
+        """
+        self.values.clear()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Resets the hit, miss, and eviction counters.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_stats(self) -> dict:
+        """
+        Gets the counters of the cache.
+
+        :return: a dictionary, of the hits, misses, evictions, entries, and hit rate
+        """
+        probes = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self.values),
+                "hit_rate": self.hits / probes if probes else 0.0}
@@ -1,4 +1,10 @@
 from board_state.board_query import *
+from board_state.group_tracker import GroupTracker
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required by BatchHeuristic
+    np = None
 
 
 def get_opposite_color(color):
@@ -8,24 +14,166 @@ def get_opposite_color(color):
         return 'black'
 
 
+# the weights of the terms of the weighted heuristic, of the difference in game pieces, center distance, and groups,
+# and of a sumito made by the player
+DEFAULT_WEIGHTS = {"score": 50, "center": 10, "push": 25, "group": 3}
+
+
 class KatsHeuristic:
 
     @staticmethod
-    def weighted_heuristic(state):
-        score_weight = 50
-        center_weight = 10
-        push_weight = 25
-        group_weight = 3
+    def weighted_heuristic(state, weights=None):
+        weights = DEFAULT_WEIGHTS if weights is None else weights
+        score_weight = weights["score"]
+        center_weight = weights["center"]
+        push_weight = weights["push"]
+        group_weight = weights["group"]
 
         score = pieces(state[1], state[2]) - pieces(state[1], get_opposite_color(state[2]))
-        #print("Score", score)
         center_value = center(state[1], state[2]) - center(state[1], get_opposite_color(state[2]))
-        #print("centerValue ", center_value)
         group = len(groups(state[1], state[2])) - len(groups(state[1], get_opposite_color(state[2])))
-        #print('group', group)
         push = push_eval(state, center_value)
-        #print("Push", push)
         int_value = int(score_weight * score + center_weight * center_value + push_weight * push + group * group_weight)
         return int_value
 
 
+class IncrementalHeuristic:
+    """
+    Encapsulates the terms of KatsHeuristic.weighted_heuristic for a compact board that the search applies moves to
+    and undoes moves on in place. The piece counts, the sums of the distances from the center, and the groups of each
+    turn_color are updated from the spaces changed by each move, instead of scanning the board at every leaf.
+
+    The groups are kept by a GroupTracker, which joins groups as game pieces are placed and only searches the group of a
+    game piece that's removed.
+    """
+
+    def __init__(self, board: CompactBoard, weights=None):
+        self.board = board
+        self.weights = DEFAULT_WEIGHTS if weights is None else weights
+        self.piece_counts = [0, 0, 0]  # indexed by cell value, the empty entry is unused
+        self.center_sums = [0, 0, 0]
+        self.groups = GroupTracker(board)
+        self.history = []  # the terms before each move applied, restored when the move is undone
+
+        cells = board.cells
+        for cell in range(NUM_OF_CELLS):
+            if cells[cell] != EMPTY:
+                self.piece_counts[cells[cell]] += 1
+                self.center_sums[cells[cell]] += CENTER_DISTANCE[cell]
+
+    def apply_move(self, changed_spaces: tuple):
+        """
+        Updates the terms after a move was applied to the board.
+        :param changed_spaces: a tuple of (cell, previous value) tuples changed by the move
+        """
+        self.history.append((self.piece_counts[:], self.center_sums[:]))
+        cells = self.board.cells
+        for cell, value in changed_spaces:
+            if value != EMPTY:
+                self.piece_counts[value] -= 1
+                self.center_sums[value] -= CENTER_DISTANCE[cell]
+            if cells[cell] != EMPTY:
+                self.piece_counts[cells[cell]] += 1
+                self.center_sums[cells[cell]] += CENTER_DISTANCE[cell]
+        self.groups.apply_move(changed_spaces, cells)
+
+    def undo_move(self):
+        """
+        Restores the terms after the last move applied was undone on the board.
+        """
+        self.piece_counts, self.center_sums = self.history.pop()
+        self.groups.undo_move()
+
+    def weighted_heuristic(self, move: tuple, color: str) -> int:
+        """
+        Evaluates the board the same as KatsHeuristic.weighted_heuristic((move, board, color), weights).
+        :param move: a tuple, of the last move applied to the board
+        :param color: a string, the turn_color to evaluate the board for
+        :return: an int
+        """
+        score_weight = self.weights["score"]
+        center_weight = self.weights["center"]
+        push_weight = self.weights["push"]
+        group_weight = self.weights["group"]
+
+        code = COLOR_CODES[color]
+        opposing_code = COLOR_CODES[get_opposite_color(color)]
+
+        score = self.piece_counts[code] - self.piece_counts[opposing_code]
+        center_value = self.center_sums[code] / self.piece_counts[code] \
+            - self.center_sums[opposing_code] / self.piece_counts[opposing_code]
+        group_counts = self.groups.counts  # the number of groups of each turn_color come first
+        group = group_counts[code] - group_counts[opposing_code]
+        push = push_eval((move, self.board, color), center_value)
+        int_value = int(score_weight * score + center_weight * center_value + push_weight * push + group * group_weight)
+        return int_value
+
+
+class BatchHeuristic:
+    """
+    Encapsulates KatsHeuristic.weighted_heuristic for a batch of compact boards stacked into an N x 61 numpy array of
+    cell values, e.g. every child of a node one ply above the leaves of the search, so the boards are evaluated
+    together with vectorized operations instead of paying Python's overhead for each board.
+
+    The number of groups is counted by repeatedly labelling each game piece with the smallest label among itself and
+    its allied neighbours, until the labels of every group settle on the smallest cell id of the group.
+    """
+
+    def __init__(self, weights=None):
+        if np is None:
+            raise ImportError("BatchHeuristic requires numpy")
+
+        self.weights = DEFAULT_WEIGHTS if weights is None else weights
+        self.center_distance = np.array(CENTER_DISTANCE, dtype=np.float64)
+        self.cell_ids = np.arange(NUM_OF_CELLS)
+
+        # the spaces off of the game board are mapped to an extra column of the labels that's never a game piece
+        neighbors = np.array(NEIGHBORS)
+        neighbors[neighbors == OFF_BOARD] = NUM_OF_CELLS
+        self.neighbors = neighbors
+
+    def count_groups(self, pieces):
+        """
+        Counts the groups of game pieces on each board.
+        :param pieces: a numpy array, N x 61 of booleans, True for the spaces occupied by the game pieces
+        :return: a numpy array, of the number of groups on each board
+        """
+        # unoccupied spaces are labelled NUM_OF_CELLS, greater than any cell id, so they never lower a label
+        rows = np.arange(len(pieces))[:, None]
+        labels = np.full((len(pieces), NUM_OF_CELLS + 1), NUM_OF_CELLS, dtype=np.uint8)
+        labels[:, :NUM_OF_CELLS] = np.where(pieces, self.cell_ids, NUM_OF_CELLS)
+
+        while True:
+            next_labels = np.minimum(labels[:, :NUM_OF_CELLS], labels[:, self.neighbors].min(axis=2))
+            next_labels[~pieces] = NUM_OF_CELLS
+            # each label jumps to the label of the game piece it names, which spreads the labels along long groups
+            next_labels = labels[rows, next_labels]
+            if np.array_equal(next_labels, labels[:, :NUM_OF_CELLS]):
+                break
+            labels[:, :NUM_OF_CELLS] = next_labels
+
+        # each group has a single game piece labelled with its own cell id
+        return (pieces & (labels[:, :NUM_OF_CELLS] == self.cell_ids)).sum(axis=1)
+
+    def weighted_heuristic(self, boards, pushes, color: str):
+        """
+        Evaluates each board the same as KatsHeuristic.weighted_heuristic((move, board, color), weights).
+        :param boards: a numpy array, N x 61 of the cell values of the boards
+        :param pushes: a numpy array, of N booleans, True for the boards whose last move was a sumito rewarded by
+                       push_eval
+        :param color: a string, the turn_color to evaluate the boards for
+        :return: a numpy array, of the N values
+        """
+        own = boards == COLOR_CODES[color]
+        opposing = boards == COLOR_CODES[get_opposite_color(color)]
+        own_pieces = own.sum(axis=1)
+        opposing_pieces = opposing.sum(axis=1)
+
+        score = own_pieces - opposing_pieces
+        center_value = own @ self.center_distance / own_pieces - opposing @ self.center_distance / opposing_pieces
+        group = self.count_groups(own) - self.count_groups(opposing)
+        push = np.where(pushes, np.where(5 - center_value < 4.8, 0.5, 5), 0)
+
+        value = self.weights["score"] * score + self.weights["center"] * center_value \
+            + self.weights["push"] * push + self.weights["group"] * group
+        return value.astype(np.int64)  # truncated towards zero, the same as int()
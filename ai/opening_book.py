@@ -0,0 +1,103 @@
+import mmap
+import os
+import struct
+
+from board_state.compact_board import *
+
+# the book used by the GUI if it has been built, see engine/book_builder.py
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+# the file starts with a magic number and the format version, followed by the entries sorted by position hash
+BOOK_MAGIC = b"ABOB"
+BOOK_VERSION = 1
+HEADER = struct.Struct("<4sI")
+
+# each entry is the position hash, and the book move's type, 3 cells, direction, number of opposing game pieces pushed,
+# and value
+ENTRY = struct.Struct("<QBBBBBBi")
+MOVE_TYPES = ("i", "s")
+NO_CELL = 255  # fills the cells after the last cell of a move of fewer than 3 game pieces
+
+
+class OpeningBook:
+    """
+    Encapsulates an opening book, the best move found by a deep search for each of the positions of the first plies of
+    a game, keyed by the Zobrist hash of the position including the player to move.
+
+    The book is a binary file of fixed size entries sorted by position hash. The file is memory-mapped, so opening a
+    book doesn't read it, and a position is looked up with a binary search that only touches the pages it reads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as book_file:
+            self.data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version = HEADER.unpack_from(self.data, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not a version {BOOK_VERSION} opening book")
+        self.size = (len(self.data) - HEADER.size) // ENTRY.size
+
+    def __len__(self):
+        return self.size
+
+    def probe(self, zobrist_hash: int):
+        """
+        Looks up the book move of a position.
+        :param zobrist_hash: an int, the Zobrist hash of the position
+        :return: a tuple of (move, value), or None if the position isn't in the book
+        """
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            entry = ENTRY.unpack_from(self.data, HEADER.size + middle * ENTRY.size)
+            if entry[0] < zobrist_hash:
+                low = middle + 1
+            elif entry[0] > zobrist_hash:
+                high = middle
+            else:
+                return self.decode_move(entry[1:7]), entry[7]
+        return None
+
+    def close(self):
+        """
+        Unmaps the book's file.
+        """
+        self.data.close()
+
+    @staticmethod
+    def encode_move(move: tuple) -> tuple:
+        """
+        Converts a move into the fields of a book entry.
+        :param move: a tuple, of the move
+        :return: a tuple, of the type, 3 cells, direction, and number of opposing game pieces pushed
+        """
+        cells = move[1] + (NO_CELL,) * (3 - len(move[1]))
+        return (MOVE_TYPES.index(move[0]),) + cells + (move[2], move[3])
+
+    @staticmethod
+    def decode_move(fields: tuple) -> tuple:
+        """
+        Converts the fields of a book entry back into a move.
+        :param fields: a tuple, of the type, 3 cells, direction, and number of opposing game pieces pushed
+        :return: a tuple, of the move
+        """
+        cells = tuple(cell for cell in fields[1:4] if cell != NO_CELL)
+        return MOVE_TYPES[fields[0]], cells, fields[4], fields[5]
+
+    @staticmethod
+    def write(entries: dict, path: str):
+        """
+        Writes an opening book. The book is written to a temporary file that then replaces the book, so a book that's
+        open elsewhere is never seen half written.
+        :param entries: a dictionary, of the (move, value) tuple of each position hash
+        :param path: a string, the path of the book
+        """
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as book_file:
+            book_file.write(HEADER.pack(BOOK_MAGIC, BOOK_VERSION))
+            for zobrist_hash in sorted(entries):
+                move, value = entries[zobrist_hash]
+                book_file.write(ENTRY.pack(zobrist_hash, *OpeningBook.encode_move(move), value))
+        os.replace(temporary_path, path)
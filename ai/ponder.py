@@ -0,0 +1,50 @@
+import threading
+
+from .ai import Minimax
+from board_state.compact_board import *
+
+
+class Ponderer:
+    """
+    Encapsulates pondering, searching on the opponent's time. Once the AI has moved, Minimax.ponder searches the
+    position on a background thread until the opponent's move arrives, and is stopped before the AI's next search
+    starts. Both searches share the Minimax instance's transposition table, so the next search reuses the values found
+    below the opponent's move while pondering.
+    """
+
+    def __init__(self, minimax: Minimax):
+        self.minimax = minimax
+        self.thread = None
+
+    def start(self, game_board: dict, color: str):
+        """
+        Starts pondering, stopping any pondering already running.
+        :param game_board: a dictionary, of the game board after the AI's move
+        :param color: a string, the AI's turn_color
+        """
+        self.stop()
+        # the game board is converted on the calling thread, since the GUI keeps changing it while pondering
+        board = CompactBoard.from_game_board(game_board)
+        self.thread = threading.Thread(target=self.minimax.ponder, args=(board, color), daemon=True)
+        self.thread.start()
+
+    def stop(self) -> int:
+        """
+        Stops pondering, waiting for the search to finish the node it's searching.
+        :return: an int, the depth of the last iteration completed by the pondering, or 0 if it wasn't pondering
+        """
+        if self.thread is None:
+            return 0
+
+        self.minimax.stop()
+        self.thread.join()
+        self.minimax.stop_event.clear()
+        self.thread = None
+        return self.minimax.completed_depth
+
+    def is_pondering(self) -> bool:
+        """
+        Checks if the search is pondering.
+        :return: a boolean
+        """
+        return self.thread is not None and self.thread.is_alive()
@@ -0,0 +1,106 @@
+import json
+import time
+
+# the parts of a search that are timed when profiling, see Minimax(profile=True). Converting between the GUI's game
+# board and the compact board is always timed, it happens once per search.
+TIME_CATEGORIES = ("generation", "evaluation", "make_unmake", "conversion")
+
+
+class SearchStats:
+    """
+    Encapsulates the counters and timings of a single search, returned by Minimax.alpha_beta alongside the move.
+
+    Nodes are counted at the ply they're visited at, including the plies of the quiescence search past the depth of
+    the iteration. The nodes of each completed iteration are recorded, so the effective branching factor is the growth
+    of the nodes between the last two iterations.
+    """
+
+    def __init__(self, max_ply: int):
+        self.nodes = [0] * (max_ply + 1)  # the nodes visited at each ply
+        self.iteration_nodes = []  # the nodes visited by each completed iteration
+        self.iteration_times = []  # the time taken by each completed iteration
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0  # cutoffs caused by the first move searched
+        self.tt_move_cutoffs = 0  # cutoffs caused by the best move stored in the transposition table
+        self.killer_cutoffs = 0
+        self.history_cutoffs = 0
+        self.pruned = 0
+        self.times = dict.fromkeys(TIME_CATEGORIES, 0.0)
+        self.tt = None  # the transposition table counters, see TranspositionTable.get_stats
+        self.eval_cache = None  # the evaluation cache counters, see EvaluationCache.get_stats
+        self.color = None
+        self.move = None  # the move played, in move notation
+        self.value = None
+        self.completed_depth = 0
+        self.book_move = False  # True if the move was played from the opening book
+        self.time_taken = 0.0
+
+    def get_total_nodes(self) -> int:
+        """
+        Counts the nodes visited by the search.
+        :return: an int
+        """
+        return sum(self.nodes)
+
+    def add_worker_stats(self, worker_stats):
+        """
+        Adds the nodes and cutoffs of a worker process's search of a root move, see Minimax.search_root_in_parallel.
+        :param worker_stats: a SearchStats, of the worker's search
+        """
+        for ply, ply_nodes in enumerate(worker_stats.nodes):
+            self.nodes[ply] += ply_nodes
+        self.cutoffs += worker_stats.cutoffs
+        self.first_move_cutoffs += worker_stats.first_move_cutoffs
+        self.tt_move_cutoffs += worker_stats.tt_move_cutoffs
+        self.killer_cutoffs += worker_stats.killer_cutoffs
+        self.history_cutoffs += worker_stats.history_cutoffs
+
+    def complete_iteration(self, iteration_time: float):
+        """
+        Records the nodes and time of an iteration that was completed.
+        :param iteration_time: a float, the time taken by the iteration
+        """
+        self.iteration_nodes.append(self.get_total_nodes() - sum(self.iteration_nodes))
+        self.iteration_times.append(iteration_time)
+
+    def get_effective_branching_factor(self):
+        """
+        Gets the effective branching factor, the growth of the nodes visited by the last completed iteration over the
+        iteration before it.
+        :return: a float, or None if fewer than two iterations were completed
+        """
+        if len(self.iteration_nodes) < 2:
+            return None
+        return self.iteration_nodes[-1] / max(self.iteration_nodes[-2], 1)
+
+    def get_tt_hit_rate(self):
+        """
+        Gets the rate of transposition table probes that found the position.
+        :return: a float, or None if the table wasn't probed
+        """
+        if self.tt is None:
+            return None
+        return self.tt["hit_rate"]
+
+    def to_dict(self) -> dict:
+        """
+        Converts the stats into a dictionary that can be written as JSON.
+        :return: a dictionary
+        """
+        return {"time": time.time(), "color": self.color, "move": self.move, "value": self.value,
+                "book_move": self.book_move, "completed_depth": self.completed_depth, "time_taken": self.time_taken,
+                "nodes": self.get_total_nodes(), "nodes_by_ply": self.nodes, "iteration_nodes": self.iteration_nodes,
+                "iteration_times": self.iteration_times,
+                "effective_branching_factor": self.get_effective_branching_factor(), "cutoffs": self.cutoffs,
+                "first_move_cutoffs": self.first_move_cutoffs, "tt_move_cutoffs": self.tt_move_cutoffs,
+                "killer_cutoffs": self.killer_cutoffs, "history_cutoffs": self.history_cutoffs,
+                "pruned": self.pruned, "times": self.times, "tt": self.tt,
+                "eval_cache": self.eval_cache}
+
+    def write_json_line(self, path: str):
+        """
+        Appends the stats to a file of JSON lines, one line per search.
+        :param path: a string, the path of the file
+        """
+        with open(path, "a") as stats_file:
+            stats_file.write(json.dumps(self.to_dict()) + "\n")
@@ -0,0 +1,112 @@
+# bound types of the values stored in the transposition table
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class TranspositionTable:
+    """
+    Encapsulates a fixed size table of previously searched positions keyed by the Zobrist hash of the position.
+
+    Each bucket has two entries: a depth-preferred entry, only replaced by a search of the same or greater depth, and an
+    always-replace entry that holds the most recent search that didn't replace the depth-preferred entry. An entry is a
+    tuple of (key, depth, value, bound type, best move).
+    """
+
+    # estimated number of bytes used by an entry, including the entry tuple, the key, the value, and the best move
+    ENTRY_SIZE = 256
+
+    def __init__(self, size_mb=16):
+        self.size_mb = size_mb
+        self.num_of_buckets = max(1, int(size_mb * 1024 * 1024) // (2 * self.ENTRY_SIZE))
+        self.depth_preferred = [None] * self.num_of_buckets
+        self.always_replace = [None] * self.num_of_buckets
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def probe(self, key: int):
+        """
+        Looks up the entry stored for the position.
+
+        :param key: an int, the Zobrist hash of the position
+        :return: a tuple of (key, depth, value, bound type, best move), or None if the position isn't stored
+        """
+        index = key % self.num_of_buckets
+
+        entry = self.depth_preferred[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+
+        other_entry = self.always_replace[index]
+        if other_entry is not None and other_entry[0] == key:
+            self.hits += 1
+            return other_entry
+
+        # a collision is a bucket occupied by other positions
+        if entry is not None or other_entry is not None:
+            self.collisions += 1
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, value, bound: int, best_move):
+        """
+        Stores the result of searching the position.
+
+        :param key: an int, the Zobrist hash of the position
+        :param depth: an int, the depth searched below the position
+        :param value: the value of the position
+        :param bound: an int, EXACT, LOWER_BOUND, or UPPER_BOUND
+        :param best_move: a tuple, of the best move found, or None
+        """
+        index = key % self.num_of_buckets
+        entry = (key, depth, value, bound, best_move)
+        self.stores += 1
+
+        current_entry = self.depth_preferred[index]
+        if current_entry is None or current_entry[0] == key or depth >= current_entry[1]:
+            # the replaced depth-preferred entry is still kept as the always-replace entry
+            if current_entry is not None and current_entry[0] != key:
+                self.always_replace[index] = current_entry
+            self.depth_preferred[index] = entry
+        else:
+            self.always_replace[index] = entry
+
+    def clear(self):
+        """
+        Removes every entry from the table, and resets the counters.
+        """
+        self.depth_preferred = [None] * self.num_of_buckets
+        self.always_replace = [None] * self.num_of_buckets
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Resets the hit, miss, collision, and store counters.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def add_stats(self, stats: dict):
+        """
+        Adds the counters of another table, such as the table of a worker process searching part of the same search.
+        :param stats: a dictionary, of the counters from get_stats
+        """
+        self.hits += stats["hits"]
+        self.misses += stats["misses"]
+        self.collisions += stats["collisions"]
+        self.stores += stats["stores"]
+
+    def get_stats(self) -> dict:
+        """
+        Gets the counters of the table.
+
+        :return: a dictionary, of the hits, misses, collisions, stores, and hit rate
+        """
+        probes = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "collisions": self.collisions, "stores": self.stores,
+                "hit_rate": self.hits / probes if probes else 0.0}
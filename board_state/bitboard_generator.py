@@ -0,0 +1,252 @@
+from board_state.compact_board import *
+from board_state.state_space_generator import StateSpaceGenerator
+
+# the cells are mapped onto a grid of rows of GRID_WIDTH bits, one row for each row of the game board from row I to
+# row A (the order of the cell ids), and one bit for each diagonal column from 1 to 9. The extra bit at the end of each
+# row and the extra rows around the game board are never occupied, so a game piece moved off of the game board by a
+# shift lands on an unoccupied bit instead of wrapping around to the other side of the game board.
+GRID_WIDTH = 10
+GRID_OFFSET = GRID_WIDTH + 1
+FULL_MASK = (1 << (2 * GRID_OFFSET + NUM_OF_ROWS * GRID_WIDTH)) - 1
+
+
+def _build_grid_tables() -> tuple:
+    """
+    Calculates the bit of each cell on the grid, and the shift moving a bit to the adjacent space in each direction.
+
+    :return: a tuple of (bit index of each cell, cell of each bit index, direction shifts, mask of the game board)
+    """
+    cell_bits = []
+    for cell in range(NUM_OF_CELLS):
+        external = CELL_EXTERNAL[cell]
+        row = ord("I") - ord(external[0])
+        diagonal = int(external[1:]) - 1
+        cell_bits.append(GRID_OFFSET + row * GRID_WIDTH + diagonal)
+
+    bit_cells = [OFF_BOARD] * FULL_MASK.bit_length()
+    for cell, bit in enumerate(cell_bits):
+        bit_cells[bit] = cell
+
+    # the shift of each direction is the same for every cell, which is checked against the neighbour table
+    shifts = []
+    for direction in range(len(DIRECTIONS)):
+        shift = {cell_bits[NEIGHBORS[cell][direction]] - cell_bits[cell] for cell in range(NUM_OF_CELLS)
+                 if NEIGHBORS[cell][direction] != OFF_BOARD}
+        assert len(shift) == 1
+        shifts.append(shift.pop())
+
+    board_mask = 0
+    for bit in cell_bits:
+        board_mask |= 1 << bit
+
+    return tuple(cell_bits), tuple(bit_cells), tuple(shifts), board_mask
+
+
+CELL_BIT, BIT_CELL, DIRECTION_SHIFT, BOARD_MASK = _build_grid_tables()
+
+
+def shift_forward(bits: int, direction: int) -> int:
+    """
+    Moves every bit to the adjacent space in the direction.
+
+    :param bits: an int, of the bits
+    :param direction: an int, the index of the direction
+    :return: an int
+    """
+    shift = DIRECTION_SHIFT[direction]
+    if shift > 0:
+        return (bits << shift) & FULL_MASK
+    return bits >> -shift
+
+
+def shift_back(bits: int, direction: int) -> int:
+    """
+    Moves every bit to the adjacent space opposite of the direction, so a bit is set for each space whose adjacent
+    space in the direction was set.
+
+    :param bits: an int, of the bits
+    :param direction: an int, the index of the direction
+    :return: an int
+    """
+    shift = DIRECTION_SHIFT[direction]
+    if shift > 0:
+        return bits >> shift
+    return (bits << -shift) & FULL_MASK
+
+
+def iterate_cells(bits: int):
+    """
+    Yields the cell of each set bit.
+
+    :param bits: an int, of the bits
+    :return: a generator of cell ids
+    """
+    while bits:
+        lowest_bit = bits & -bits
+        yield BIT_CELL[lowest_bit.bit_length() - 1]
+        bits ^= lowest_bit
+
+
+class BitboardGenerator(StateSpaceGenerator):
+    """
+    Encapsulates a StateSpaceGenerator that generates the moves for the current turn with shift and mask operations
+    over a bitboard of each turn_color, instead of looking at the spaces around each game piece one at a time.
+
+    The bitboards are kept up to date as moves are applied and undone, and the moves generated are the same as the
+    StateSpaceGenerator's moves.
+    """
+
+    def __init__(self, board, turn):
+        self.bitboards = [0, 0, 0]  # indexed by cell value, the empty entry is unused
+        super().__init__(board, turn)
+
+    def set_board(self, board):
+        """
+        sets board, and the bitboards of the board
+        """
+        super().set_board(board)
+        self.set_bitboards()
+
+    def translate_test_input_to_board_notation(self):
+        """
+        Creates a game board based on test input, and the bitboards of the board.
+        """
+        super().translate_test_input_to_board_notation()
+        self.set_bitboards()
+
+    def set_bitboards(self):
+        """
+        Sets the bitboard of each turn_color from the generator's board.
+        """
+        self.bitboards = [0, 0, 0]
+        if self.board is not None:
+            cells = self.board.cells
+            for cell in range(NUM_OF_CELLS):
+                self.bitboards[cells[cell]] |= 1 << CELL_BIT[cell]
+
+    def apply_move(self, move: tuple) -> tuple:
+        """
+        Applies the move to the generator's board and bitboards in place and passes the turn to the opposing
+        turn_color.
+
+        :param move: a tuple, of a move generated for the current turn
+        :return: a tuple, the undo record to pass to undo_move
+        """
+        undo = super().apply_move(move)
+        bitboards = self.bitboards
+        previous_bitboards = bitboards[BLACK], bitboards[WHITE]
+
+        cells = self.board.cells
+        for cell, value in undo[1]:
+            bit = 1 << CELL_BIT[cell]
+            bitboards[value] ^= bit
+            bitboards[cells[cell]] ^= bit
+
+        return undo + previous_bitboards
+
+    def undo_move(self, undo: tuple):
+        """
+        Undoes a move applied with apply_move, restoring the generator's board, bitboards, and turn in place.
+
+        :param undo: a tuple, the undo record returned by apply_move
+        """
+        super().undo_move(undo)
+        self.bitboards[BLACK], self.bitboards[WHITE] = undo[4], undo[5]
+
+    def iter_moves(self, order_moves=None):
+        """
+        Lazily yields the moves for the current turn on the generator's board, sumitos first with sumitos that push a
+        piece off of the game board before the others, the same as StateSpaceGenerator.iter_moves. The moves of each
+        type and direction are found for every game piece at once, and the inline and sidestep moves are generated one
+        direction at a time as they're requested.
+
+        :param order_moves: a function taking a list of moves and returning them in the order to search, applied to
+                            the sumitos and then to the remaining moves (which are then generated together)
+        :return: a generator of moves
+        """
+        turn = COLOR_CODES[self.turn]
+        own = self.bitboards[turn]
+        opposing = self.bitboards[BLACK if turn == WHITE else WHITE]
+
+        sumitos = self.get_bitboard_sumito_moves(own, opposing)
+        sumitos.sort(key=self.is_capture, reverse=True)
+        if order_moves is not None:
+            yield from order_moves(sumitos)
+            yield from order_moves(list(self.iter_bitboard_moves(own, opposing)))
+            return
+
+        yield from sumitos
+        yield from self.iter_bitboard_moves(own, opposing)
+
+    @staticmethod
+    def get_bitboard_sumito_moves(own: int, opposing: int) -> list:
+        """
+        Gets the 2 and 3 grouped sumitos of the game pieces of the own bitboard.
+
+        :param own: an int, the bitboard of the turn_color
+        :param opposing: an int, the bitboard of the opposing turn_color
+        :return: a list of moves
+        """
+        unoccupied = FULL_MASK & ~(own | opposing)  # includes the spaces off of the game board
+        sumitos = []
+
+        for direction in range(len(DIRECTIONS)):
+            behind = OPPOSITE_DIRECTION[direction]
+
+            # the leading pieces of the groupings of 2 and 3 game pieces in line in the direction
+            leads_of_two = own & shift_forward(own, direction)
+            leads_of_three = leads_of_two & shift_forward(leads_of_two, direction)
+
+            # sumitos push 1 opposing piece into an unoccupied space, or 2 with a grouping of 3
+            opposing_in_front = shift_back(opposing, direction)
+            unoccupied_second = shift_back(shift_back(unoccupied, direction), direction)
+            pushes_one = leads_of_two & opposing_in_front & unoccupied_second
+            for cell in iterate_cells(pushes_one):
+                sumitos.append(("i", (cell,) + RAYS[cell][behind][:1], direction, 1))
+            for cell in iterate_cells(pushes_one & leads_of_three):
+                sumitos.append(("i", (cell,) + RAYS[cell][behind][:2], direction, 1))
+
+            pushes_two = leads_of_three & opposing_in_front & shift_back(opposing_in_front, direction) \
+                & shift_back(unoccupied_second, direction)
+            for cell in iterate_cells(pushes_two):
+                sumitos.append(("i", (cell,) + RAYS[cell][behind][:2], direction, 2))
+
+        return sumitos
+
+    def iter_bitboard_moves(self, own: int, opposing: int):
+        """
+        Lazily yields the inline moves into unoccupied spaces, and then the sidestep moves, of the game pieces of the
+        own bitboard, one direction at a time.
+
+        :param own: an int, the bitboard of the turn_color
+        :param opposing: an int, the bitboard of the opposing turn_color
+        :return: a generator of moves
+        """
+        empty = BOARD_MASK & ~(own | opposing)
+
+        for direction in range(len(DIRECTIONS)):
+            behind = OPPOSITE_DIRECTION[direction]
+            leads = own & shift_back(empty, direction)
+            leads_of_two = leads & shift_forward(own, direction)
+            leads_of_three = leads_of_two & shift_forward(shift_forward(own, direction), direction)
+
+            for cell in iterate_cells(leads_of_three):
+                yield "i", (cell,) + RAYS[cell][behind][:2], direction, 0
+            for cell in iterate_cells(leads_of_two):
+                yield "i", (cell,) + RAYS[cell][behind][:1], direction, 0
+            for cell in iterate_cells(leads):
+                yield "i", (cell,), direction, 0
+
+        # sidesteps move each game piece of a grouping of 2 or 3 into an unoccupied space
+        for line_direction in self.line_directions:
+            for direction in range(len(DIRECTIONS)):
+                if direction == line_direction or direction == OPPOSITE_DIRECTION[line_direction]:
+                    continue
+
+                can_move = own & shift_back(empty, direction)
+                next_can_move = shift_back(can_move, line_direction)
+                starts_of_two = can_move & next_can_move
+                for cell in iterate_cells(starts_of_two & shift_back(next_can_move, line_direction)):
+                    yield "s", (cell,) + RAYS[cell][line_direction][:2], direction, 0
+                for cell in iterate_cells(starts_of_two):
+                    yield "s", (cell,) + RAYS[cell][line_direction][:1], direction, 0
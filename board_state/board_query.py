@@ -1,4 +1,7 @@
 from utils.converter import *
+from board_state.compact_board import *
+from utils.hex_grid import *
+from board_state.state_space_generator import StateSpaceGenerator
 
 test_board = {'row0': [{'colNum': 0, 'turn_color': None, 'selected': False, 'x_pos': None, 'y_pos': None},
                        {'colNum': 1, 'turn_color': None, 'selected': False, 'x_pos': None, 'y_pos': None},
@@ -64,12 +67,12 @@ test_board = {'row0': [{'colNum': 0, 'turn_color': None, 'selected': False, 'x_p
 turn = "black"
 
 
-def center(board, color):
+def _calculate_center_distance(row_number: int, column: int) -> int:
     """
-    gets average of distance from center of all pieces of provided turn_color
-    :param board: gameboard array
-    :param color: player whose turn it is turn_color
-    :return: float
+    Calculates the distance from the center of the game board (E5) for the specified space.
+    :param row_number: an int, the number of the row
+    :param column: an int, the number of the column
+    :return: an int
     """
     distance = {
         4: [(0, 4), (1, 5), (2, 6), (3, 7), (4, 8), (5, 7), (6, 6), (7, 5)],
@@ -77,26 +80,49 @@ def center(board, color):
         2: [(3, 5), (4, 6), (5, 5)],
         1: [(4,5)]
     }
+    dist = 0
+    if row_number == 0 or row_number == 8 or column == 0 or (row_number, column) in distance[4]:
+        dist = 4
+    elif row_number == 1 or row_number == 7 or column == 1 or (row_number, column) in distance[3]:
+        dist = 3
+    elif row_number == 2 or row_number == 6 or column == 2 or (row_number, column) in distance[2]:
+        dist = 2
+    elif row_number == 3 or row_number == 5 or column == 3 or (row_number, column) in distance[1]:
+        dist = 1
+    return dist
+
+
+# distance from the center of the game board for each cell of the compact board
+CENTER_DISTANCE = tuple(_calculate_center_distance(CELL_ROW[cell], CELL_COL[cell]) for cell in range(NUM_OF_CELLS))
+
+
+def get_compact_board(board) -> CompactBoard:
+    """
+    Gets the compact board for the provided board, converting the GUI's game board dictionary if required.
+    :param board: a CompactBoard, or a dictionary of the game board
+    :return: a CompactBoard
+    """
+    if isinstance(board, dict):
+        return CompactBoard.from_game_board(board)
+    return board
+
+
+def center(board, color):
+    """
+    gets average of distance from center of all pieces of provided turn_color
+    :param board: compact board, or gameboard array
+    :param color: player whose turn it is turn_color
+    :return: float
+    """
+    cells = get_compact_board(board).cells
+    code = COLOR_CODES[color]
     proximity_counter = 0
     pieces = 0
     # 9 rows 9 columns center is E5 or board notation row 4 column 4
-    for row in board.items():
-        row_number = Converter.convert_row_to_string_or_int(row[0])
-        row = row[1]
-        for place in row:
-            if place['turn_color'] == color:
-                pieces += 1
-                column = place['colNum']
-                dist = 0
-                if row_number == 0 or row_number == 8 or column == 0 or (row_number, column) in distance[4]:
-                    dist = 4
-                elif row_number == 1 or row_number == 7 or column == 1 or (row_number, column) in distance[3]:
-                    dist = 3
-                elif row_number == 2 or row_number == 6 or column == 2 or (row_number, column) in distance[2]:
-                    dist = 2
-                elif row_number == 3 or row_number == 5 or column == 3 or (row_number, column) in distance[1]:
-                    dist = 1
-                proximity_counter += dist
+    for cell in range(NUM_OF_CELLS):
+        if cells[cell] == code:
+            pieces += 1
+            proximity_counter += CENTER_DISTANCE[cell]
     proximity_counter = proximity_counter/pieces
     return proximity_counter
 
@@ -104,62 +130,44 @@ def center(board, color):
 def pieces(board, color):
     """
     counts pieces of the turn_color on the board
-    :param board: gameboard array
+    :param board: compact board, or gameboard array
     :param color: player whose turn it is turn_color
     :return: int
     """
-    piece_count = 0
-    for row in board.items():
-        row = row[1]
-        for place in row:
-            if place['turn_color'] == color:
-                piece_count += 1
-    return piece_count
+    return get_compact_board(board).count(color)
 
 
-def groups(board: dict, turn_color: str) -> list:
+def groups(board, turn_color: str) -> list:
     """
     Returns the ally count of the specified color for a given game board state.
-    :param board: a dictionary, of the game board
+    :param board: a CompactBoard, or a dictionary of the game board
     :param turn_color: a string, the color to perform the ally count for
-    :return: a list of lists, containing the ally count groupings
+    :return: a list of lists, containing the cell ids of the ally count groupings
     """
+    cells = get_compact_board(board).cells
+    code = COLOR_CODES[turn_color]
     ally_count = []  # contains all of the groupings of ally counts
-    ally_count_grouping = []  # temporarily stores the current ally count grouping
-    neighbours_to_check = set()
     already_checked = set()
 
-    for row in board:
-        for piece in board[row]:
-
-            if piece["turn_color"] == turn_color and (row, piece["colNum"]) not in already_checked:
+    for cell in range(NUM_OF_CELLS):
+        if cells[cell] == code and cell not in already_checked:
 
-                ally_count_grouping.append((row, piece["colNum"]))  # adds the piece to the ally count grouping
-                already_checked.add((row, piece["colNum"]))  # adds the piece to the set of already checked pieces
-                neighbours_to_check.add((row, piece["colNum"]))
+            ally_count_grouping = [cell]  # adds the piece to the ally count grouping
+            already_checked.add(cell)  # adds the piece to the set of already checked pieces
+            neighbours_to_check = [cell]
 
-                # checks the all neighbours of the piece, and neighbours of neighbours of neighbours...etc
-                valid_neighbours = True
-                while valid_neighbours:
-                    piece_to_check = neighbours_to_check.pop()
-                    adjacent_pieces = get_adj_spaces_in_internal_notation(piece_to_check[0], piece_to_check[1])  # gets adjacent pieces
+            # checks the all neighbours of the piece, and neighbours of neighbours of neighbours...etc
+            while neighbours_to_check:
+                piece_to_check = neighbours_to_check.pop()
 
-                    for adjacent_piece in adjacent_pieces:
-                        try:
-                            if board[adjacent_piece[0]][adjacent_piece[1]]["turn_color"] == turn_color and adjacent_piece not in already_checked:
+                for adjacent_piece in NEIGHBORS[piece_to_check]:
+                    if adjacent_piece != OFF_BOARD and cells[adjacent_piece] == code \
+                            and adjacent_piece not in already_checked:
+                        ally_count_grouping.append(adjacent_piece)
+                        already_checked.add(adjacent_piece)
+                        neighbours_to_check.append(adjacent_piece)
 
-                                ally_count_grouping.append(adjacent_piece)
-                                already_checked.add(adjacent_piece)
-                                neighbours_to_check.add(adjacent_piece)
-
-                        except IndexError:
-                            pass
-
-                    if len(neighbours_to_check) == 0:
-                        ally_count.append(ally_count_grouping)  # adds the grouping to the ally count
-                        valid_neighbours = False
-
-                ally_count_grouping = []  # resets the list containing the current ally count grouping
+            ally_count.append(ally_count_grouping)  # adds the grouping to the ally count
 
     return ally_count
 
@@ -172,39 +180,10 @@ def get_adj_spaces_in_internal_notation(row, col: int) -> set:
     :param num_pieces_selected: an int, the number of currently selected game pieces
     :return: a set, of the adjacent game spaces
     """
-    directions = [
-        "NE",
-        "E",
-        "SE",
-        "SW",
-        "W",
-        "NW"
-    ]
-    move_directions = {
-        "NE": (-1, 1),
-        "E": (0, 1),
-        "SE": (1, 1),
-        "SW": (1, -1),
-        "W": (0, -1),
-        "NW": (-1, -1)
-    }
-    adjacent_spaces = set()
-
-    # if the row key is passed, then it is converted to the row number
-    if type(row) != int:
-        row = Converter.convert_row_to_string_or_int(row)
-
-    # iterates through all possible directions around a given game piece
-    for dir in directions:
-        # gets the direction coordinate tuple, and gets the adjusted direction tuple
-        direction_tuple = move_directions[dir]
-        adjusted_direction_tuple = Converter.calculate_adjusted_direction_tuple(row, direction_tuple)
-
-        # gets the internal notation of the adjacent piece
-        adjacent_space_internal = Converter.simulate_game_piece_movement(row, col, adjusted_direction_tuple)
-
-        if is_in_bounds(adjacent_space_internal[0], adjacent_space_internal[1]):
-            adjacent_spaces.add(adjacent_space_internal)
+    # gets the adjacent spaces within the game board from the precomputed neighbour table
+    cell = get_cell(row, col)
+    adjacent_spaces = {(CELL_ROW_KEY[adjacent_cell], CELL_COL[adjacent_cell]) for adjacent_cell in NEIGHBORS[cell]
+                       if adjacent_cell != OFF_BOARD}
 
     return adjacent_spaces
 
@@ -216,29 +195,7 @@ def is_in_bounds(row, col: int) -> bool:
     :param col: an int, of the colujn
     :return: a boolean, if the coordinates are within the game board
     """
-    NUM_COLS_PER_ROW = [
-        5,
-        6,
-        7,
-        8,
-        9,
-        8,
-        7,
-        6,
-        5
-    ]
-    VALID_ROWS_COLS = range(0, 9)
-
-    if type(row) != int:
-        row = Converter.convert_row_to_string_or_int(row)
-
-    if row in VALID_ROWS_COLS and col in VALID_ROWS_COLS:
-
-        COLS_PER_ROW = NUM_COLS_PER_ROW[row]  # gets num of columns for the given row
-        if col in range(0, COLS_PER_ROW):  # checks if the column is in bounds for that row
-            return True
-    else:
-        return False
+    return get_cell(row, col) != OFF_BOARD
 
 
 def space_translation(board, adj_list, color):
@@ -262,15 +219,12 @@ def push_eval(state, center_val):
 
     move = state[0]
 
-    # gets color of leading piece within piece notation, cause within our notation, the lead piece in the Move
-    # is the opposing color (e.g. move[1][0] will be the opposite color for a sumito)
-    internal_notation = Converter.external_notation_to_internal(move[1][0])
-    color_of_lead_piece_in_move_notation = state[1][internal_notation[0]][internal_notation[1]]["turn_color"]
-
-    if len(move[1]) == 3 and color_of_lead_piece_in_move_notation != state[2] and color_of_lead_piece_in_move_notation is not None:
-        push = True
-    else:
-        push = False
+    # gets color of leading piece of the sumito, which is the leading piece of the opposing color before the move
+    push = False
+    if move[3] > 0:
+        leading_piece = StateSpaceGenerator.get_leading_opposing_piece(move)
+        color_of_lead_piece = state[1].get_color(leading_piece)
+        push = color_of_lead_piece != state[2] and color_of_lead_piece is not None
 
     if push:
         total = 5 - center_val
@@ -0,0 +1,108 @@
+from utils.hex_grid import *
+
+# cell values stored within the compact board
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+
+COLOR_CODES = {None: EMPTY, "black": BLACK, "white": WHITE}
+COLOR_NAMES = (None, "black", "white")
+
+
+class CompactBoard:
+    """
+    Encapsulates a 61 cell game board stored as a bytearray indexed by cell id. Only the colors of the game pieces are
+    stored, the GUI specific attributes of each game board space (selected, x_pos, y_pos) are kept out of the search.
+
+    The Zobrist hash of the position, including the player to move, is kept in zobrist. It's set by the
+    StateSpaceGenerator and updated as moves are applied, see board_state.zobrist.
+    """
+    __slots__ = ("cells", "zobrist")
+
+    def __init__(self, cells=None, zobrist=0):
+        self.cells = bytearray(NUM_OF_CELLS) if cells is None else bytearray(cells)
+        self.zobrist = zobrist
+
+    @classmethod
+    def from_game_board(cls, game_board: dict):
+        """
+        Creates a compact board from the dictionary representing the game board used by the GUI.
+
+        :param game_board: a dictionary, of the game board
+        :return: a CompactBoard
+        """
+        cells = bytearray(NUM_OF_CELLS)
+
+        for cell in range(NUM_OF_CELLS):
+            cells[cell] = COLOR_CODES[game_board[CELL_ROW_KEY[cell]][CELL_COL[cell]]["turn_color"]]
+
+        return cls(cells)
+
+    def to_game_board(self, template=None) -> dict:
+        """
+        Creates the dictionary representing the game board used by the GUI. If a template game board is provided,
+        then the GUI specific attributes of each space are copied from it.
+
+        :param template: a dictionary, of the game board to copy the GUI specific attributes from
+        :return: a dictionary, of the game board
+        """
+        game_board = {}
+
+        for cell in range(NUM_OF_CELLS):
+            row_key = CELL_ROW_KEY[cell]
+            col = CELL_COL[cell]
+
+            if template is not None:
+                template_space = template[row_key][col]
+                space = {"colNum": col, "turn_color": COLOR_NAMES[self.cells[cell]],
+                         "selected": template_space["selected"], "x_pos": template_space["x_pos"],
+                         "y_pos": template_space["y_pos"]}
+            else:
+                space = {"colNum": col, "turn_color": COLOR_NAMES[self.cells[cell]], "selected": False,
+                         "x_pos": None, "y_pos": None}
+
+            game_board.setdefault(row_key, []).append(space)
+
+        return game_board
+
+    def copy(self):
+        """
+        Creates a copy of the compact board.
+
+        :return: a CompactBoard
+        """
+        return CompactBoard(self.cells, self.zobrist)
+
+    def get_color(self, cell: int) -> str:
+        """
+        Gets the turn_color of the game piece at the specified cell.
+
+        :param cell: an int, the cell id
+        :return: a string, or None if the space is unoccupied
+        """
+        return COLOR_NAMES[self.cells[cell]]
+
+    def count(self, color: str) -> int:
+        """
+        Counts the game pieces of the specified turn_color.
+
+        :param color: a string, the turn_color of the game pieces to count
+        :return: an int
+        """
+        return self.cells.count(COLOR_CODES[color])
+
+    def piece_cells(self, color: str) -> list:
+        """
+        Gets the cell ids of every game piece of the specified turn_color.
+
+        :param color: a string, the turn_color of the game pieces
+        :return: a list of ints
+        """
+        code = COLOR_CODES[color]
+        return [cell for cell in range(NUM_OF_CELLS) if self.cells[cell] == code]
+
+    def __eq__(self, other):
+        return isinstance(other, CompactBoard) and self.cells == other.cells
+
+    def __repr__(self):
+        return f"CompactBoard({bytes(self.cells)!r})"
@@ -0,0 +1,206 @@
+from board_state.compact_board import *
+
+# the most game pieces of a turn_color on the game board, and so the largest possible group
+MAX_GROUP_SIZE = 14
+
+# the counts kept by the tracker are the number of groups of each turn_color, indexed by cell value, followed by the
+# number of groups of each size of each turn_color, starting at the offset of the turn_color's cell value
+SIZE_COUNT_OFFSETS = (None, 3, 3 + MAX_GROUP_SIZE + 1)
+NUM_OF_COUNTS = 3 + 2 * (MAX_GROUP_SIZE + 1)
+
+# the (neighbour, previous neighbour) pairs of each cell going around the cell, skipping the neighbours off the game
+# board, to find the arcs of allied neighbours of a space
+NEIGHBOR_PAIRS = tuple(tuple((NEIGHBORS[cell][direction], NEIGHBORS[cell][direction - 1])
+                             for direction in range(len(DIRECTIONS)) if NEIGHBORS[cell][direction] != OFF_BOARD)
+                       for cell in range(NUM_OF_CELLS))
+
+
+class GroupTracker:
+    """
+    Encapsulates the groups of adjacent allied game pieces of each turn_color of a compact board, kept up to date as
+    moves are applied and undone, so the number of groups and their sizes are known without a flood fill of the board.
+
+    The groups are a union-find forest, with a node for each game piece placed, joined by size with path halving.
+    Placing a game piece joins its node with the groups of its allied neighbours. A union-find can't split a group, so
+    removing a game piece leaves its node in the forest, and only if its allied neighbours aren't one contiguous arc
+    (the only way the group can be split) is the rest of its group searched, and each part relabelled under a new
+    root. Moves are applied and undone in order, so the nodes created by a move are dropped when it's undone.
+
+    The number of groups of each turn_color, and the number of groups of each size, are updated as the groups change.
+    """
+
+    def __init__(self, board: CompactBoard):
+        self.cells = bytearray(NUM_OF_CELLS)  # the tracker's own copy of the board, updated one game piece at a time
+        self.cell_nodes = [None] * NUM_OF_CELLS  # the node of the game piece on each cell
+        self.parent = []  # the parent of each node
+        self.size = []  # the size of each group, stored at its root
+        self.counts = [0] * NUM_OF_COUNTS  # the number of groups, and of groups of each size, see SIZE_COUNT_OFFSETS
+        self.history = []  # the state of the tracker before each move applied, restored when the move is undone
+
+        # the groups are built by placing the game pieces one at a time on an empty board
+        for cell in range(NUM_OF_CELLS):
+            if board.cells[cell] != EMPTY:
+                self.place(cell, board.cells[cell])
+
+    def find(self, node: int) -> int:
+        """
+        Finds the root of the group of a node, halving the path to the root along the way.
+        :param node: an int, the node
+        :return: an int, the root node
+        """
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def get_group_count(self, color: str) -> int:
+        """
+        Gets the number of groups of the turn_color.
+        :param color: a string, the turn_color
+        :return: an int
+        """
+        return self.counts[COLOR_CODES[color]]
+
+    def get_size_counts(self, color: str) -> list:
+        """
+        Gets the number of groups of each size of the turn_color.
+        :param color: a string, the turn_color
+        :return: a list, of the number of groups indexed by size
+        """
+        offset = SIZE_COUNT_OFFSETS[COLOR_CODES[color]]
+        return self.counts[offset:offset + MAX_GROUP_SIZE + 1]
+
+    def get_group_size(self, cell: int) -> int:
+        """
+        Gets the size of the group of a game piece.
+        :param cell: an int, the cell id of the game piece
+        :return: an int
+        """
+        return self.size[self.find(self.cell_nodes[cell])]
+
+    def place(self, cell: int, code: int):
+        """
+        Places a game piece on an unoccupied space, joining it with the groups of its allied neighbours.
+        :param cell: an int, the cell id of the space
+        :param code: an int, the cell value of the game piece
+        """
+        cells = self.cells
+        cell_nodes = self.cell_nodes
+        parent = self.parent
+        size = self.size
+        counts = self.counts
+        offset = SIZE_COUNT_OFFSETS[code]
+
+        root = len(parent)
+        parent.append(root)
+        size.append(1)
+        cells[cell] = code
+        cell_nodes[cell] = root
+        counts[offset + 1] += 1
+        counts[code] += 1
+
+        for neighbor in NEIGHBORS[cell]:
+            if neighbor == OFF_BOARD or cells[neighbor] != code:
+                continue
+
+            # finds the root of the neighbour's group, the same as find without the call
+            other_root = cell_nodes[neighbor]
+            while parent[other_root] != other_root:
+                parent[other_root] = parent[parent[other_root]]
+                other_root = parent[other_root]
+            if other_root == root:
+                continue
+
+            # the smaller group is joined onto the root of the larger group
+            if size[other_root] > size[root]:
+                root, other_root = other_root, root
+            counts[offset + size[root]] -= 1
+            counts[offset + size[other_root]] -= 1
+            parent[other_root] = root
+            size[root] += size[other_root]
+            counts[offset + size[root]] += 1
+            counts[code] -= 1
+
+    def remove(self, cell: int):
+        """
+        Removes a game piece from the game board, splitting its group into the parts that are no longer connected.
+        :param cell: an int, the cell id of the game piece
+        """
+        cells = self.cells
+        cell_nodes = self.cell_nodes
+        size = self.size
+        code = cells[cell]
+        counts = self.counts
+        offset = SIZE_COUNT_OFFSETS[code]
+
+        root = self.find(cell_nodes[cell])
+        counts[offset + size[root]] -= 1
+        cells[cell] = EMPTY
+        cell_nodes[cell] = None
+
+        # adjacent neighbours of the space are adjacent to each other, so each contiguous arc of allied neighbours stays
+        # connected, and a single arc is the rest of the group
+        arcs = []  # a game piece from each arc
+        for neighbor, previous_neighbor in NEIGHBOR_PAIRS[cell]:
+            if cells[neighbor] == code and (previous_neighbor == OFF_BOARD or cells[previous_neighbor] != code):
+                arcs.append(neighbor)
+
+        # a space surrounded by allied game pieces has a single arc without a start
+        surrounded = not arcs and len(NEIGHBOR_PAIRS[cell]) == len(DIRECTIONS) \
+            and cells[NEIGHBOR_PAIRS[cell][0][0]] == code
+        if len(arcs) == 1 or surrounded:
+            size[root] -= 1
+            counts[offset + size[root]] += 1
+            return
+        counts[code] -= 1
+        if not arcs:
+            return
+
+        # searches outwards from each arc not already reached from a previous arc, giving each part a new root
+        parent = self.parent
+        relabelled = set()
+        for arc in arcs:
+            if arc in relabelled:
+                continue
+
+            relabelled.add(arc)
+            part = [arc]
+            index = 0
+            while index < len(part):
+                for adjacent_piece in NEIGHBORS[part[index]]:
+                    if adjacent_piece != OFF_BOARD and cells[adjacent_piece] == code \
+                            and adjacent_piece not in relabelled:
+                        relabelled.add(adjacent_piece)
+                        part.append(adjacent_piece)
+                index += 1
+
+            part_root = len(parent)
+            parent.append(part_root)
+            size.append(len(part))
+            for piece in part:
+                parent[cell_nodes[piece]] = part_root
+            counts[offset + len(part)] += 1
+            counts[code] += 1
+
+    def apply_move(self, changed_spaces: tuple, cells: bytearray):
+        """
+        Updates the groups after a move was applied to the board.
+        :param changed_spaces: a tuple of (cell, previous value) tuples changed by the move
+        :param cells: a bytearray, of the board after the move
+        """
+        self.history.append((self.cells[:], self.cell_nodes[:], self.parent[:], self.size[:], self.counts[:]))
+
+        # removes the game pieces leaving the changed spaces, then places the game pieces entering them
+        for cell, value in changed_spaces:
+            if value != EMPTY:
+                self.remove(cell)
+        for cell, value in changed_spaces:
+            if cells[cell] != EMPTY:
+                self.place(cell, cells[cell])
+
+    def undo_move(self):
+        """
+        Restores the groups after the last move applied was undone on the board.
+        """
+        self.cells, self.cell_nodes, self.parent, self.size, self.counts = self.history.pop()
@@ -0,0 +1,194 @@
+from utils.converter import Converter
+from utils.hex_grid import NUM_OF_ROWS
+
+
+def initialize_default_layout(game_board: dict):
+    """
+    Initializes the game board array representing the game board with the game pieces of each turn_color in the standard,
+    default, layout.
+    """
+    lines_to_fill = 2
+
+    for row in range(lines_to_fill):
+        row_key = "row" + str(row)
+
+        for col in range(Converter.calculate_row_length(row)):
+            game_board.get(row_key)[col].update({"turn_color": "white"})
+
+            if row == 1:  # populates front 3 white pieces
+                for nested_col in range(2, 5):
+                    game_board.get("row2")[nested_col].update({"turn_color": "white"})
+
+    for row in range(7, 9):
+        row_key = "row" + str(row)
+
+        if (row - 1) == 6:  # populates front 3 black pieces
+            for nested_col in range(2, 5):
+                game_board.get("row6")[nested_col].update({"turn_color": "black"})
+        for col in range(Converter.calculate_row_length(row)):
+            game_board.get(row_key)[col].update({"turn_color": "black"})
+
+
+def initialize_german_layout(game_board: dict):
+    """
+    Initializes the game board array representing the game board with the game pieces of each turn_color in the German
+    daisy layout.
+    :param game_board: a dictionary, of the game board to add the game pieces to
+    """
+    ZERO_INDEX_OFFSET = 1
+    lines_to_fill = 2 + ZERO_INDEX_OFFSET
+
+    # populates top half of the game board (rows I to F)
+    for row in range(lines_to_fill):
+        row_key = "row" + str(row)
+
+        for col in range(Converter.calculate_row_length(row)):
+
+            if row == 0:  # populates game pieces on the first row (row I)
+                if col in range(0, 1 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on first row (row I)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+                if col in range(3, 4 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on first row (row I)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+            if row == 1:  # populates game pieces on the second row (row H)
+                if col in range(0, 2 + ZERO_INDEX_OFFSET):  # populates 3 white pieces on second row (row H)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+                if col in range(3, 5 + ZERO_INDEX_OFFSET):  # populates 3 black pieces on second row (row H)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+            if row == 2:  # populates game pieces on the third row (row G)
+                if col in range(1, 2 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on third row (row G)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+                if col in range(4, 5 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on third row (row G)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+    # populates lower half of the game board (rows C to D)
+    for row in range(6, 8 + ZERO_INDEX_OFFSET):
+        row_key = "row" + str(row)
+
+        for col in range(Converter.calculate_row_length(row)):
+
+            if row == 6:  # populates game pieces on the seventh row (row C)
+                if col in range(1, 2 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on seventh row (row C)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+                if col in range(4, 5 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on seventh row (row C)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+            if row == 7:  # populates game pieces on the eighth row (row B)
+                if col in range(0, 2 + ZERO_INDEX_OFFSET):  # populates 3 black pieces on eighth row (row B)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+                if col in range(3, 5 + ZERO_INDEX_OFFSET):  # populates 3 white pieces on eighth row (row B)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+            if row == 8:  # populates game pieces on the ninth row (row A)
+                if col in range(0, 1 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on ninth row (row A)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+                if col in range(3, 4 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on ninth row (row A)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+
+def initialize_belgian_layout(game_board: dict):
+    """
+    Initializes the game board array representing the game board with the game pieces of each turn_color in the Belgian
+    daisy layout.
+    :param game_board: a dictionary, of the game board to add the game pieces to
+    """
+    ZERO_INDEX_OFFSET = 1
+    lines_to_fill = 3 + ZERO_INDEX_OFFSET
+
+    # populates top half of the game board (rows I to F)
+    for row in range(1, lines_to_fill):
+        row_key = "row" + str(row)
+
+        for col in range(Converter.calculate_row_length(row)):
+
+            if row == 1:  # populates game pieces on the second row (row H)
+                if col in range(0, 1 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on second row (row H)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+                if col in range(4, 5 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on second row (row H)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+            if row == 2:  # populates game pieces on the third row (row G)
+                if col in range(0, 2 + ZERO_INDEX_OFFSET):  # populates 3 white pieces on second row (row HG)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+                if col in range(4, 6 + ZERO_INDEX_OFFSET):  # populates 3 black pieces on second row (row G)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+            if row == 3:  # populates game pieces on the fourth row (row F)
+                if col in range(1, 2 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on second row (row F)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+                if col in range(5, 6 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on second row (row F)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+    # populates lower half of the game board (rows C to D)
+    for row in range(5, 7 + ZERO_INDEX_OFFSET):
+        row_key = "row" + str(row)
+
+        for col in range(Converter.calculate_row_length(row)):
+
+            if row == 5:  # populates game pieces on the sixth row (row D)
+                if col in range(1, 2 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on second row (row D)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+                if col in range(5, 6 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on second row (row D)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+            if row == 6:  # populates game pieces on the seventh row (row C)
+                if col in range(0, 2 + ZERO_INDEX_OFFSET):  # populates 3 black pieces on second row (row C)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+                if col in range(4, 6 + ZERO_INDEX_OFFSET):  # populates 3 white pieces on second row (row C)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+            if row == 7:  # populates game pieces on the eighth row (row B)
+                if col in range(0, 1 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on second row (row B)
+                    game_board[row_key][col].update({"turn_color": "black"})
+
+                if col in range(4, 5 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on second row (row B)
+                    game_board[row_key][col].update({"turn_color": "white"})
+
+
+def initialize_game_board_array() -> dict:
+    """
+    Initializes the dictionary representing the game board, with no game pieces and no GUI coordinates.
+    :return: a dictionary, of the game board
+    """
+    game_board = {}
+
+    for row in range(NUM_OF_ROWS):
+        row_key = "row" + str(row)
+        game_board.update({row_key: []})
+
+        for col in range(Converter.calculate_row_length(row)):
+            game_board.get(row_key).append(
+                {"colNum": col, "turn_color": None, "selected": False, "x_pos": None, "y_pos": None})
+
+    return game_board
+
+
+# the starting layouts by name, the GUI's config setting selects the german (3) and belgian (2) layouts
+LAYOUTS = {
+    "standard": initialize_default_layout,
+    "german": initialize_german_layout,
+    "belgian": initialize_belgian_layout
+}
+
+
+def create_layout(layout: str) -> dict:
+    """
+    Creates a game board with the game pieces in the specified starting layout.
+    :param layout: a string, the name of the layout (standard, german, or belgian)
+    :return: a dictionary, of the game board
+    """
+    game_board = initialize_game_board_array()
+    LAYOUTS[layout](game_board)
+    return game_board
@@ -1,29 +1,33 @@
-from copy import deepcopy
 from utils.converter import Converter
+from board_state.compact_board import *
+from board_state.zobrist import hash_board, update_hash
 
 
 class StateSpaceGenerator:
     """
     Encapsulates the methods required to generate the state space at any given game state.
+
+    The generator works on a CompactBoard. If it's provided the dictionary representing the game board used by the
+    GUI, then it's converted once, and the generated states are converted back to the GUI's game board dictionary.
     """
 
+    # complimentary directions (E, NE, NW) used to find the pieces in line with a piece for sidesteps, so each line of
+    # pieces is only found once from the piece at the end of the line
+    line_directions = (1, 0, 5)
+
     def __init__(self, board, turn):
         self.file_name = ''
         self.turn = turn
         self.board_text = ""
         self.possible_moves = set()
-        self.possible_moves_single = set()
-        self.possible_moves_double = set()
-        self.possible_moves_triple = set()
-        self.possible_moves_sumito = set()
-        self.possible_moves_sumito_move_notation = set()
-        self.possible_moves_sidestep = set()
-        self.possible_moves_sidestep_move_notation = set()
-        self.sumito_trailing_piece_turn_color = None
-        self.sumito_leading_piece_opposing_color = None
-        self.group = None
+        self.possible_moves_single = []
+        self.possible_moves_double = []
+        self.possible_moves_triple = []
+        self.possible_moves_sumito = []
+        self.possible_moves_sidestep = []
         self.game = board
-        self.reset_board = None
+        self.board = None
+        self.set_board(board)
         self.rows = {
             "I": 0,
             "H": 1,
@@ -47,702 +51,425 @@ class StateSpaceGenerator:
             "W": (0, -1),
             "NW": (-1, -1)
         }
-        self.opposite_direction = {
-            "NE": "SW",
-            "E": "W",
-            "SE": "NW",
-            "SW": "NE",
-            "W": "E",
-            "NW": "SE"
-        }
-        self.sidestep_directions = {
-            "NE": ["E", "NW"],
-            "E": ["NE", "NW"],
-            "SE": ["E", "NE"],
-            "SW": ["E", "NW"],
-            "W": ["NE", "NW"],
-            "NW": ["E", "NE"]
-        }
-        self.updated_game_board = None  # contains the working game board
         self.states = []
 
     def set_player_turn(self, turn):
         """
-        sets current turn
+        sets current turn, and rehashes the board for the player to move
         """
         self.turn = turn
+        if self.board is not None:
+            self.board.zobrist = hash_board(self.board, turn)
 
     def set_board(self, board):
         """
-        sets board
+        sets board, converting the GUI's game board dictionary to a CompactBoard if required, and hashes it
         """
         self.game = board
+        if isinstance(board, CompactBoard):
+            self.board = board
+        elif board is not None:
+            self.board = CompactBoard.from_game_board(board)
 
-    @staticmethod
-    def simulate_game_piece_movement(row_num, col_num: int, direction: tuple) -> tuple:
+        if self.board is not None:
+            self.board.zobrist = hash_board(self.board, self.turn)
+
+    def translate_test_input_to_board_notation(self):
         """
-        Simulates moving the specified game piece in the specified adjusted_direction_tuple, and then returns the new coordinates
-        of the game piece.
+        Creates a game board based on test input.
 
-        :param row_num: a string of the row key, or an int of the row number
-        :param col_num: an int of the column number
-        :param direction: a tuple containing the adjusted_direction_tuple of movement
-        :return: a tuple (str, int) where the string is the row key and the int is  the column number
+        :return: None
         """
-        row_dir = direction[0]
-        col_dir = Converter.calculate_adjusted_col_direction(row_num, direction)
+        self.board = CompactBoard()
+        self.game = self.board
 
-        if type(row_num) != int:
-            row_num = Converter.convert_row_to_string_or_int(row_num)
+        piece_list = self.board_text.strip().split(',')
+        for item in piece_list:
+            cell = EXTERNAL_TO_CELL[item[0:2]]
+            self.board.cells[cell] = COLOR_CODES[self.colors[item[2]]]
+        self.board.zobrist = hash_board(self.board, self.turn)
 
-        new_row_num = row_num + row_dir
-        new_col_num = col_num + col_dir
+    def create_piece_list_for_current_turn(self):
+        """
+        Iterates through the game board and calls helper methods to find all possible moves given a specific board
+        state.
+        """
+        turn = COLOR_CODES[self.turn]
+        cells = self.board.cells
 
-        new_row_key = Converter.convert_row_to_string_or_int(new_row_num)
-        return new_row_key, new_col_num
+        for cell in range(NUM_OF_CELLS):
+            if cells[cell] == turn:
+                self.generate_all_moves(cell)
 
-    def translate_test_input_to_board_notation(self):
+    def generate_all_moves(self, cell: int):
         """
-        Creates a game board array based on test input.
+        Generates all of the inline, sumito, and sidestep moves for the game piece at the specified cell.
 
-        :return: None
+        :param cell: an int, the cell id of the game piece
         """
-        self.game.initialize_game_board_array()
+        self.generate_inline_moves(cell)
+        self.generate_sidestep_moves(cell)
 
-        piece_list = self.board_text.split(',')
-        for item in piece_list:
-            row = self.rows[item[0]]
-            row_key = "row" + str(row)
-            col = int(item[1])
-            color = self.colors[item[2]]
-            column = Converter.calculate_column(row, col)
-            row_list = self.game[row_key]
-            row_list[column]['turn_color'] = color
+    def generate_inline_moves(self, cell: int):
+        """
+        Finds all of the possible inline moves for 1, 2, and 3 piece groupings, as well as the 2 and 3 grouped sumitos,
+        where the specified game piece is the leading piece of the grouping, and adds them to the move lists.
 
-    def create_piece_list_for_current_turn(self):
+        :param cell: an int, the cell id of the leading game piece
         """
-        Iterates through the game board and calls helper methods to all possible moves given a specific board state.
+        for move in self.get_inline_moves(cell):
+            if len(move[1]) == 1:
+                self.possible_moves_single.append(move)
+            elif len(move[1]) == 2:
+                self.possible_moves_double.append(move)
+            else:
+                self.possible_moves_triple.append(move)
+
+        self.possible_moves_sumito.extend(self.get_sumito_moves(cell))
+
+    def generate_sidestep_moves(self, cell: int):
         """
-        # create an image of board before changes
-        self.updated_game_board = deepcopy(self.game)
+        Finds all of the legal sidestep moves for the 2 and 3 piece groupings that start with the specified game piece,
+        and adds them to the sidestep move list.
 
-        for item in self.game.items():
-            row_key = item[0]
-            for column_detail in item[1]:
-                # if "white" in column_detail.values():
-                #     print(column_detail)
-                if self.turn in column_detail.values():
-                    self.generate_all_moves(row_key, column_detail)
+        :param cell: an int, the cell id of the game piece at the end of the grouping
+        """
+        self.possible_moves_sidestep.extend(self.get_sidestep_moves(cell))
 
-    def get_sumito_num_of_adj_pieces(self, piece_color: str, row_key: str, col_num: int, direction: str,
-                                     groupings=2) -> int:
+    def get_grouping(self, cell: int, direction: int) -> list:
         """
-        Gets the number of adjacent pieces of the same turn_color passed to this method. Checks the pieces adjacent to the
-        specified piece in the specified vector of adjusted_direction_tuple. The number of groups can be specified to determine if the
-        method searches for 2 or 3 piece groupings.
+        Gets the game pieces of the same turn_color in line with the specified game piece in the specified direction,
+        up to a grouping of 3.
 
-        :param piece_color: a string, the turn_color of the adjacent pieces to get
-        :param row_key: a string, containing the row of the piece to find adjacent pieces for
-        :param col_num: an int, containing the column of the piece to find adjacent pieces for
-        :param direction: a string of the raw cardinal adjusted_direction_tuple of movement (e.g. 'NE' or 'S')
-        :param groupings: an int, the number of grouped pieces to perform a sumito, set to 2 by default
-        :return: an int, the number of pieces adjacent to the groupings
+        :param cell: an int, the cell id of the game piece at the start of the grouping
+        :param direction: an int, the index of the direction of the line
+        :return: a list of cell ids, starting with the specified game piece
         """
-        row_num = Converter.convert_row_to_string_or_int(row_key)   # converts the row key to a number
+        cells = self.board.cells
+        turn = cells[cell]
+        grouping = [cell]
+        for adj_piece in RAYS[cell][direction][:2]:
+            if cells[adj_piece] != turn:
+                break
+            grouping.append(adj_piece)
+        return grouping
 
-        # gets the opposite adjusted_direction_tuple tuple to check for adjacent game pieces
-        opposite_dir_tuple = self.move_directions[self.opposite_direction[direction]]
+    def get_inline_moves(self, cell: int) -> list:
+        """
+        Gets the inline moves, into unoccupied spaces, of the 1, 2, and 3 piece groupings where the specified game
+        piece is the leading piece of the grouping.
 
-        # adjusts the adjusted_direction_tuple tuple
-        adjusted_opposite_dir_tuple = (
-            opposite_dir_tuple[0], Converter.calculate_adjusted_col_direction(row_num, opposite_dir_tuple))
+        A move is a tuple of (move type, cells of the moved pieces from the leading to the trailing piece, direction,
+        number of opposing pieces pushed).
 
-        # gets the row key and the column number of the adjacent game piece to be checked
-        new_row_num = adjusted_opposite_dir_tuple[0] + row_num
-        new_row_key = Converter.convert_row_to_string_or_int(new_row_num)
-        new_col_num = adjusted_opposite_dir_tuple[1] + col_num
+        :param cell: an int, the cell id of the leading game piece
+        :return: a list of moves
+        """
+        cells = self.board.cells
+        moves = []
 
-        num_of_adj_pieces = 0
-        # ensures column number isn't off the game board
-        if new_col_num >= 0:
-            try:
-                # gets the turn_color of the adjacent game piece
-                adj_space_piece_color = self.updated_game_board[new_row_key][new_col_num]["turn_color"]
+        for direction in range(6):
+            space_in_front = NEIGHBORS[cell][direction]
+            if space_in_front == OFF_BOARD or cells[space_in_front] != EMPTY:
+                continue
 
-                # checks if the adjacent game piece is the same turn_color, or else it returns 0
-                if adj_space_piece_color == piece_color:
-                    num_of_adj_pieces += 1
-                else:
-                    return num_of_adj_pieces
+            # gets the pieces of the turn turn_color in line behind the leading piece
+            grouping = self.get_grouping(cell, OPPOSITE_DIRECTION[direction])
+            for num_of_pieces in range(1, len(grouping) + 1):
+                moves.append(("i", tuple(grouping[:num_of_pieces]), direction, 0))
 
-                # checks for the second adjacent game piece
-                if groupings == 3:
-
-                    # gets the new row and column of the second adjacent game piece
-                    new_col_num = Converter.calculate_adjusted_col_direction(new_row_num, opposite_dir_tuple) + new_col_num
-                    new_row_num = adjusted_opposite_dir_tuple[0] + new_row_num
-
-                    # ensures column number isn't out of bounds
-                    if new_col_num < 0:
-                        raise KeyError
-
-                    # checks if the row is out of bounds, and if so it means there isn't a second adjacent game piece
-                    if new_row_num < 0:
-                        return num_of_adj_pieces
-
-                    # gets the new row key of the second adjacent game piece
-                    new_row_key = Converter.convert_row_to_string_or_int(new_row_num)
-
-                    # checks if second adjacent game piece is the same turn_color
-                    adj_space_piece_color = self.updated_game_board[new_row_key][new_col_num]["turn_color"]
-                    if (adj_space_piece_color == piece_color):
-                        num_of_adj_pieces += 1
-
-            except (IndexError, KeyError):
-                # print("Adjacent piece check out of board area")
-                return num_of_adj_pieces
-
-        return num_of_adj_pieces
-
-    def generate_inline_moves(self, row_key: str, column_detail: dict):
-        """
-        Runs the engine to find all of the possible inline moves for 2 and 3 groupings, as well as 2 and 3 grouped
-        sumitos.
-
-        :param row_key: a string containing the row (e.g. 'row4')
-        :param column_detail: a dictionary containing the pieces for a row
-        """
-        # gets the row and column number of the game piece to generate inline moves for
-        row_num = Converter.convert_row_to_string_or_int(row_key)
-        col_num = column_detail['colNum']
-
-        # gets the external notation of the game piece to be checked (e.g. "H6")
-        piece = Converter.internal_notation_to_external(row_num, col_num)
-
-        # iterates through the directions to check for each inline move
-        for direction in self.move_directions:
-            direction_tuple = self.move_directions.get(direction)
-
-            # gets the row key and column number of where we want to move the game piece to
-            new_row_num = Converter.convert_row_to_string_or_int(row_key) + direction_tuple[0]
-            new_col_num = col_num + Converter.calculate_adjusted_col_direction(row_num, direction_tuple)
-            new_row_key = Converter.convert_row_to_string_or_int(new_row_num)
-
-            try:
-                # ensures column number isn't out of bounds
-                if new_col_num < 0:
-                    raise KeyError
-
-                # checks if the space we want to move to is unoccupied or if it's within the game board
-                space_value = self.game[new_row_key][new_col_num]['turn_color']
-                if space_value is None:
-                    # piece can move
-                    pieces = (piece, piece)
+        return moves
 
-                    # adds the valid move for a single piece to the single move set
-                    self.possible_moves_single.add(("i", pieces, direction, new_row_key, new_col_num))
-
-                    # generates the moves for group inline moves
-                    self.possible_multiple_piece_inline_groups(direction, row_key, col_num, new_row_num, new_col_num)
+    def get_sumito_moves(self, cell: int) -> list:
+        """
+        Gets the 2 and 3 grouped sumitos where the specified game piece is the leading piece of the grouping.
 
-                # after checking for inline moves, valid sumitos are then checked here
-                opposite_color = Converter.get_opposite_color(self.turn)
-                if space_value == opposite_color and new_col_num >= 0:
+        :param cell: an int, the cell id of the leading game piece
+        :return: a list of moves
+        """
+        cells = self.board.cells
+        opposing = BLACK if cells[cell] == WHITE else WHITE
+        moves = []
 
-                    # 2 group sumitos are checked first, and then 3 group sumitos
-                    sumito_groupings = 2
-                    while sumito_groupings < 4:
+        for direction in range(6):
+            space_in_front = NEIGHBORS[cell][direction]
+            if space_in_front == OFF_BOARD or cells[space_in_front] != opposing:
+                continue
 
-                        # gets the number of adjacent pieces of the turn turn_color
-                        num_of_adj_selected_pieces = self.get_sumito_num_of_adj_pieces(self.turn, row_key, col_num,
-                                                                                       direction, sumito_groupings)
+            # counts the opposing pieces in line in front of the leading piece
+            ray = RAYS[cell][direction]
+            num_of_opposing_pieces = 0
+            while num_of_opposing_pieces < len(ray) and cells[ray[num_of_opposing_pieces]] == opposing:
+                num_of_opposing_pieces += 1
 
-                        # gets the opposite adjusted_direction_tuple to check for adjacent pieces of the opposite turn_color
-                        opposite_direction = self.opposite_direction[direction]
-                        opposite_direction_tuple = self.move_directions[opposite_direction]
-                        num_of_adj_opposing_pieces = self.get_sumito_num_of_adj_pieces("white", new_row_key,
-                                                                                       new_col_num, opposite_direction,
-                                                                                       sumito_groupings)
+            # the leading opposing piece must be pushed into an unoccupied space, or off of the game board, and at most
+            # 2 opposing pieces can be pushed
+            if num_of_opposing_pieces == RAY_LENGTH:
+                continue
+            if num_of_opposing_pieces < len(ray) and cells[ray[num_of_opposing_pieces]] != EMPTY:
+                continue
 
-                        # if num of adjacent pieces of current turn_color is greater than num of adjacent pieces of opposing
-                        # turn_color them sumito is performed
-                        if num_of_adj_selected_pieces > num_of_adj_opposing_pieces:
-                            # getting row and col of space where sumito'ed piece is going to end up
+            grouping = self.get_grouping(cell, OPPOSITE_DIRECTION[direction])
+            for num_of_pieces in range(num_of_opposing_pieces + 1, len(grouping) + 1):
+                moves.append(("i", tuple(grouping[:num_of_pieces]), direction, num_of_opposing_pieces))
 
-                            # gets the internal coords for the leading piece of the opposing turn_color that will be sumitoed
-                            leading_piece = Converter.get_leading_or_trailing_piece(new_row_num, new_col_num,
-                                                                                    num_of_adj_opposing_pieces,
-                                                                                    direction_tuple)
+        return moves
 
-                            # gets the space that the leading piece will be sumito'ed to
-                            piece_in_front_leading_piece = Converter.get_leading_or_trailing_piece(leading_piece[0],
-                                                                                                   leading_piece[1], 1,
-                                                                                                   direction_tuple)
+    def get_sidestep_moves(self, cell: int) -> list:
+        """
+        Gets the legal sidestep moves for the 2 and 3 piece groupings that start with the specified game piece.
 
-                            # extracts the row key and column number of the space where
-                            # the leading piece will be sumito'ed
-                            space_in_front_row_key = piece_in_front_leading_piece[0]
-                            piece_in_front_col_num = piece_in_front_leading_piece[1]
+        :param cell: an int, the cell id of the game piece at the end of the grouping
+        :return: a list of moves
+        """
+        cells = self.board.cells
+        moves = []
 
-                            try:
-                                # ensures column isn't out of bounds
-                                if piece_in_front_col_num < 0:
-                                    raise KeyError
+        for line_direction in self.line_directions:
+            grouping = self.get_grouping(cell, line_direction)
+            if len(grouping) < 2:
+                continue
 
-                                # checks if the space in front of the leading space is un-occupied
-                                if self.updated_game_board[space_in_front_row_key][piece_in_front_col_num]["turn_color"] is None:
-                                    self.add_valid_sumito_to_move_set(col_num, direction, direction_tuple,
-                                                                      leading_piece, num_of_adj_selected_pieces,
-                                                                      opposite_direction_tuple, piece, row_num)
+            for direction in range(6):
+                # sidesteps can't be performed along the line of the grouping
+                if direction == line_direction or direction == OPPOSITE_DIRECTION[line_direction]:
+                    continue
 
-                            # if an IndexError is raised, that means a piece is going to be pushed off the board
-                            except (IndexError, KeyError):
-                                self.add_valid_sumito_to_move_set(col_num, direction, direction_tuple, leading_piece,
-                                                                  num_of_adj_selected_pieces, opposite_direction_tuple,
-                                                                  piece, row_num)
+                # each piece of the grouping must move into an unoccupied space within the game board
+                for num_of_pieces in range(0, len(grouping)):
+                    sidestep_space = NEIGHBORS[grouping[num_of_pieces]][direction]
+                    if sidestep_space == OFF_BOARD or cells[sidestep_space] != EMPTY:
+                        break
 
-                        sumito_groupings += 1
+                    if num_of_pieces > 0:
+                        moves.append(("s", tuple(grouping[:num_of_pieces + 1]), direction, 0))
 
-            except (IndexError, KeyError):
-                # print("Sumito check outside board area")
-                pass
-
-    def possible_multiple_piece_inline_groups(self, direction: str, row_key: str, col_num: int, new_row: int,
-                                              new_column: int):
-        """
-        Finds the possible valid moves for inline moves with 2 and 3 piece groupings.
-
-        :param direction: a string of the raw cardinal adjusted_direction_tuple of movement (e.g. 'NE' or 'S')
-        :param row_key: a string of the row key
-        :param col_num: an int of the column number
-        :param new_row: an int of the row of the desired space to move to
-        :param new_column: an int of the new column of desired space to move to
-        """
-        selected_row_num = Converter.convert_row_to_string_or_int(row_key) # converts the row key to a number
-
-        # gets the tuple of the opposite adjusted_direction_tuple
-        opposite_dir = self.opposite_direction.get(direction)
-        opposite_dir_tuple = self.move_directions[opposite_dir]
-
-        adjusted_new_row_num = selected_row_num + opposite_dir_tuple[0]
-        adjusted_piece_row_key = Converter.convert_row_to_string_or_int(adjusted_new_row_num)
-        adjusted_piece_col_num = col_num + Converter.calculate_adjusted_col_direction(selected_row_num, opposite_dir_tuple)
-
-        if self.is_valid_adjacent_piece(adjusted_piece_row_key, adjusted_piece_col_num):
-
-            # gets the external notation for the leading and last game piece (e.g. H6)
-            leading_piece_coords = Converter.internal_notation_to_external(selected_row_num, col_num)
-            trailing_piece_coords = Converter.internal_notation_to_external(adjusted_new_row_num, adjusted_piece_col_num)
-
-            pieces = (leading_piece_coords, trailing_piece_coords)
-            new_row_key = Converter.convert_row_to_string_or_int(new_row)
+        return moves
 
-            self.possible_moves_double.add(("i", pieces, direction, new_row_key, new_column))
+    def iter_moves(self, order_moves=None):
+        """
+        Lazily yields the moves for the current turn on the generator's board, one at a time. Sumitos are yielded
+        first, with sumitos that push a piece off of the game board before the others, and then the inline and sidestep
+        moves are generated piece by piece as they're requested. A search that finds a cutoff early doesn't pay to
+        generate the remaining moves.
+
+        The board may be changed between moves as long as it's restored (e.g. with apply_move and undo_move) before
+        the next move is requested.
 
-            # Checks for 3-piece move groups
-            # ----------------------------------------------------------------------------------------------------
-            adjusted_piece_col_num = adjusted_piece_col_num + Converter.calculate_adjusted_col_direction(adjusted_new_row_num, opposite_dir_tuple)
-
-            adjusted_new_row_num = adjusted_new_row_num + opposite_dir_tuple[0]
-            adj_piece_row_key = Converter.convert_row_to_string_or_int(adjusted_new_row_num)
-
-            if self.is_valid_adjacent_piece(adj_piece_row_key, adjusted_piece_col_num):
-                leading_piece_coords = Converter.internal_notation_to_external(selected_row_num, col_num)
-                trailing_piece_coords = Converter.internal_notation_to_external(adjusted_new_row_num, adjusted_piece_col_num)
-
-                pieces = (leading_piece_coords, trailing_piece_coords)
-                new_row_key = Converter.convert_row_to_string_or_int(new_row)
+        :param order_moves: a function taking a list of moves and returning them in the order to search, applied to
+                            the sumitos and then to the remaining moves (which are then generated together)
+        :return: a generator of moves
+        """
+        turn = COLOR_CODES[self.turn]
+        cells = self.board.cells
+        pieces = [cell for cell in range(NUM_OF_CELLS) if cells[cell] == turn]
 
-                self.possible_moves_triple.add(("i", pieces, direction, new_row_key, new_column))
-
-    def add_valid_sumito_to_move_set(self, col_num: int, direction: str, direction_tuple: tuple, leading_piece: tuple,
-                                     num_of_adj_selected_pieces: int, opposite_direction_tuple: tuple, piece: str,
-                                     row_num: int):
-        """
-        Helper method containing the logic to perform the sumito. Adds the type of move, the pieces involved in the
-        sumito, the adjusted_direction_tuple of movement, as well as the internal board coordinates of game board space the movement
-        is going to occur. Also generates the move notation for sumitos.
+        sumitos = []
+        for cell in pieces:
+            sumitos.extend(self.get_sumito_moves(cell))
+        sumitos.sort(key=self.is_capture, reverse=True)
+        if order_moves is not None:
+            sumitos = order_moves(sumitos)
+        yield from sumitos
 
-        :param col_num: a int, of the column number of the selected piece
-        :param direction: a string of the raw cardinal adjusted_direction_tuple (e.g. 'NE', 'W')
-        :param direction_tuple: a tuple containing the coordinates of the adjusted_direction_tuple of movement (e.g. '(-1, 1)')
-        :param leading_piece: a tuple containing the internal coordinates of the leading piece
-        :param num_of_adj_selected_pieces: an int of the number of pieces adjacent to the selected piece
-        :param opposite_direction_tuple: a tuple containing the coordinates of the opposite adjusted_direction_tuple of movement
-        :param piece: a str of the selected piece in external board notatation (e.g. 'G3')
-        :param row_num: an int
-        :return:
+        if order_moves is not None:
+            moves = []
+            for cell in pieces:
+                moves.extend(self.get_inline_moves(cell))
+                moves.extend(self.get_sidestep_moves(cell))
+            yield from order_moves(moves)
+            return
+
+        for cell in pieces:
+            yield from self.get_inline_moves(cell)
+            yield from self.get_sidestep_moves(cell)
+
+    @staticmethod
+    def is_capture(move: tuple) -> bool:
         """
-        # gets the turn_color of the leading game piece that will be sumito'ed
-        leading_piece_color = self.updated_game_board[leading_piece[0]][leading_piece[1]]["turn_color"]
-        if leading_piece_color != self.turn:
+        Checks if the move is a sumito that pushes an opposing game piece off of the game board.
 
-            # gets the internal coordinates of the trailing piece of the turn turn_color
-            trailing_piece = Converter.get_leading_or_trailing_piece(row_num, col_num, num_of_adj_selected_pieces,
-                                                                     opposite_direction_tuple)
+        :param move: a tuple, of the move
+        :return: a boolean
+        """
+        if move[3] == 0:
+            return False
+        return NEIGHBORS[StateSpaceGenerator.get_leading_opposing_piece(move)][move[2]] == OFF_BOARD
 
-            # extracts the row number and column number of the leading piece that will be sumito'ed
-            leading_piece_row_num = Converter.convert_row_to_string_or_int(leading_piece[0])
-            leading_piece_col_num = leading_piece[1]
-            # gets the space that the leading game piece wil lbe sumito'ed to
-            empty_space_coords = self.simulate_game_piece_movement(leading_piece_row_num, leading_piece_col_num,
-                                                                   direction_tuple)
+    @staticmethod
+    def get_leading_opposing_piece(move: tuple) -> int:
+        """
+        Gets the cell of the opposing game piece at the front of a sumito.
 
-            # converts the notation of the leading piece from internal to external notation (e.g. H6)
-            leading_piece = Converter.internal_notation_to_external(leading_piece[0], leading_piece[1])
+        :param move: a tuple, of the sumito move
+        :return: an int, the cell id of the leading opposing game piece
+        """
+        leading_piece = move[1][0]
+        for _ in range(0, move[3]):
+            leading_piece = NEIGHBORS[leading_piece][move[2]]
+        return leading_piece
 
-            # gets the space that the piece behind the leading piece will move to
-            second_place_piece = self.simulate_game_piece_movement(leading_piece_row_num, leading_piece_col_num,
-                                                                   opposite_direction_tuple)
-            # converts the notation of the second place piece from internal to external (e.g. H6)
-            second_place_piece = Converter.internal_notation_to_external(second_place_piece[0], second_place_piece[1])
+    @staticmethod
+    def apply_move_to_board(board: CompactBoard, move: tuple) -> tuple:
+        """
+        Applies the move to the compact board in place, and returns the previous value of every space that was
+        changed so the move can be undone. The board's Zobrist hash is updated for the changed spaces and the change
+        of turn.
+
+        :param board: a CompactBoard
+        :param move: a tuple, of the move to apply
+        :return: a tuple of (cell, previous value) tuples, in the order the spaces were changed
+        """
+        cells = board.cells
+        moved_pieces = move[1]
+        direction = move[2]
+        turn = cells[moved_pieces[0]]
+
+        if move[0] == "s":
+            changed_spaces = []
+            for piece in moved_pieces:
+                sidestep_space = NEIGHBORS[piece][direction]
+                changed_spaces.append((piece, turn))
+                changed_spaces.append((sidestep_space, EMPTY))
+                cells[piece] = EMPTY
+                cells[sidestep_space] = turn
+            changed_spaces = tuple(changed_spaces)
+            board.zobrist = update_hash(board.zobrist, board, changed_spaces)
+            return changed_spaces
+
+        space_in_front_grouping = NEIGHBORS[moved_pieces[0]][direction]
+        trailing_piece = moved_pieces[-1]
+        changed_spaces = ((space_in_front_grouping, cells[space_in_front_grouping]), (trailing_piece, turn))
+
+        if move[3] > 0:
+            # the opposing piece in front of the grouping is moved to the space in front of the opposing grouping,
+            # unless it is pushed off of the game board
+            leading_piece = StateSpaceGenerator.get_leading_opposing_piece(move)
+            space_in_front = NEIGHBORS[leading_piece][direction]
+            if space_in_front != OFF_BOARD:
+                cells[space_in_front] = cells[space_in_front_grouping]
+                changed_spaces = ((space_in_front, EMPTY),) + changed_spaces
+
+        # moves the trailing piece up to the front of the grouping
+        cells[space_in_front_grouping] = turn
+        cells[trailing_piece] = EMPTY
+        board.zobrist = update_hash(board.zobrist, board, changed_spaces)
+        return changed_spaces
 
-            # converts the notation of the last piece from internal to external (e.g. H6)
-            trailing_piece = Converter.internal_notation_to_external(trailing_piece[0], trailing_piece[1])
+    @staticmethod
+    def undo_move_on_board(board: CompactBoard, changed_spaces: tuple, zobrist_hash: int):
+        """
+        Restores the spaces changed by a move on the compact board, along with its Zobrist hash.
 
-            # packs the leading piece, second place piece, and the last piece into a tuple
-            pieces = (leading_piece, second_place_piece, trailing_piece)
-            # adds the legal sumito move to the possible move notation to be written to the .board file
-            self.possible_moves_sumito.add(("i", pieces, direction, empty_space_coords[0], empty_space_coords[1]))
+        :param board: a CompactBoard
+        :param changed_spaces: a tuple of (cell, previous value) tuples returned when the move was applied
+        :param zobrist_hash: an int, the hash of the board before the move was applied
+        """
+        cells = board.cells
+        for cell, value in reversed(changed_spaces):
+            cells[cell] = value
+        board.zobrist = zobrist_hash
 
+    def apply_move(self, move: tuple) -> tuple:
+        """
+        Applies the move to the generator's board in place and passes the turn to the opposing turn_color.
 
-            move_notation_pieces = (piece, trailing_piece)
-            # adds the legal sumito move to the set conforming to our move notation to be written to the .moves file
-            self.possible_moves_sumito_move_notation.add(
-                ("i", move_notation_pieces, direction, empty_space_coords[0], empty_space_coords[1]))
+        :param move: a tuple, of a move generated for the current turn
+        :return: a tuple, the undo record to pass to undo_move
+        """
+        zobrist_hash = self.board.zobrist
+        changed_spaces = self.apply_move_to_board(self.board, move)
+        turn = self.turn
+        self.turn = Converter.get_opposite_color(turn)
+        return move, changed_spaces, turn, zobrist_hash
 
-    def is_valid_adjacent_piece(self, opposite_adj_row_key: str, opposite_adj_col_num: int) -> bool:
+    def undo_move(self, undo: tuple):
         """
-        Checks if the piece behind is of the same turn_color, and returns a true if it is, or else false is returned.
+        Undoes a move applied with apply_move, restoring the generator's board and turn in place.
 
-        :param opposite_adj_col_num: a string of row_key of the adjacent piece to be checked
-        :param opposite_adj_row_key: an int, of the column of the adjacent piece to be checked
-        :return: a boolean
+        :param undo: a tuple, the undo record returned by apply_move
         """
+        self.undo_move_on_board(self.board, undo[1], undo[3])
+        self.turn = undo[2]
 
-        # checks if the adjacent piece in the opposing adjusted_direction_tuple of movement is the same turn_color as the select piece
-        try:
-            # ensures column isn't out of bounds
-            if opposite_adj_col_num < 0:
-                raise KeyError
+    def get_child_board(self, move: tuple) -> CompactBoard:
+        """
+        Creates a new board with the move applied, leaving the generator's board unchanged.
 
-            if self.updated_game_board[opposite_adj_row_key][opposite_adj_col_num]["turn_color"] == self.turn:
-                return True
-            else:
-                return False
+        :param move: a tuple, of a move generated for the current turn
+        :return: a CompactBoard
+        """
+        child_board = self.board.copy()
+        self.apply_move_to_board(child_board, move)
+        return child_board
 
-        except (IndexError, KeyError):
-            # print("Adjacent 2nd piece out of board area")
-            return False
+    @staticmethod
+    def get_move_notation(move: tuple) -> tuple:
+        """
+        Converts a move into the move notation used by the GUI, e.g. ("i", ("C3", "C5"), "E", "row6", 5). Sumitos list
+        the leading opposing piece, the piece behind it, and the trailing piece of the turn turn_color.
 
-    def generate_all_moves(self, row_key: str, column_detail: dict):
-        self.generate_inline_moves(row_key, column_detail)
-        self.generate_sidestep_moves(row_key, column_detail)
-        self.possible_moves.union(self.possible_moves_single).union(self.possible_moves_double) \
-            .union(self.possible_moves_triple).union(self.possible_moves_sumito_move_notation) \
-            .union(self.possible_moves_sidestep)
-
-    def generate_sidestep_moves(self, row_key: str, column_detail: dict):
-        """
-        Generates and finds all legal sidestep moves for a given board state.
-
-        :param row_key: a string containing the row (e.g. 'row4')
-        :param column_detail: a dictionary containing the pieces for a row
-        """
-        row_num = Converter.convert_row_to_string_or_int(row_key)
-        col_num = column_detail['colNum']
-        piece = Converter.internal_notation_to_external(row_num, col_num)
-
-        for direction in self.move_directions:
-            direction_tuple = self.move_directions.get(direction)
-
-            new_row_num = Converter.convert_row_to_string_or_int(row_key) + direction_tuple[0]
-            new_col_num = col_num + Converter.calculate_adjusted_col_direction(row_num, direction_tuple)
-            new_row_key = Converter.convert_row_to_string_or_int(new_row_num)
-
-            # if there isn't a valid 2 group sidestep, then skip_dir tells the method
-            # to skip checking for a 3 piece sidestep for the same direction
-            skip_dir = None
-
-            try:
-                # ensures column isn't out of boudns
-                if new_col_num < 0:
-                    raise KeyError
-
-                space_value = self.game[new_row_key][new_col_num]['turn_color']
-                if space_value is None and new_col_num >= 0:
-
-                    # sets the grouping of sidesteps to find possible moves for
-                    sidestep_groupings = 2
-                    while sidestep_groupings < 4:
-
-                        # gets the complimentary sidesteps directions to check for
-                        sidestep_dirs_to_check = self.sidestep_directions[direction]
-                        for sidestep_complimentary_dir in sidestep_dirs_to_check:
-                            num_of_adj_pieces = self.get_sidestep_num_of_adj_pieces(self.turn, row_key, col_num,
-                                                                                    sidestep_complimentary_dir,
-                                                                                    sidestep_groupings)
-
-                            if num_of_adj_pieces > 0:
-                                # gets the sidestep move adjusted_direction_tuple coords
-                                sidestep_complimentary_dir_tuple = self.move_directions[sidestep_complimentary_dir]
-
-                                adj_piece_row = row_num
-                                adj_piece_col = col_num
-                                adj_piece_coords = self.simulate_game_piece_movement(adj_piece_row, adj_piece_col,
-                                                                                     sidestep_complimentary_dir_tuple)
-
-                                # checks all of the adjacent pieces to see if they are able to perform a sidestep
-                                for adj_piece in range(0, num_of_adj_pieces):
-                                    # gets the coords of the adjacent piece
-                                    adj_piece_coords = self.simulate_game_piece_movement(adj_piece_row, adj_piece_col,
-                                                                                         sidestep_complimentary_dir_tuple)
-
-                                    adj_piece_row = adj_piece_coords[0]
-                                    adj_piece_col = adj_piece_coords[1]
-
-                                # gets trailing piece and converts it to external board notation (e.g. H6)
-                                trailing_piece = Converter.internal_notation_to_external(adj_piece_coords[0],
-                                                                                         adj_piece_coords[1])
-
-                                # checks if the adjacent piece can make a sidestep
-                                sidestep_space = self.simulate_game_piece_movement(adj_piece_row, adj_piece_col,
-                                                                                   direction_tuple)
-
-                                # checks if the space that the adjacent piece wants to sidestep to is empty, and that the space to move to is within the game board
-                                try:
-
-                                    # ensures column isn't out of bounds
-                                    if sidestep_space[1] < 0:
-                                        raise KeyError
-
-                                    if self.updated_game_board[sidestep_space[0]][sidestep_space[1]]["turn_color"] is None and sidestep_complimentary_dir != skip_dir:
-
-                                        # handles adding 3 group side steps to the move list
-                                        if num_of_adj_pieces == 2:
-                                            # gets middle piece and converts it to external board notation (e.g. H6)
-                                            middle_piece_tuple = self.simulate_game_piece_movement(row_num, col_num,
-                                                                                                   sidestep_complimentary_dir_tuple)
-                                            middle_piece = Converter.internal_notation_to_external(
-                                                middle_piece_tuple[0], middle_piece_tuple[1])
-
-                                            # add pieces to a tuple and adds the move into the sidestep moves set
-                                            pieces = (piece, middle_piece, trailing_piece)
-                                            self.possible_moves_sidestep.add(
-                                                ("s", pieces, direction, new_row_key, new_col_num))
-
-                                            # add pieces to the move notation set
-                                            pieces_move_notation = (piece, trailing_piece)
-                                            self.possible_moves_sidestep_move_notation.add(
-                                                ("s", pieces_move_notation, direction, new_row_key, new_col_num))
-
-                                        # handles adding 2 group side steps to the move list
-                                        elif num_of_adj_pieces == 1:
-                                            adj_piece_board_notation = Converter.internal_notation_to_external(
-                                                adj_piece_row, adj_piece_col)
-                                            pieces = (piece, adj_piece_board_notation)
-                                            self.possible_moves_sidestep.add(
-                                                ("s", pieces, direction, new_row_key, new_col_num))
-
-                                            # adds the pieces to the move notation set
-                                            pieces_move_notation = (piece, adj_piece_board_notation)
-                                            self.possible_moves_sidestep_move_notation.add(
-                                                ("s", pieces_move_notation, direction, new_row_key, new_col_num))
-                                    else:
-                                        # if there isn't a valid 2 group sidestep, then skip_dir tells the method
-                                        # to skip checking for a 3 piece sidestep for the same direction
-                                        skip_dir = sidestep_complimentary_dir
-
-                                except (IndexError, KeyError):
-                                    pass
-
-                        sidestep_groupings += 1
-
-            except (IndexError, KeyError):
-                pass
-
-    def get_sidestep_num_of_adj_pieces(self, piece_color: str, row_key: str, col_num: int, direction: str, groupings=2):
-        """
-        Finds the number of adjacent pieces that can make a legal sidestep move.
-
-        :param piece_color: a string, the turn_color of the adjacent pieces to get
-        :param row_key: a string, containing the row key (e.g. 'row3')
-        :param col_num: an int, containing the column number
-        :param direction: a string of the raw caridnal adjusted_direction_tuple (e.g. 'NE' or 'W')
-        :param groupings: an int, the number of grouped pieces to search for, set to 2 by default
-        :return: an int, the number of pieces adjacent to the specified piece
-        """
-        row_num = Converter.convert_row_to_string_or_int(row_key)   # converts row key to a number
-        dir_tuple = self.move_directions[direction]    # gets the tuple of adjusted_direction_tuple
-
-        # adjusts the adjusted_direction_tuple tuple
-        adjusted_dir_tuple = (dir_tuple[0], Converter.calculate_adjusted_col_direction(row_num, dir_tuple))
-
-        # gets the row key and column number of the adjacent piece
-        new_row_num = adjusted_dir_tuple[0] + row_num
-        new_row_key = Converter.convert_row_to_string_or_int(new_row_num)
-        new_col_num = adjusted_dir_tuple[1] + col_num
-
-        num_of_adj_pieces = 0
-        try:
-
-            # ensures column isn't out of bounds
-            if new_col_num < 0:
-                raise KeyError
-
-            # gets the turn_color of the adjacent piece
-            adj_space_piece_color = self.updated_game_board[new_row_key][new_col_num]["turn_color"]
-
-            # checks if adjacent piece is same turn_color or else it returns 0
-            if adj_space_piece_color == piece_color:
-                num_of_adj_pieces += 1
-            else:
-                return num_of_adj_pieces
+        :param move: a tuple, of the move
+        :return: a tuple, of the move in move notation
+        """
+        move_type = move[0]
+        moved_pieces = move[1]
+        direction = DIRECTIONS[move[2]]
 
-            if groupings == 3:
-                new_col_num = Converter.calculate_adjusted_col_direction(new_row_num, dir_tuple) + new_col_num
-                new_row_num = adjusted_dir_tuple[0] + new_row_num
+        if move[3] > 0:
+            leading_piece = StateSpaceGenerator.get_leading_opposing_piece(move)
+            second_place_piece = NEIGHBORS[leading_piece][OPPOSITE_DIRECTION[move[2]]]
+            pieces = (CELL_EXTERNAL[leading_piece], CELL_EXTERNAL[second_place_piece],
+                      CELL_EXTERNAL[moved_pieces[-1]])
+        elif move_type == "s":
+            leading_piece = moved_pieces[0]
+            pieces = tuple(CELL_EXTERNAL[piece] for piece in moved_pieces)
+        else:
+            leading_piece = moved_pieces[0]
+            pieces = (CELL_EXTERNAL[moved_pieces[0]], CELL_EXTERNAL[moved_pieces[-1]])
 
-                # checks if the row is out of bounds, and if so it means there isn't a second adjacent game piece
-                if new_row_num < 0:
-                    return num_of_adj_pieces
+        # the space moved to may be off of the game board for a sumito, so it's calculated from the row and column
+        space = Converter.simulate_game_piece_movement(CELL_ROW[leading_piece], CELL_COL[leading_piece],
+                                                       MOVE_DIRECTIONS[move[2]])
+        return move_type, pieces, direction, space[0], space[1]
 
-                # gets the row key for the second adjacent game piece
-                new_row_key = Converter.convert_row_to_string_or_int(new_row_num)
+    def get_moves(self) -> list:
+        """
+        Gets all of the generated moves, ordered as sumitos, triple, double, sidestep, and then single piece moves.
 
-                # checks if second adjacent game piece is the same turn_color
-                adj_space_piece_color = self.updated_game_board[new_row_key][new_col_num]["turn_color"]
-                if adj_space_piece_color == piece_color:
-                    num_of_adj_pieces += 1
+        :return: a list of moves
+        """
+        return self.possible_moves_sumito + self.possible_moves_triple + self.possible_moves_double \
+            + self.possible_moves_sidestep + self.possible_moves_single
 
-        except (IndexError, KeyError):
-            # print("Adjacent piece check out of board area")
-            return num_of_adj_pieces
+    def generate_moves(self) -> list:
+        """
+        Generates the moves for the current turn on the generator's board, without creating any board states.
 
-        return num_of_adj_pieces
+        :return: a list of moves
+        """
+        self.possible_moves_single = []
+        self.possible_moves_double = []
+        self.possible_moves_triple = []
+        self.possible_moves_sumito = []
+        self.possible_moves_sidestep = []
+        self.create_piece_list_for_current_turn()
+        return self.get_moves()
 
     def update_board(self):
         """
-        Contains for-loops to iterate over the sets of different types of moves, updates the board state for each move,
-        and writes the board state to a .board file.
-        """
-
-        for move in self.possible_moves_sumito:
-            # only for single piece moves
-            if move[0] == 'i':
-
-                leading_piece_coords = Converter.external_notation_to_internal(move[1][0])
-                second_place_piece_coords = Converter.external_notation_to_internal(move[1][1])
-                trailing_piece_coords = Converter.external_notation_to_internal(move[1][2])
-
-                opposing_color = Converter.get_opposite_color(self.turn)
-                color_of_second_piece = \
-                    self.updated_game_board[second_place_piece_coords[0]][second_place_piece_coords[1]]["turn_color"]
-
-                try:
-                    # ensures column number isn't out of bounds
-                    if move[4] < 0:
-                        raise KeyError
-
-                    # push opposing piece
-                    self.updated_game_board[move[3]][move[4]]["turn_color"] = opposing_color
-
-                except (IndexError, KeyError):
-                    # shift pieces as piece has been pushed off game board
-                    sumitoed_piece = Converter.internal_notation_to_external(leading_piece_coords[0],
-                                                                             leading_piece_coords[1])
-
-                    # print(f"{sumitoed_piece + opposing_color[0]} pushed off the board!")
-
-                finally:
-                    # leading piece replaced by turn_color of piece directly behind it
-                    self.updated_game_board[leading_piece_coords[0]][leading_piece_coords[1]][
-                        "turn_color"] = color_of_second_piece
-
-                    # replaces second place piece with piece of turn turn_color
-                    self.updated_game_board[second_place_piece_coords[0]][second_place_piece_coords[1]][
-                        "turn_color"] = self.turn
-
-                    # removes trailing piece
-                    self.updated_game_board[trailing_piece_coords[0]][trailing_piece_coords[1]]["turn_color"] = None
-
-                # self.output_board()
-                self.states.append([move, self.updated_game_board])
-                # resets board to before move
-                self.updated_game_board = deepcopy(self.game)
-
-        for move in self.possible_moves_triple:
-            # only for single piece moves
-            if move[0] == 'i':
-                # move trailing piece up front
-                self.updated_game_board[move[3]][move[4]]["turn_color"] = self.turn
-
-                trailing_piece_external_coords = move[1][1]
-                trailing_piece_coords = self.translate_external_coords_to_internal_coords(
-                    trailing_piece_external_coords)
-                # remove old trailing piece
-                self.updated_game_board[trailing_piece_coords[0]][trailing_piece_coords[1]]["turn_color"] = None
-                #self.output_board()
-                # resets board to before move
-                self.states.append([move, self.updated_game_board])
-                self.updated_game_board = deepcopy(self.game)
-
-        for move in self.possible_moves_double:
-            # only for single piece moves
-            if move[0] == 'i':
-                # move trailing piece up front
-                self.updated_game_board[move[3]][move[4]]["turn_color"] = self.turn
-
-                trailing_piece_external_coords = move[1][1]
-                trailing_piece_coords = self.translate_external_coords_to_internal_coords(
-                    trailing_piece_external_coords)
-                # remove old trailing piece
-                self.updated_game_board[trailing_piece_coords[0]][trailing_piece_coords[1]]["turn_color"] = None
-                #self.output_board()
-                # resets board to before move
-                self.states.append([move, self.updated_game_board])
-                self.updated_game_board = deepcopy(self.game)
-
-        for move in self.possible_moves_sidestep:
-
-            piece_sidestep_list = move[1]
-            direction = move[2]
-            direction_tuple = self.move_directions[direction]
-            for piece in piece_sidestep_list:
-                piece_coords_tuple = self.translate_external_coords_to_internal_coords(piece)
-
-                # removes where the piece used to be
-                self.updated_game_board[piece_coords_tuple[0]][piece_coords_tuple[1]]["turn_color"] = None
-
-                # gets the adjusted_direction_tuple of the side step and packs the adjusted_direction_tuple into a tuple
-                sidestep_row_dir_coord = direction_tuple[0]
-                sidestep_col_dir_coord = Converter.calculate_adjusted_col_direction(piece_coords_tuple[0],
-                                                                                    direction_tuple)
-                sidestep_dir_tuple = (sidestep_row_dir_coord, sidestep_col_dir_coord)
-
-                # performs the sidestep
-                sidestep_piece = self.simulate_game_piece_movement(piece_coords_tuple[0], piece_coords_tuple[1],
-                                                                   sidestep_dir_tuple)
-                self.updated_game_board[sidestep_piece[0]][sidestep_piece[1]]["turn_color"] = self.turn
-
-            #self.output_board()
-            self.states.append([move, self.updated_game_board])
-            # resets board to before move
-            self.updated_game_board = deepcopy(self.game)
-
-        for move in self.possible_moves_single:
-            # only for single piece moves
-            if move[0] == 'i':
-                # move front piece up
-                self.updated_game_board[move[3]][move[4]]['turn_color'] = self.turn
-                # remove back piece
-                location = Converter.external_notation_to_internal(move[1][1])
-                self.updated_game_board[location[0]][location[1]]['turn_color'] = None
-                #self.output_board()
-                # resets board to before move
-                self.states.append([move, self.updated_game_board])
-                self.updated_game_board = deepcopy(self.game)
+        Iterates over the generated moves and creates the board state for each move. If the generator was provided
+        the GUI's game board dictionary, then the states contain the move in move notation and a game board dictionary.
+        """
+        is_gui_board = isinstance(self.game, dict)
 
+        for move in self.get_moves():
+            updated_game_board = self.get_child_board(move)
+
+            if is_gui_board:
+                self.states.append([self.get_move_notation(move), updated_game_board.to_game_board(self.game)])
+            else:
+                self.states.append([move, updated_game_board])
 
     def translate_external_coords_to_internal_coords(self, piece_coord: str) -> tuple:
         """
@@ -760,10 +487,6 @@ class StateSpaceGenerator:
         row_num = (ord(row_letter) - ASCII_OFFSET - NUM_OF_ROWS_OFFSET) * -1
         col_num = Converter.calculate_column(row_num, int(piece_coord[1]))
 
-        if row_num < 0:
-            # print("Out of range coordinates passed to translate_external_coords_to_internal_coords")
-            pass
-
         row_key = Converter.convert_row_to_string_or_int(row_num)
         return row_key, col_num
 
@@ -779,27 +502,21 @@ class StateSpaceGenerator:
             self.turn = colors[input_file.readline().replace('\n', '')]
             self.board_text = input_file.readline()
 
-    def output_board(self):
+    def output_board(self, board: CompactBoard):
         """
-        Given the current board state, it generates a list containing the positions of the black and white game pieces
+        Given a board state, it generates a list containing the positions of the black and white game pieces
         and calls a helper method to write these lists to a text file.
+
+        :param board: a CompactBoard
         """
         blacks = []
         whites = []
 
-        for row, col in self.updated_game_board.items():
-            for piece in col:
-
-                if piece["turn_color"] is not None:
-
-                    row_num = Converter.convert_row_to_string_or_int(row)
-                    col_num = piece["colNum"]
-                    piece_letter_coord = Converter.internal_notation_to_external(row_num, col_num)
-
-                    if piece["turn_color"] == "black":
-                        blacks.append(piece_letter_coord + 'b')
-                    else:
-                        whites.append(piece_letter_coord + 'w')
+        for cell in range(NUM_OF_CELLS):
+            if board.cells[cell] == BLACK:
+                blacks.append(CELL_EXTERNAL[cell] + 'b')
+            elif board.cells[cell] == WHITE:
+                whites.append(CELL_EXTERNAL[cell] + 'w')
 
         self.print_to_text_file(sorted(blacks) + sorted(whites))
 
@@ -838,6 +555,10 @@ class StateSpaceGenerator:
         self.translate_test_input_to_board_notation()
         self.create_piece_list_for_current_turn()
         self.update_board()
+
+        for state in self.states:
+            self.possible_moves.add(self.get_move_notation(state[0]))
+            self.output_board(state[1])
         self.text_output_moves()
 
     def run_generation(self):
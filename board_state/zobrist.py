@@ -0,0 +1,47 @@
+from random import Random
+from board_state.compact_board import *
+
+# the keys are generated from a fixed seed so position hashes stay the same between runs, allowing them to be stored
+ZOBRIST_SEED = 0xAB410E
+
+_random = Random(ZOBRIST_SEED)
+
+# keys indexed by [cell][cell value], unoccupied spaces don't change the hash
+ZOBRIST_PIECE_KEYS = tuple((0, _random.getrandbits(64), _random.getrandbits(64)) for _ in range(NUM_OF_CELLS))
+ZOBRIST_WHITE_TO_MOVE = _random.getrandbits(64)
+
+
+def hash_board(board: CompactBoard, turn: str) -> int:
+    """
+    Calculates the 64 bit Zobrist hash of the compact board from scratch.
+
+    :param board: a CompactBoard
+    :param turn: a string, the turn_color of the player to move
+    :return: an int
+    """
+    zobrist_hash = ZOBRIST_WHITE_TO_MOVE if turn == "white" else 0
+    cells = board.cells
+
+    for cell in range(NUM_OF_CELLS):
+        if cells[cell] != EMPTY:
+            zobrist_hash ^= ZOBRIST_PIECE_KEYS[cell][cells[cell]]
+
+    return zobrist_hash
+
+
+def update_hash(zobrist_hash: int, board: CompactBoard, changed_spaces: tuple) -> int:
+    """
+    Updates the Zobrist hash after a move was applied to the compact board, and passes the turn.
+
+    :param zobrist_hash: an int, the hash of the board before the move
+    :param board: a CompactBoard, with the move applied
+    :param changed_spaces: a tuple of (cell, previous value) tuples changed by the move
+    :return: an int, the hash of the board after the move
+    """
+    cells = board.cells
+
+    for cell, value in changed_spaces:
+        keys = ZOBRIST_PIECE_KEYS[cell]
+        zobrist_hash ^= keys[value] ^ keys[cells[cell]]
+
+    return zobrist_hash ^ ZOBRIST_WHITE_TO_MOVE
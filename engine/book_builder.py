@@ -0,0 +1,111 @@
+import argparse
+import time
+
+from ai.ai import Minimax
+from ai.opening_book import DEFAULT_BOOK_PATH, OpeningBook
+from board_state.compact_board import *
+from board_state.layouts import LAYOUTS, create_layout
+from board_state.state_space_generator import StateSpaceGenerator
+from board_state.zobrist import hash_board
+from utils.converter import Converter
+
+
+class BookBuilder:
+    """
+    Encapsulates the building of an opening book from deep searches of the positions of the first plies of the games
+    from each starting layout. Each position is searched to a fixed depth, its best move is stored, and the positions
+    after its best moves are searched next, so the book follows the lines the AI and its opponents are likely to play.
+    """
+
+    def __init__(self, layouts, plies=6, breadth=2, depth=5, all_first_moves=False):
+        self.layouts = layouts
+        self.plies = plies  # the number of plies of each game covered by the book
+        self.breadth = breadth  # the number of best moves of each position whose positions are searched next
+        self.all_first_moves = all_first_moves  # if every first move is followed, since black's first move is random
+        self.minimax = Minimax(max_depth=depth)
+        self.entries = {}  # the (move, value) tuple of each position hash
+
+    def build(self) -> dict:
+        """
+        Searches the positions of the first plies of each starting layout, ply by ply.
+        :return: a dictionary, of the (move, value) tuple of each position hash
+        """
+        for layout in self.layouts:
+            template = create_layout(layout)
+            positions = [CompactBoard.from_game_board(template)]
+            turn = "black"  # black always goes first
+
+            for ply in range(self.plies):
+                start = time.perf_counter()
+                next_positions = []
+                for board in positions:
+                    next_positions.extend(self.add_position(board, turn, template, ply == 0))
+                print(f"{layout} ply {ply + 1}: {len(positions)} positions in {time.perf_counter() - start:.1f}s, "
+                      f"{len(self.entries)} entries")
+                positions = next_positions
+                turn = Converter.get_opposite_color(turn)
+
+        return self.entries
+
+    def add_position(self, board: CompactBoard, turn: str, template: dict, first_move: bool) -> list:
+        """
+        Searches a position and stores its best move.
+        :param board: a CompactBoard, of the position
+        :param turn: a string, the turn_color of the player to move
+        :param template: a dictionary, of the game board of the layout, to convert the position for the search
+        :param first_move: a boolean, True if the position is the starting layout
+        :return: a list, of the boards after the best moves of the position, or an empty list if it was already stored
+        """
+        zobrist_hash = hash_board(board, turn)
+        if zobrist_hash in self.entries:
+            return []
+
+        # the search is given all the time it needs, so it always completes the fixed depth
+        self.minimax.alpha_beta(["move", board.to_game_board(template), turn, 0, time.perf_counter(), float("inf")])
+        values = self.get_exact_values(board, turn)
+        moves = sorted(values, key=values.get, reverse=True)
+        self.entries[zobrist_hash] = moves[0], int(values[moves[0]])
+
+        generator = StateSpaceGenerator(board, turn)
+        followed_moves = moves if first_move and self.all_first_moves else moves[:self.breadth]
+        return [generator.get_child_board(move) for move in followed_moves]
+
+    def get_exact_values(self, board: CompactBoard, turn: str) -> dict:
+        """
+        Searches every move of a position again with a full window, to the depth of the search just completed. The
+        search only finds the exact value of its best move, the other moves fail low with a bound of their value, so
+        the moves followed after the best move would otherwise be arbitrary. Most of the values are found in the
+        transposition table filled by the search.
+        :param board: a CompactBoard, of the position
+        :param turn: a string, the turn_color of the player to move
+        :return: a dictionary, of the exact value of each move
+        """
+        minimax = self.minimax
+        minimax.set_root(CompactBoard(bytes(board.cells)), turn)
+        minimax.search_depth = minimax.completed_depth
+        start = time.perf_counter()
+        return {move: minimax.search_root_move(move, float("-inf"), float("inf"), start, float("inf"))
+                for move in list(minimax.generator.iter_moves())}
+
+
+def main():
+    """
+    Builds an opening book from the command line, replacing the book at the output path.
+    """
+    parser = argparse.ArgumentParser(description="Builds an opening book from deep searches of the first plies.")
+    parser.add_argument("--output", default=DEFAULT_BOOK_PATH, help="the path of the opening book")
+    parser.add_argument("--layouts", nargs="+", choices=sorted(LAYOUTS), default=sorted(LAYOUTS))
+    parser.add_argument("--plies", type=int, default=6, help="the number of plies of each game covered by the book")
+    parser.add_argument("--breadth", type=int, default=2, help="the number of best moves followed from each position")
+    parser.add_argument("--depth", type=int, default=5, help="the search depth of each position")
+    parser.add_argument("--all-first-moves", action="store_true", help="follows every first move of black")
+    args = parser.parse_args()
+
+    builder = BookBuilder(args.layouts, args.plies, args.breadth, args.depth, args.all_first_moves)
+    entries = builder.build()
+    OpeningBook.write(entries, args.output)
+    print(f"Wrote {len(entries)} positions to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
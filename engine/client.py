@@ -0,0 +1,159 @@
+import argparse
+import asyncio
+import json
+import time
+
+from random import Random
+from board_state.compact_board import *
+from board_state.state_space_generator import StateSpaceGenerator
+from engine.server import DEFAULT_HOST, DEFAULT_PORT, GameServer, encode_move
+from utils.converter import Converter
+
+
+class ScriptedClient:
+    """
+    Encapsulates a client of the GameServer that plays games against the AI with random moves, to test the server
+    locally. Each game is played over its own connection, and the games are played at once.
+
+    Before its first move, each game also sends a move of the AI's game pieces, which the server has to reject.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, games=4, layout="standard", turns=10, time_limit=2,
+                 budget=None, seed=None):
+        self.host = host
+        self.port = port
+        self.games = games
+        self.game_settings = {"layout": layout, "turns": turns, "time": time_limit, "budget": budget}
+        self.random = Random(seed)
+
+    async def run(self) -> list:
+        """
+        Plays the games at once.
+        :return: a list, of dictionaries of the result of each game
+        """
+        colors = ("black", "white")
+        return await asyncio.gather(*(self.play_game(colors[game_number % 2], self.random.getrandbits(32))
+                                      for game_number in range(self.games)))
+
+    async def play_game(self, color: str, seed: int) -> dict:
+        """
+        Plays a game against the AI with random moves.
+        :param color: a string, the client's turn_color
+        :param seed: an int, the seed of the random moves
+        :return: a dictionary, of the result of the game
+        """
+        random = Random(seed)
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        start = time.perf_counter()
+        ai_times = []
+
+        async def send(request: dict) -> dict:
+            writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        try:
+            state = await send(dict(self.game_settings, command="new", color=color))
+            if not state["ok"]:
+                raise RuntimeError(state["error"])
+            game_id = state["game"]
+            if state["ai_move"] is not None:
+                ai_times.append(state["ai_move"]["time"])
+
+            # the server has to reject a move of the opposing game pieces
+            opposing_piece = state["board"][Converter.get_opposite_color(color)][0]
+            rejected = await send({"command": "move", "game": game_id, "pieces": [opposing_piece], "direction": "E"})
+            if rejected["ok"]:
+                raise RuntimeError(f"the server accepted a move of {opposing_piece}")
+
+            while state["result"] is None:
+                move = self.choose_move(state, color, random)
+                state = await send(dict(move, command="move", game=game_id))
+                if not state["ok"]:
+                    raise RuntimeError(f"the server rejected {move}: {state['error']}")
+                if state["ai_move"] is not None:
+                    ai_times.append(state["ai_move"]["time"])
+
+            await send({"command": "close", "game": game_id})
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+        return {"game": game_id, "color": color, "result": state["result"], "ai_moves": len(ai_times),
+                "ai_time": sum(ai_times), "budget": state["budget"], "time_taken": time.perf_counter() - start}
+
+    @staticmethod
+    def choose_move(state: dict, color: str, random: Random) -> dict:
+        """
+        Chooses a random move from the game's board.
+        :param state: a dictionary, of the state of the game sent by the server
+        :param color: a string, the client's turn_color
+        :param random: a Random, of the game
+        :return: a dictionary, of the move in the notation of the protocol
+        """
+        board = CompactBoard()
+        for piece_color, pieces in state["board"].items():
+            for piece in pieces:
+                board.cells[EXTERNAL_TO_CELL[piece]] = COLOR_CODES[piece_color]
+
+        moves = list(StateSpaceGenerator(board, color).iter_moves())
+        move = encode_move(moves[random.randrange(len(moves))])
+        del move["type"]  # the server works out the type of move from the game pieces and direction
+        return move
+
+
+async def run_locally(server: GameServer, client: ScriptedClient) -> list:
+    """
+    Starts the server, plays the client's games against it, and then stops it.
+    :param server: a GameServer
+    :param client: a ScriptedClient
+    :return: a list, of dictionaries of the result of each game
+    """
+    await server.start()
+    client.port = server.port
+    try:
+        return await client.run()
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def main():
+    """
+    Plays games against the game server from the command line, starting a local server unless --port is given.
+    """
+    parser = argparse.ArgumentParser(description="Plays Abalone games with random moves against the game server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=None, help="the port of a running server")
+    parser.add_argument("--games", type=int, default=4, help="the number of games played at once")
+    parser.add_argument("--turns", type=int, default=10, help="the number of moves each player can make")
+    parser.add_argument("--time", type=float, default=2, help="the AI's turn timer, in seconds")
+    parser.add_argument("--budget", type=float, default=None, help="the AI's time budget for each game, in seconds")
+    parser.add_argument("--workers", type=int, default=None, help="the search processes of the local server")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    client = ScriptedClient(args.host, args.port, args.games, turns=args.turns, time_limit=args.time,
+                            budget=args.budget, seed=args.seed)
+    start = time.perf_counter()
+    server = None
+    if args.port is None:
+        server = GameServer(args.host, 0, args.workers)
+        results = asyncio.run(run_locally(server, client))
+    else:
+        results = asyncio.run(client.run())
+
+    for result in results:
+        budget = "no budget" if result["budget"] is None else f"{result['budget']:.2f}s of budget left"
+        print(f"Game {result['game']} ({result['color']}): {result['result']}, {result['ai_moves']} AI moves in "
+              f"{result['ai_time']:.2f}s, {budget}, {result['time_taken']:.2f}s")
+    print(f"Played {len(results)} games in {time.perf_counter() - start:.2f}s")
+    if server is not None:
+        metrics = server.scheduler.metrics.to_dict()
+        print(f"{metrics['completed']} searches, queue wait mean {metrics['queue_wait']['mean']:.3f}s p95 "
+              f"{metrics['queue_wait']['p95']:.3f}s, compute time mean {metrics['compute_time']['mean']:.3f}s p95 "
+              f"{metrics['compute_time']['p95']:.3f}s, {metrics['missed_deadlines']} missed deadlines")
+
+
+if __name__ == '__main__':
+    main()
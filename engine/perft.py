@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from board_state.compact_board import *
+from board_state.layouts import LAYOUTS, create_layout
+from board_state.state_space_generator import StateSpaceGenerator
+from board_state.bitboard_generator import BitboardGenerator
+
+# the reference leaf node counts of each position by depth, starting at depth 1
+REFERENCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perft_reference.json")
+
+
+def perft(generator: StateSpaceGenerator, depth: int) -> int:
+    """
+    Counts the leaf nodes of the game tree to the specified depth from the generator's board and turn, applying and
+    undoing each move on the generator's board. The leaves at depth 1 are counted without applying the moves.
+    :param generator: a StateSpaceGenerator, of the position
+    :param depth: an int, the depth of the game tree
+    :return: an int
+    """
+    if depth == 0:
+        return 1
+    if depth == 1:
+        return sum(1 for _ in generator.iter_moves())
+
+    nodes = 0
+    for move in list(generator.iter_moves()):
+        undo = generator.apply_move(move)
+        nodes += perft(generator, depth - 1)
+        generator.undo_move(undo)
+    return nodes
+
+
+def divide(generator: StateSpaceGenerator, depth: int) -> dict:
+    """
+    Counts the leaf nodes of the game tree to the specified depth below each move from the generator's board, to
+    find the moves whose counts differ from another generator.
+    :param generator: a StateSpaceGenerator, of the position
+    :param depth: an int, the depth of the game tree, including the move
+    :return: a dictionary, of the leaf node count of each move in move notation
+    """
+    counts = {}
+    for move in list(generator.iter_moves()):
+        undo = generator.apply_move(move)
+        counts[StateSpaceGenerator.get_move_notation(move)] = perft(generator, depth - 1)
+        generator.undo_move(undo)
+    return counts
+
+
+# the move generators that can be counted
+GENERATORS = {"compact": StateSpaceGenerator, "bitboard": BitboardGenerator}
+
+
+def get_positions(input_files: list, generator_class=StateSpaceGenerator) -> dict:
+    """
+    Gets the positions to count, the starting layouts with black to move and the positions of the test input files.
+    :param input_files: a list, of the paths of the .input files
+    :param generator_class: a class, the StateSpaceGenerator or subclass of it to count with
+    :return: a dictionary, of the generator of each position by name
+    """
+    positions = {}
+    for layout in LAYOUTS:
+        positions[layout] = generator_class(CompactBoard.from_game_board(create_layout(layout)), "black")
+
+    for input_file in input_files:
+        generator = generator_class(None, "black")
+        generator.file_name = input_file[:-len(".input")] if input_file.endswith(".input") else input_file
+        generator.read_test_input()
+        generator.translate_test_input_to_board_notation()
+        positions[os.path.basename(generator.file_name)] = generator
+
+    return positions
+
+
+def main():
+    """
+    Counts the leaf nodes from each position to each depth, reporting the nodes per second and comparing the counts
+    against the reference counts. Exits with a status of 1 if any count differs from its reference count.
+    """
+    parser = argparse.ArgumentParser(description="Counts the leaf nodes of the game tree to validate the generator.")
+    parser.add_argument("input_files", nargs="*", help="test .input files to count from, as read by read_test_input")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--divide", action="store_true", help="prints the leaf node count below each move")
+    parser.add_argument("--update", action="store_true", help="stores the counts as the reference counts")
+    parser.add_argument("--generator", choices=sorted(GENERATORS), default="compact")
+    args = parser.parse_args()
+
+    references = {}
+    if os.path.exists(REFERENCE_PATH):
+        with open(REFERENCE_PATH) as reference_file:
+            references = json.load(reference_file)
+
+    failed = False
+    for name, generator in get_positions(args.input_files, GENERATORS[args.generator]).items():
+        if args.divide:
+            for move, count in sorted(divide(generator, args.depth).items()):
+                print(f"{name} {move}: {count}")
+
+        counts = references.setdefault(name, []) if args.update else None
+        for depth in range(1, args.depth + 1):
+            start = time.perf_counter()
+            nodes = perft(generator, depth)
+            time_taken = time.perf_counter() - start
+
+            reference = references.get(name, [])
+            if args.update:
+                if depth <= len(counts):
+                    counts[depth - 1] = nodes
+                else:
+                    counts.append(nodes)
+                status = "stored"
+            elif depth <= len(reference):
+                status = "ok" if nodes == reference[depth - 1] else f"FAILED (expected {reference[depth - 1]})"
+                failed = failed or nodes != reference[depth - 1]
+            else:
+                status = "no reference"
+
+            print(f"{name} depth {depth}: {nodes} nodes in {time_taken:.3f}s, "
+                  f"{nodes / max(time_taken, 1e-9):.0f} nodes/s, {status}")
+
+    if args.update:
+        with open(REFERENCE_PATH, "w") as reference_file:
+            json.dump(references, reference_file, indent=4)
+            reference_file.write("\n")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
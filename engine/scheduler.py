@@ -0,0 +1,252 @@
+import asyncio
+import heapq
+import itertools
+import multiprocessing
+import os
+import time
+
+from collections import deque
+from ai.ai import TURN_TIMER_RESERVE, Minimax
+from board_state.compact_board import *
+from board_state.layouts import create_layout
+
+# the settings of the Minimax instance of each worker process
+DEFAULT_SEARCH_SETTINGS = {"max_depth": 10}
+
+# the least time, in seconds, a search is given past the reserve Minimax keeps of its turn timer, so the AI never plays
+# a move it hasn't searched, even once a game's budget has run out or its search waited past its deadline
+MIN_SEARCH_TIME = 0.5
+
+# the number of the latest searches the percentiles of the metrics are calculated from
+METRICS_WINDOW = 1000
+
+
+class SearchRequest:
+    """
+    Encapsulates a search waiting for, or running on, a worker process of the SearchScheduler.
+
+    The deadline of a search is its time budget from the moment it was submitted, so the time it waits in the queue is
+    taken from its search, the same as a player's clock running while the AI is busy with other games.
+    """
+
+    def __init__(self, cells: bytes, color: str, time_limit: float, priority: int, future: asyncio.Future):
+        self.cells = cells
+        self.color = color
+        self.time_limit = time_limit
+        self.priority = priority  # higher priorities are searched first
+        self.future = future  # set to the SearchResult once the search is done
+        self.submitted = time.perf_counter()
+        self.deadline = self.submitted + time_limit
+        self.dispatched = None  # the time the search was sent to a worker process
+
+
+class SearchResult:
+    """
+    Encapsulates the result of a search run by the SearchScheduler, along with the time it spent in the queue and
+    searching.
+    """
+
+    def __init__(self, cells: bytes, queue_wait: float, compute_time: float, missed_deadline: bool):
+        self.cells = cells  # the cells of the board after the AI's move
+        self.queue_wait = queue_wait  # the time the search waited for a worker process
+        self.compute_time = compute_time  # the time the worker process took to search
+        self.missed_deadline = missed_deadline  # if the result came back after the search's deadline
+
+
+class SchedulerMetrics:
+    """
+    Encapsulates the counters of the SearchScheduler, separating the time searches wait in the queue from the time the
+    worker processes take to search them.
+    """
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.missed_deadlines = 0
+        self.total_queue_wait = 0.0
+        self.total_compute_time = 0.0
+        self.queue_waits = deque(maxlen=METRICS_WINDOW)
+        self.compute_times = deque(maxlen=METRICS_WINDOW)
+
+    def record(self, result: SearchResult):
+        """
+        Records the times of a completed search.
+        :param result: a SearchResult, of the search
+        """
+        self.completed += 1
+        self.missed_deadlines += result.missed_deadline
+        self.total_queue_wait += result.queue_wait
+        self.total_compute_time += result.compute_time
+        self.queue_waits.append(result.queue_wait)
+        self.compute_times.append(result.compute_time)
+
+    @staticmethod
+    def get_percentile(samples, percentile: float) -> float:
+        """
+        Gets a percentile of the samples.
+        :param samples: an iterable, of floats
+        :param percentile: a float, between 0 and 1
+        :return: a float, or 0 if there are no samples
+        """
+        ordered = sorted(samples)
+        if not ordered:
+            return 0.0
+        return ordered[min(int(percentile * len(ordered)), len(ordered) - 1)]
+
+    def to_dict(self) -> dict:
+        """
+        Converts the metrics into a dictionary that can be written as JSON.
+        :return: a dictionary
+        """
+        completed = max(self.completed, 1)
+        return {"submitted": self.submitted, "completed": self.completed, "failed": self.failed,
+                "missed_deadlines": self.missed_deadlines,
+                "queue_wait": {"mean": self.total_queue_wait / completed,
+                               "p95": self.get_percentile(self.queue_waits, 0.95),
+                               "max": max(self.queue_waits, default=0.0)},
+                "compute_time": {"mean": self.total_compute_time / completed,
+                                 "p95": self.get_percentile(self.compute_times, 0.95),
+                                 "max": max(self.compute_times, default=0.0)}}
+
+
+class SearchScheduler:
+    """
+    Encapsulates a fixed pool of worker processes searching for the AI's moves of many games, so the games take turns
+    using the machine's cores instead of fighting over them.
+
+    Each worker process creates its Minimax instance, and warms it up with a shallow search, as the pool is started, so
+    the first search of a game doesn't pay for loading the engine. A search is only sent to a worker process when one is
+    idle, and the waiting searches are queued by priority, and then by deadline, so the searches closest to running out
+    of time are searched first. A search is given the time left until its deadline, keeping the time control fair to a
+    game whose search had to wait, but never less than MIN_SEARCH_TIME past Minimax's reserve.
+    """
+
+    def __init__(self, workers=None, search_settings=None):
+        self.workers = workers or os.cpu_count()
+        self.search_settings = dict(DEFAULT_SEARCH_SETTINGS, **(search_settings or {}))
+        self.queue = []  # a heap of (-priority, deadline, sequence number, SearchRequest) tuples
+        self.sequence = itertools.count()  # breaks ties between searches in the order they were submitted
+        self.idle_workers = 0
+        self.metrics = SchedulerMetrics()
+        self.pool = None
+        self.loop = None
+
+    def start(self):
+        """
+        Starts the worker processes, which are all created and warmed up straight away.
+        """
+        self.loop = asyncio.get_running_loop()
+        self.pool = multiprocessing.Pool(self.workers, initializer=_initialize_search_worker,
+                                         initargs=(self.search_settings,))
+        self.idle_workers = self.workers
+
+    def close(self):
+        """
+        Stops the worker processes, failing the searches still waiting in the queue.
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        while self.queue:
+            request = heapq.heappop(self.queue)[-1]
+            if not request.future.done():
+                request.future.set_exception(RuntimeError("the scheduler was closed"))
+
+    async def search(self, cells: bytes, color: str, time_limit: float, priority=0) -> SearchResult:
+        """
+        Queues a search for the AI's move, and waits for its result.
+        :param cells: a bytes, of the cells of the board
+        :param color: a string, the AI's turn_color
+        :param time_limit: a float, the time budget of the search, from now
+        :param priority: an int, higher priorities are searched first
+        :return: a SearchResult
+        """
+        request = SearchRequest(cells, color, time_limit, priority, self.loop.create_future())
+        heapq.heappush(self.queue, (-priority, request.deadline, next(self.sequence), request))
+        self.metrics.submitted += 1
+        self.dispatch()
+        return await request.future
+
+    def get_queue_length(self) -> int:
+        """
+        Counts the searches waiting for a worker process.
+        :return: an int
+        """
+        return len(self.queue)
+
+    def dispatch(self):
+        """
+        Sends the queued searches to the idle worker processes, highest priority and earliest deadline first.
+        """
+        while self.idle_workers > 0 and self.queue:
+            request = heapq.heappop(self.queue)[-1]
+            if request.future.done():
+                continue  # the game stopped waiting for the search
+
+            request.dispatched = time.perf_counter()
+            self.idle_workers -= 1
+            time_limit = max(request.deadline - request.dispatched, TURN_TIMER_RESERVE + MIN_SEARCH_TIME)
+            self.pool.apply_async(_search_in_worker, (request.cells, request.color, time_limit),
+                                  callback=lambda result, request=request: self.loop.call_soon_threadsafe(
+                                      self.finish, request, result, None),
+                                  error_callback=lambda error, request=request: self.loop.call_soon_threadsafe(
+                                      self.finish, request, None, error))
+
+    def finish(self, request: SearchRequest, result, error):
+        """
+        Hands the result of a search back to the game that submitted it, and sends the next queued search to the worker
+        process that searched it. Called on the event loop's thread.
+        :param request: a SearchRequest, of the search
+        :param result: a tuple, of the cells of the board after the AI's move and the time taken by the search, or None
+                       if the search failed
+        :param error: an Exception, raised by the search, or None
+        """
+        self.idle_workers += 1
+        if error is not None:
+            self.metrics.failed += 1
+            if not request.future.done():
+                request.future.set_exception(error)
+        else:
+            finished = time.perf_counter()
+            search_result = SearchResult(result[0], request.dispatched - request.submitted, result[1],
+                                         finished > request.deadline)
+            self.metrics.record(search_result)
+            if not request.future.done():
+                request.future.set_result(search_result)
+        self.dispatch()
+
+
+# the Minimax instance of each worker process
+_search_minimax = None
+
+
+def _initialize_search_worker(settings):
+    """
+    Creates the Minimax instance of a worker process, and warms it up with a search one ply deep, which opens the
+    opening book if there is one. The transposition table of the instance is kept between the searches of every game
+    the process searches.
+    :param settings: a dictionary, of the settings of the Minimax instance
+    """
+    global _search_minimax
+    _search_minimax = Minimax(**settings)
+
+    max_depth = _search_minimax.max_depth
+    _search_minimax.max_depth = 1
+    _search_minimax.alpha_beta(["move", create_layout("standard"), "black", 0, time.perf_counter(), float("inf")])
+    _search_minimax.max_depth = max_depth
+
+
+def _search_in_worker(cells, color, time_limit):
+    """
+    Searches for the AI's move within a worker process.
+    :param cells: a bytes, of the cells of the board
+    :param color: a string, the AI's turn_color
+    :param time_limit: a float, the turn timer of the search
+    :return: a tuple, of the cells of the board after the AI's move, and the time taken by the search
+    """
+    start = time.perf_counter()
+    game_board = CompactBoard(cells).to_game_board()
+    _, updated_board, _ = _search_minimax.alpha_beta(["move", game_board, color, 0, start, time_limit])
+    return bytes(CompactBoard.from_game_board(updated_board).cells), time.perf_counter() - start
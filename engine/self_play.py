@@ -0,0 +1,132 @@
+import argparse
+import time
+
+from random import Random
+from ai.ai import Minimax
+from utils.converter import Converter
+from board_state.compact_board import *
+from board_state.layouts import *
+from board_state.state_space_generator import StateSpaceGenerator
+
+# a player loses once fewer than 8 of their 14 game pieces are left on the game board
+MIN_PIECES = 8
+
+
+class SelfPlayGame:
+    """
+    Encapsulates a game between two Minimax players without the GUI, following the same win and turn limit rules as
+    GameBoard.check_win. Black moves first, and like GameBoard.ai_vs_ai the first move for black can be made at random.
+    """
+
+    def __init__(self, black_player: Minimax, white_player: Minimax, layout="standard", turn_limit=30,
+                 time_limits=(5, 5), random_first_move=True, seed=None):
+        self.players = {"black": black_player, "white": white_player}
+        self.layout = layout
+        self.turn_limit = turn_limit  # the number of moves each player can make
+        self.time_limits = {"black": time_limits[0], "white": time_limits[1]}  # the turn timer of each player
+        self.random_first_move = random_first_move
+        self.random = Random(seed)
+        self.game_board = create_layout(layout)
+        self.turn = "black"  # black always goes first
+        self.move_counts = {"black": turn_limit, "white": turn_limit}  # the moves remaining for each player
+        self.moves = []  # the moves made, in move notation
+        self.times = []  # the time taken by each move
+
+    def play(self) -> dict:
+        """
+        Plays the game until a player wins, or the turn limit is reached.
+        :return: a dictionary, of the result of the game
+        """
+        while True:
+            result = self.check_win()
+            if result is not None:
+                return result
+            self.play_turn()
+
+    def play_turn(self):
+        """
+        Gets the move of the player whose turn it is, and applies it to the game board.
+        """
+        start = time.perf_counter()
+
+        if self.random_first_move and not self.moves:
+            states = StateSpaceGenerator(self.game_board, self.turn).run_generation()
+            move, self.game_board = states[self.random.randint(0, len(states) - 1)]
+        else:
+            move, self.game_board, _ = self.players[self.turn].alpha_beta(
+                ["move", self.game_board, self.turn, 0, start, self.time_limits[self.turn]])
+
+        self.times.append(time.perf_counter() - start)
+        self.moves.append(move)
+        self.move_counts[self.turn] -= 1
+        self.turn = Converter.get_opposite_color(self.turn)
+
+    def count_pieces(self, color: str) -> int:
+        """
+        Counts the game pieces of the turn_color left on the game board.
+        :param color: a string, the turn_color of the game pieces
+        :return: an int
+        """
+        return CompactBoard.from_game_board(self.game_board).count(color)
+
+    def check_win(self):
+        """
+        Checks if the game is over. A player wins by pushing 6 of the opposing game pieces off of the game board, or by
+        having more game pieces left once both players have reached the turn limit, otherwise the game is a tie.
+        :return: a dictionary, of the result of the game, or None if the game isn't over
+        """
+        black_pieces = self.count_pieces("black")
+        white_pieces = self.count_pieces("white")
+
+        if black_pieces < MIN_PIECES:
+            winner, reason = "white", "pieces"
+        elif white_pieces < MIN_PIECES:
+            winner, reason = "black", "pieces"
+        elif self.move_counts["black"] == 0 and self.move_counts["white"] == 0:
+            reason = "turn_limit"
+            if white_pieces < black_pieces:
+                winner = "black"
+            elif white_pieces > black_pieces:
+                winner = "white"
+            else:
+                winner = None
+        else:
+            return None
+
+        return {"winner": winner, "reason": reason, "layout": self.layout, "black_pieces": black_pieces,
+                "white_pieces": white_pieces, "plies": len(self.moves), "moves": self.moves,
+                "time_taken": sum(self.times)}
+
+
+def main():
+    """
+    Plays games between two Minimax players from the command line, and prints the result of each game.
+    """
+    parser = argparse.ArgumentParser(description="Plays Abalone games between two AI players without the GUI.")
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="standard")
+    parser.add_argument("--turns", type=int, default=30, help="the number of moves each player can make")
+    parser.add_argument("--time", type=float, default=5, help="the turn timer of each player, in seconds")
+    parser.add_argument("--depth", type=int, default=10, help="the maximum search depth of each player")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    black_player = Minimax(max_depth=args.depth)
+    white_player = Minimax(max_depth=args.depth)
+    random = Random(args.seed)
+    wins = {"black": 0, "white": 0, None: 0}
+
+    for game_number in range(args.games):
+        game = SelfPlayGame(black_player, white_player, args.layout, args.turns, (args.time, args.time),
+                            seed=random.getrandbits(32))
+        result = game.play()
+        wins[result["winner"]] += 1
+        print(f"Game {game_number + 1}: winner {result['winner']} ({result['reason']}), "
+              f"black {result['black_pieces']} white {result['white_pieces']}, {result['plies']} plies, "
+              f"{result['time_taken']:.2f}s")
+
+    print(f"Black wins: {wins['black']}, White wins: {wins['white']}, Ties: {wins[None]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,444 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+
+from ai.opening_book import DEFAULT_BOOK_PATH
+from board_state.compact_board import *
+from board_state.layouts import LAYOUTS, create_layout
+from board_state.state_space_generator import StateSpaceGenerator
+from engine.scheduler import MIN_SEARCH_TIME, TURN_TIMER_RESERVE, SearchScheduler
+from engine.self_play import MIN_PIECES
+from utils.converter import Converter
+from utils.move import Move
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# the settings of a game not provided by its new command
+DEFAULT_GAME = {"layout": "standard", "color": "black", "turns": 30, "time": 5, "budget": None, "priority": 0}
+
+
+class GameSession:
+    """
+    Encapsulates a game between a client and the AI hosted by the GameServer, following the same win and turn limit
+    rules as SelfPlayGame.
+
+    The client's moves are checked with the same rules as the GUI's, see Move, before they're applied. The AI's moves
+    are searched with the turn timer of the game, and if the game has a time budget, the time taken by each of the AI's
+    searches is taken from it, so a game can't use much more of the server's time than its budget. Once the budget has
+    run out, each of the AI's searches is still given MIN_SEARCH_TIME, see get_search_time_limit.
+    """
+
+    def __init__(self, game_id: int, layout="standard", color="black", turns=30, time_limit=5, budget=None,
+                 priority=0):
+        self.game_id = game_id
+        self.layout = layout
+        self.color = color  # the client's turn_color
+        self.ai_color = Converter.get_opposite_color(color)
+        self.game_board = create_layout(layout)
+        self.turn = "black"  # black always goes first
+        self.move_counts = {"black": turns, "white": turns}  # the moves remaining for each player
+        self.time_limit = time_limit  # the AI's turn timer
+        self.budget = budget  # the time left for the AI's searches, or None for no budget
+        self.priority = priority  # the priority of the AI's searches, see SearchScheduler
+        self.moves = []  # the moves made, in the notation of the protocol
+        self.result = None  # the result of the game once it's over
+        self.lock = asyncio.Lock()  # the game's commands are handled one at a time
+        self.move_validator = Move()
+
+    def get_board(self) -> CompactBoard:
+        """
+        Creates the compact board of the game's game board.
+        :return: a CompactBoard
+        """
+        return CompactBoard.from_game_board(self.game_board)
+
+    def get_search_time_limit(self) -> float:
+        """
+        Gets the turn timer of the AI's next search, which is cut short once the game's budget runs low, but always
+        leaves the search at least MIN_SEARCH_TIME past Minimax's reserve.
+        :return: a float
+        """
+        time_limit = self.time_limit if self.budget is None else min(self.time_limit, self.budget)
+        return max(time_limit, TURN_TIMER_RESERVE + MIN_SEARCH_TIME)
+
+    def validate_move(self, pieces: list, direction: str) -> tuple:
+        """
+        Checks that the client's move follows the same rules as a move made in the GUI, and finds the move to apply.
+        :param pieces: a list, of the external coordinates of the game pieces moved (e.g. ["C3", "C4"])
+        :param direction: a string, the cardinal direction of the move (e.g. "NE")
+        :return: a tuple, of the move to apply to the compact board
+        :raise ValueError: if the move isn't valid
+        """
+        if self.result is not None:
+            raise ValueError("the game is over")
+        if self.turn != self.color:
+            raise ValueError("it isn't the client's turn")
+        if direction not in DIRECTION_INDEX:
+            raise ValueError(f"unknown direction {direction}")
+        if not 1 <= len(pieces) <= 3 or len(set(pieces)) != len(pieces):
+            raise ValueError("a move moves 1 to 3 game pieces")
+        if any(piece not in EXTERNAL_TO_CELL for piece in pieces):
+            raise ValueError("a game piece isn't on the game board")
+
+        cells = [EXTERNAL_TO_CELL[piece] for piece in pieces]
+        board = self.get_board()
+        if any(board.get_color(cell) != self.color for cell in cells):
+            raise ValueError("only the client's own game pieces can be moved")
+
+        cells = self.get_grouping(cells)
+        selected_pieces = [(CELL_ROW_KEY[cell], CELL_COL[cell]) for cell in cells]
+        target = get_adjacent_space(selected_pieces[0][0], selected_pieces[0][1], direction)
+
+        if len(cells) == 1:
+            valid_spaces = self.move_validator.get_possible_single_moves(selected_pieces, 1, self.game_board)
+            move_type = "i"
+            valid = target is not None and CELL_EXTERNAL[CELL_ID[target]] in valid_spaces
+        else:
+            vector_of_dir = self.move_validator.get_dir_of_selected_pieces(selected_pieces)
+            if direction in vector_of_dir:
+                # the space in front of the grouping is in front of the first or last game piece
+                move_type = "i"
+                leading = selected_pieces[0] if direction == vector_of_dir[0] else selected_pieces[-1]
+                target = get_adjacent_space(leading[0], leading[1], direction)
+                valid_spaces = self.move_validator.get_valid_inline_moves(selected_pieces[0], selected_pieces[-1],
+                                                                          self.game_board, self.color, vector_of_dir)
+                valid = target is not None and CELL_EXTERNAL[CELL_ID[target]] in valid_spaces
+            else:
+                move_type = "s"
+                sidesteps = self.move_validator.get_valid_sidestep_moves(selected_pieces, len(selected_pieces),
+                                                                         self.game_board, self.color, vector_of_dir)
+                valid = any(sidestep_direction == direction for _, sidestep_direction in sidesteps)
+
+        if not valid:
+            raise ValueError("the game pieces can't move in that direction")
+
+        # the generated moves also check that a sumito outnumbers the game pieces it pushes
+        move = self.find_move(board, self.color, move_type, cells, DIRECTION_INDEX[direction])
+        if move is None:
+            raise ValueError("the sumito doesn't outnumber the game pieces it pushes")
+        return move
+
+    @staticmethod
+    def get_grouping(cells: list) -> list:
+        """
+        Orders the cells of the game pieces of a move from one end of their grouping to the other.
+        :param cells: a list, of 1 to 3 cell ids
+        :return: a list, of the cell ids in order
+        :raise ValueError: if the game pieces aren't in a line of adjacent spaces
+        """
+        if len(cells) == 1:
+            return cells
+        for ordered in itertools.permutations(cells):
+            for direction in range(len(DIRECTIONS)):
+                if RAYS[ordered[0]][direction][:len(cells) - 1] == ordered[1:]:
+                    return list(ordered)
+        raise ValueError("the game pieces aren't in a line of adjacent spaces")
+
+    @staticmethod
+    def find_move(board: CompactBoard, color: str, move_type: str, cells: list, direction: int):
+        """
+        Finds the generated move that moves the game pieces in the direction.
+        :param board: a CompactBoard
+        :param color: a string, the turn_color of the player to move
+        :param move_type: a string, "i" for inline moves and sumitos, or "s" for sidesteps
+        :param cells: a list, of the cell ids of the game pieces moved
+        :param direction: an int, the index of the direction
+        :return: a tuple, of the move, or None if it isn't generated
+        """
+        cells = set(cells)
+        for move in StateSpaceGenerator(board, color).iter_moves():
+            if move[0] == move_type and move[2] == direction and set(move[1]) == cells:
+                return move
+        return None
+
+    @staticmethod
+    def find_move_to(board: CompactBoard, color: str, child: CompactBoard):
+        """
+        Finds the generated move that results in the child board.
+        :param board: a CompactBoard
+        :param color: a string, the turn_color of the player to move
+        :param child: a CompactBoard, of the board after the move
+        :return: a tuple, of the move, or None if it isn't generated
+        """
+        generator = StateSpaceGenerator(board, color)
+        for move in generator.iter_moves():
+            if generator.get_child_board(move).cells == child.cells:
+                return move
+        return None
+
+    def apply_move(self, move: tuple):
+        """
+        Applies the move of the player whose turn it is, and checks if the game is over.
+        :param move: a tuple, of the move
+        """
+        child = StateSpaceGenerator(self.get_board(), self.turn).get_child_board(move)
+        self.game_board = child.to_game_board(self.game_board)
+        self.moves.append(encode_move(move))
+        self.move_counts[self.turn] -= 1
+        self.turn = Converter.get_opposite_color(self.turn)
+        self.result = self.check_win()
+
+    def check_win(self):
+        """
+        Checks if the game is over, with the same rules as SelfPlayGame.check_win.
+        :return: a dictionary, of the winner and the reason the game ended, or None if the game isn't over
+        """
+        board = self.get_board()
+        black_pieces = board.count("black")
+        white_pieces = board.count("white")
+
+        if black_pieces < MIN_PIECES:
+            return {"winner": "white", "reason": "pieces"}
+        if white_pieces < MIN_PIECES:
+            return {"winner": "black", "reason": "pieces"}
+        if self.move_counts["black"] == 0 and self.move_counts["white"] == 0:
+            winner = None
+            if white_pieces != black_pieces:
+                winner = "black" if black_pieces > white_pieces else "white"
+            return {"winner": winner, "reason": "turn_limit"}
+        return None
+
+    def to_dict(self) -> dict:
+        """
+        Converts the state of the game into a dictionary sent to the client.
+        :return: a dictionary
+        """
+        board = self.get_board()
+        return {"game": self.game_id, "turn": self.turn, "color": self.color,
+                "board": {color: [CELL_EXTERNAL[cell] for cell in board.piece_cells(color)]
+                          for color in ("black", "white")},
+                "moves_left": self.move_counts, "budget": self.budget, "result": self.result}
+
+
+def encode_move(move: tuple) -> dict:
+    """
+    Converts a move into the notation of the protocol, the game pieces moved and the direction they're moved in.
+    :param move: a tuple, of the move
+    :return: a dictionary
+    """
+    return {"type": move[0], "pieces": [CELL_EXTERNAL[cell] for cell in move[1]], "direction": DIRECTIONS[move[2]]}
+
+
+class GameServer:
+    """
+    Encapsulates an asyncio server hosting many games between clients and the AI at once.
+
+    Clients connect over TCP and send commands as lines of JSON, each answered with a line of JSON. A connection can
+    play several games, which are closed when it disconnects. The AI's searches of every game are scheduled on a
+    shared pool of worker processes, see SearchScheduler, so the event loop keeps handling commands while the AI is
+    thinking.
+
+    Commands:
+        {"command": "new", "layout": "standard", "color": "black", "turns": 30, "time": 5, "budget": 60, "priority": 0}
+        {"command": "move", "game": 1, "pieces": ["C3", "C4"], "direction": "NE"}
+        {"command": "state", "game": 1}
+        {"command": "close", "game": 1}
+        {"command": "stats"}
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, search_settings=None, max_games=None):
+        self.host = host
+        self.port = port
+        search_settings = dict(search_settings or {})
+        if os.path.exists(DEFAULT_BOOK_PATH):
+            search_settings.setdefault("opening_book", DEFAULT_BOOK_PATH)
+        self.scheduler = SearchScheduler(workers, search_settings)
+        self.max_games = max_games  # the most games hosted at once, or None for no limit
+        self.sessions = {}  # the GameSession of each game id
+        self.game_ids = itertools.count(1)
+        self.server = None
+        self.connections = set()  # the tasks handling the open connections
+
+    async def start(self):
+        """
+        Starts the worker processes and listens for connections.
+        """
+        self.scheduler.start()
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]  # the port chosen by the OS if port was 0
+
+    async def serve_forever(self):
+        """
+        Starts the server and handles connections until it's cancelled.
+        """
+        await self.start()
+        print(f"Serving on {self.host}:{self.port} with {self.scheduler.workers} search processes")
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Stops listening for connections and stops the worker processes.
+        """
+        if self.server is not None:
+            self.server.close()
+        self.scheduler.close()
+
+    async def wait_closed(self):
+        """
+        Waits for the connections still open once the server is closed to be disconnected by their clients.
+        """
+        if self.connections:
+            await asyncio.wait(self.connections)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Answers the commands of a connection until it disconnects, and then closes its games.
+        :param reader: a StreamReader, of the connection
+        :param writer: a StreamWriter, of the connection
+        """
+        game_ids = set()
+        self.connections.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle_line(line, game_ids)
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game_id in game_ids:
+                self.sessions.pop(game_id, None)
+            self.connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def handle_line(self, line: bytes, game_ids: set) -> dict:
+        """
+        Answers a command.
+        :param line: a bytes, of the command as a line of JSON
+        :param game_ids: a set, of the ids of the games of the connection
+        :return: a dictionary, of the response
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("the command isn't a JSON object")
+            command = request.get("command")
+            if command == "new":
+                response = await self.new_game(request, game_ids)
+            elif command == "stats":
+                response = self.get_stats()
+            elif command in ("move", "state", "close"):
+                session = self.get_session(request, game_ids)
+                async with session.lock:
+                    if command == "move":
+                        response = await self.make_move(session, request)
+                    elif command == "state":
+                        response = session.to_dict()
+                    else:
+                        game_ids.discard(session.game_id)
+                        self.sessions.pop(session.game_id, None)
+                        response = {"game": session.game_id}
+            else:
+                raise ValueError(f"unknown command {command}")
+        except (ValueError, TypeError, KeyError) as error:
+            return {"ok": False, "error": str(error)}
+        return dict(response, ok=True)
+
+    def get_session(self, request: dict, game_ids: set) -> GameSession:
+        """
+        Gets the game a command is for, which has to be one of the connection's games.
+        :param request: a dictionary, of the command
+        :param game_ids: a set, of the ids of the games of the connection
+        :return: a GameSession
+        :raise ValueError: if the game isn't one of the connection's games
+        """
+        game_id = request.get("game")
+        if game_id not in game_ids or game_id not in self.sessions:
+            raise ValueError(f"unknown game {game_id}")
+        return self.sessions[game_id]
+
+    async def new_game(self, request: dict, game_ids: set) -> dict:
+        """
+        Starts a game, and makes the AI's first move if the AI is black.
+        :param request: a dictionary, of the new command
+        :param game_ids: a set, of the ids of the games of the connection
+        :return: a dictionary, of the response
+        """
+        settings = {key: request.get(key, value) for key, value in DEFAULT_GAME.items()}
+        if settings["layout"] not in LAYOUTS:
+            raise ValueError(f"unknown layout {settings['layout']}")
+        if settings["color"] not in ("black", "white"):
+            raise ValueError(f"unknown color {settings['color']}")
+        if self.max_games is not None and len(self.sessions) >= self.max_games:
+            raise ValueError("the server is hosting as many games as it can")
+
+        session = GameSession(next(self.game_ids), settings["layout"], settings["color"], int(settings["turns"]),
+                              float(settings["time"]),
+                              None if settings["budget"] is None else float(settings["budget"]),
+                              int(settings["priority"]))
+        self.sessions[session.game_id] = session
+        game_ids.add(session.game_id)
+
+        async with session.lock:
+            ai_move = await self.make_ai_move(session) if session.turn == session.ai_color else None
+        return dict(session.to_dict(), ai_move=ai_move)
+
+    def get_stats(self) -> dict:
+        """
+        Gets the number of games hosted and the metrics of the scheduler.
+        :return: a dictionary
+        """
+        return {"games": len(self.sessions), "queued": self.scheduler.get_queue_length(),
+                "scheduler": self.scheduler.metrics.to_dict()}
+
+    async def make_move(self, session: GameSession, request: dict) -> dict:
+        """
+        Applies the client's move, and then the AI's reply.
+        :param session: a GameSession, of the game
+        :param request: a dictionary, of the move command
+        :return: a dictionary, of the response
+        """
+        move = session.validate_move(list(request["pieces"]), request["direction"])
+        session.apply_move(move)
+        ai_move = await self.make_ai_move(session) if session.result is None else None
+        return dict(session.to_dict(), ai_move=ai_move)
+
+    async def make_ai_move(self, session: GameSession) -> dict:
+        """
+        Searches for the AI's move with the scheduler, and applies it. Only the time spent searching is taken from the
+        game's budget, the time spent waiting for a worker process is the server's.
+        :param session: a GameSession, of the game
+        :return: a dictionary, of the AI's move in the notation of the protocol
+        """
+        board = session.get_board()
+        result = await self.scheduler.search(bytes(board.cells), session.ai_color, session.get_search_time_limit(),
+                                             session.priority)
+        if session.budget is not None:
+            session.budget = max(session.budget - result.compute_time, 0)
+
+        move = session.find_move_to(board, session.ai_color, CompactBoard(result.cells))
+        session.apply_move(move)
+        return dict(encode_move(move), time=result.queue_wait + result.compute_time, queue_wait=result.queue_wait)
+
+
+def main():
+    """
+    Runs the game server from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Hosts Abalone games between clients and the AI over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="the number of search processes")
+    parser.add_argument("--depth", type=int, default=10, help="the maximum search depth of the AI")
+    parser.add_argument("--max-games", type=int, default=None, help="the most games hosted at once")
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port, args.workers, {"max_depth": args.depth}, args.max_games)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
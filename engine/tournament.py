@@ -0,0 +1,281 @@
+import argparse
+import inspect
+import json
+import math
+import multiprocessing
+import os
+import zlib
+
+from random import Random
+from ai.ai import Minimax
+from board_state.layouts import LAYOUTS
+from engine.self_play import SelfPlayGame
+
+# the settings of a tournament not provided by its configuration file
+DEFAULT_CONFIG = {"format": "round_robin", "rounds": 1, "layouts": ["standard", "german", "belgian"], "turns": 30}
+
+# the settings of an entrant not provided by its configuration
+DEFAULT_ENTRANT = {"max_depth": 10, "time": 5, "weights": None, "search": "pvs", "quiescence": True}
+
+# the settings of an entrant passed to its Minimax instance, every setting of Minimax but its process pool, as the
+# games are already played in the processes of a pool
+MINIMAX_SETTINGS = set(inspect.signature(Minimax).parameters) - {"workers"}
+
+# the settings of an entrant used by the tournament itself
+ENTRANT_SETTINGS = {"name", "time"}
+
+BOOTSTRAP_SAMPLES = 200
+ELO_ITERATIONS = 200
+
+
+class Tournament:
+    """
+    Encapsulates a tournament of self-play games between Minimax players with different search settings and heuristic
+    weights, played across a process pool.
+
+    Every pairing of entrants plays a game from each starting layout with each entrant as black, for each round. The
+    result of each game is appended to the results file as a line of JSON as soon as it's played, and the games already
+    in the results file are skipped, so a tournament that was stopped or crashed is resumed by running it again. The id
+    of each game includes a checksum of the settings of both entrants, so the games of an entrant whose settings have
+    changed since are played again, and their old results are left out of the ratings.
+    """
+
+    def __init__(self, config: dict, results_path: str, workers=None):
+        self.config = dict(DEFAULT_CONFIG, **config)
+        self.entrants = {}
+        for entrant in self.config["entrants"]:
+            unknown_settings = set(entrant) - MINIMAX_SETTINGS - ENTRANT_SETTINGS
+            if unknown_settings:
+                raise ValueError(f"unknown settings {', '.join(sorted(unknown_settings))} of entrant "
+                                 f"{entrant.get('name')}")
+            self.entrants[entrant["name"]] = dict(DEFAULT_ENTRANT, **entrant)
+
+        # a checksum of the settings of each entrant, part of the id of its games
+        self.checksums = {name: f"{zlib.crc32(json.dumps(entrant, sort_keys=True).encode()):08x}"
+                          for name, entrant in self.entrants.items()}
+        self.results_path = results_path
+        self.workers = workers or os.cpu_count()
+
+    def get_pairings(self) -> list:
+        """
+        Gets the pairings of entrants. A round robin pairs every entrant with every other entrant, and a gauntlet pairs
+        the first entrant with every other entrant.
+        :return: a list, of tuples of the names of the two entrants
+        """
+        names = list(self.entrants)
+        if self.config["format"] == "gauntlet":
+            return [(names[0], name) for name in names[1:]]
+        return [(names[first], names[second]) for first in range(len(names)) for second in range(first + 1, len(names))]
+
+    def schedule_games(self) -> list:
+        """
+        Schedules the games of the tournament, rotating the colors and starting layouts of each pairing.
+        :return: a list, of dictionaries of the games to play
+        """
+        games = []
+        for round_number in range(self.config["rounds"]):
+            for first, second in self.get_pairings():
+                for layout in self.config["layouts"]:
+                    for black, white in ((first, second), (second, first)):
+                        game_id = f"{round_number}:{first}:{second}:{layout}:{black}:" \
+                                  f"{self.checksums[first]}:{self.checksums[second]}"
+                        games.append({"game_id": game_id, "black": self.entrants[black],
+                                      "white": self.entrants[white], "layout": layout, "turns": self.config["turns"],
+                                      "seed": zlib.crc32(game_id.encode())})
+        return games
+
+    def get_current_results(self, results: list) -> list:
+        """
+        Gets the results of the games scheduled by the tournament, leaving out the games of entrants that are no longer
+        in the tournament or whose settings have changed.
+        :param results: a list, of the results of the games
+        :return: a list, of the results of the scheduled games
+        """
+        scheduled = {game["game_id"] for game in self.schedule_games()}
+        return [result for result in results if result["game_id"] in scheduled]
+
+    def run(self) -> list:
+        """
+        Plays the games of the tournament not already in the results file, appending each result to the file as it's
+        played.
+        :return: a list, of the results of every game in the results file
+        """
+        results = read_results(self.results_path)
+        played = {result["game_id"] for result in self.get_current_results(results)}
+        games = [game for game in self.schedule_games() if game["game_id"] not in played]
+        print(f"{len(played)} games already played, {len(games)} games to play on {self.workers} processes")
+
+        with open(self.results_path, "a+") as results_file:
+            # a line cut short by a crash is ended, so the next result starts on its own line
+            if results_file.tell() > 0:
+                results_file.seek(results_file.tell() - 1)
+                if results_file.read(1) != "\n":
+                    results_file.write("\n")
+
+            with multiprocessing.Pool(self.workers) as pool:
+                for result in pool.imap_unordered(play_game, games):
+                    results_file.write(json.dumps(result) + "\n")
+                    results_file.flush()
+                    os.fsync(results_file.fileno())
+                    results.append(result)
+                    print(f"{len(results)}: {result['black']} vs {result['white']} ({result['layout']}), "
+                          f"winner {result['winner']}")
+
+        return results
+
+
+def play_game(game: dict) -> dict:
+    """
+    Plays a game of the tournament within a process of the process pool.
+    :param game: a dictionary, of the game to play
+    :return: a dictionary, of the result of the game
+    """
+    black, white = game["black"], game["white"]
+    black_player = Minimax(**{setting: value for setting, value in black.items() if setting in MINIMAX_SETTINGS})
+    white_player = Minimax(**{setting: value for setting, value in white.items() if setting in MINIMAX_SETTINGS})
+    self_play_game = SelfPlayGame(black_player, white_player, game["layout"], game["turns"],
+                                  (black["time"], white["time"]), seed=game["seed"])
+    result = self_play_game.play()
+
+    # the winner is recorded as the name of the entrant
+    winner = {"black": black["name"], "white": white["name"], None: None}[result["winner"]]
+    return dict(result, game_id=game["game_id"], black=black["name"], white=white["name"], winner=winner)
+
+
+def read_results(results_path: str) -> list:
+    """
+    Reads the results of the games already played from the results file, ignoring a line cut short by a crash.
+    :param results_path: a string, the path of the results file
+    :return: a list, of the results
+    """
+    results = []
+    if not os.path.exists(results_path):
+        return results
+
+    with open(results_path) as results_file:
+        for line in results_file:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                pass
+    return results
+
+
+def calculate_elo(results: list, names: list) -> dict:
+    """
+    Calculates the Elo rating of each entrant from the results of their games, with the ratings averaging 0. The
+    ratings are the maximum likelihood ratings of the Bradley-Terry model, counting ties as half a win, with a virtual
+    tie between every pairing so an entrant that won or lost every game keeps a finite rating. The games of entrants not
+    in names are skipped.
+    :param results: a list, of the results of the games
+    :param names: a list, of the names of the entrants
+    :return: a dictionary, of the rating of each entrant
+    """
+    scores = {name: 0.0 for name in names}
+    games = {name: {} for name in names}
+
+    for first in names:
+        for second in names:
+            if first != second:
+                games[first][second] = 1
+                scores[first] += 0.5
+
+    for result in results:
+        black, white = result["black"], result["white"]
+        if black not in games or white not in games:
+            continue
+        games[black][white] += 1
+        games[white][black] += 1
+        if result["winner"] is None:
+            scores[black] += 0.5
+            scores[white] += 0.5
+        else:
+            scores[result["winner"]] += 1
+
+    # iteratively updates the strength of each entrant, the rating is 400 times its base 10 logarithm
+    strengths = {name: 1.0 for name in names}
+    for _ in range(ELO_ITERATIONS):
+        for name in names:
+            expected = sum(count / (strengths[name] + strengths[opponent])
+                           for opponent, count in games[name].items())
+            if expected > 0:
+                strengths[name] = scores[name] / expected
+
+    ratings = {name: 400 * math.log10(strengths[name]) for name in names}
+    mean_rating = sum(ratings.values()) / len(ratings)
+    return {name: rating - mean_rating for name, rating in ratings.items()}
+
+
+def report_elo(results: list, names: list, seed=0) -> list:
+    """
+    Calculates the Elo rating of each entrant, with a 95% confidence interval from resampling the games.
+    :param results: a list, of the results of the games
+    :param names: a list, of the names of the entrants
+    :param seed: an int, the seed of the resampling
+    :return: a list, of tuples of the name, games, score, rating, and lower and upper bound of the rating
+    """
+    ratings = calculate_elo(results, names)
+    random = Random(seed)
+    samples = {name: [] for name in names}
+    for _ in range(BOOTSTRAP_SAMPLES):
+        sample = [random.choice(results) for _ in results]
+        for name, rating in calculate_elo(sample, names).items():
+            samples[name].append(rating)
+
+    report = []
+    for name in names:
+        games = [result for result in results if name in (result["black"], result["white"])]
+        score = sum(1 if result["winner"] == name else 0.5 if result["winner"] is None else 0 for result in games)
+        sample = sorted(samples[name])
+        lower = sample[int(0.025 * (len(sample) - 1))]
+        upper = sample[int(0.975 * (len(sample) - 1))]
+        report.append((name, len(games), score, ratings[name], lower, upper))
+
+    return sorted(report, key=lambda row: row[3], reverse=True)
+
+
+def main():
+    """
+    Runs, or resumes, a tournament from the command line, and prints the Elo rating of each entrant.
+
+    The configuration file is a JSON object with a list of entrants, e.g.
+    {"entrants": [{"name": "default"}, {"name": "center", "weights": {"score": 50, "center": 20, "push": 25,
+    "group": 3}}], "format": "round_robin", "rounds": 2}. Each entrant can set its time, and any setting of Minimax
+    but workers, e.g. max_depth, weights, search ("alpha_beta" or "pvs"), quiescence (true or false), backend,
+    tt_size_mb, move_ordering, eval_cache_entries, and opening_book.
+    """
+    parser = argparse.ArgumentParser(description="Plays a tournament of Abalone games between AI players.")
+    parser.add_argument("config", help="the JSON configuration file of the tournament")
+    parser.add_argument("results", help="the file the results of the games are appended to")
+    parser.add_argument("--workers", type=int, default=None, help="the number of processes, defaults to every core")
+    parser.add_argument("--report", action="store_true", help="only reports the ratings from the results file")
+    args = parser.parse_args()
+
+    with open(args.config) as config_file:
+        config = json.load(config_file)
+    for layout in config.get("layouts", []):
+        if layout not in LAYOUTS:
+            parser.error(f"unknown layout {layout}")
+
+    try:
+        tournament = Tournament(config, args.results, args.workers)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.report:
+        results = read_results(args.results)
+    else:
+        results = tournament.run()
+
+    current_results = tournament.get_current_results(results)
+    if len(current_results) < len(results):
+        print(f"{len(results) - len(current_results)} results of entrants no longer in the tournament, or whose "
+              f"settings have changed, are left out")
+    results = current_results
+
+    print(f"{'Entrant':<20}{'Games':>8}{'Score':>8}{'Elo':>8}{'95% CI':>18}")
+    for name, games, score, rating, lower, upper in report_elo(results, list(tournament.entrants)):
+        print(f"{name:<20}{games:>8}{score:>8.1f}{rating:>8.0f}{f'[{lower:.0f}, {upper:.0f}]':>18}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,21 @@
 import math
+import os
 import random
 
 from tkinter import messagebox
+from concurrent.futures import ThreadPoolExecutor
 from ai.ai import *
+from ai.opening_book import DEFAULT_BOOK_PATH
+from ai.ponder import Ponderer
 from utils.settings import *
 from utils.converter import Converter
 from utils.move import Move
+from board_state.layouts import *
 from copy import deepcopy
 
+# how often, in milliseconds, the GUI checks if the AI's search running in the background has found its move
+AI_POLL_INTERVAL = 50
+
 
 class GameBoard(tk.Tk):
     """
@@ -65,7 +73,14 @@ class GameBoard(tk.Tk):
         self.current_move_timer_label = None
 
         # ----- AI ----- #
-        self.Minimax = Minimax()
+        # the opening book is used once it has been built with engine/book_builder.py
+        self.Minimax = Minimax(opening_book=DEFAULT_BOOK_PATH if os.path.exists(DEFAULT_BOOK_PATH) else None)
+        self.ponderer = Ponderer(self.Minimax)  # searches on the human player's time
+        # the AI's searches run on a background thread, so the GUI keeps responding while the AI is thinking
+        self.ai_executor = ThreadPoolExecutor(max_workers=1)
+        self.ai_search = None  # the future of the AI's search in progress, or None
+        self.ai_start = None  # the start time of the AI's search in progress
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
         self.ai_moved_pieces = []
         self.human_vs_human = False
 
@@ -119,6 +134,8 @@ class GameBoard(tk.Tk):
         """
         DEBUG_PRINT_STATEMENTS = False  # setting to True enables print statements that contain additional Click & Piece information
         RANGE = 20
+        if self.ai_search is not None:
+            return  # the game board is the AI's until its move is applied
         # Timer check for human player
         if self.turn == "black":
             turn_timer = self.settings_selections['time1']
@@ -437,7 +454,8 @@ class GameBoard(tk.Tk):
         """
         Performs an undo from before the latest move was made.
         """
-        if len(self.previous_board_states) > 0:
+        if len(self.previous_board_states) > 0 and self.ai_search is None:  # waits for the AI's move
+            self.ponderer.stop()  # the position pondered is undone
             previous_state = self.previous_board_states.pop()
 
             # deletes content within the black & white, timer & moves box
@@ -529,15 +547,19 @@ class GameBoard(tk.Tk):
 
     def apply_ai(self):
         """
-        Gets the AI's move, and then redraws the game board with the AI's new move.
+        Starts the AI's search for its move in the background, the move is applied by finish_ai_move once it's found.
         """
         if not self.human_vs_human:
+            if self.ai_search is not None:
+                return  # the AI is already searching for its move
+
+            self.ponderer.stop()  # the AI's search uses the values found while pondering
             self.store_last_move()  # stores the last AI move
 
             self.increment_turn_count()  # increments turn count of current turn turn_color
             # self.update_timer()
 
-            start = time.perf_counter()
+            self.ai_start = time.perf_counter()
 
             self.turn = Converter.get_opposite_color(self.turn)  # turn turn_color change
             if self.turn == "black":
@@ -545,38 +567,106 @@ class GameBoard(tk.Tk):
             else:
                 turn_timer = self.settings_selections['time2']
 
-            result = self.Minimax.alpha_beta(["move", self.game_board, self.turn, 0, start, turn_timer])  # gets move and board from ai choice
-            self.game_board = result[1]  # ai selected board
-            selected_move = result[0]  # the move needs to print to the game console and show highlighted ai pieces
-            time_taken = time.perf_counter() - start
+            # searches on the background thread, with its own copy of the game board, and polls for the result
+            self.ai_search = self.ai_executor.submit(self.Minimax.alpha_beta, ["move", deepcopy(self.game_board),
+                                                                               self.turn, 0, self.ai_start, turn_timer])
+            self.after(AI_POLL_INTERVAL, self.poll_ai, self.ai_search)
+        else:  # handles Human vs Human
+            self.store_last_move()  # stores the last AI move
+            self.increment_turn_count()  # increments turn count of current turn turn_color
+            self.turn = Converter.get_opposite_color(self.turn)  # turn turn_color change
+            self.player_info()
+        self.human_start = time.perf_counter()
 
-            print("Ai selected move" + str(selected_move))
+    def poll_ai(self, search):
+        """
+        Checks if the AI's search has found its move, and applies the move if it has, otherwise checks again later.
+        :param search: a Future, of the AI's search
+        """
+        if search is not self.ai_search:
+            return  # the search was cancelled, its move is discarded
+        if not search.done():
+            self.after(AI_POLL_INTERVAL, self.poll_ai, search)
+            return
 
-            # redraws new game board generated from AI within ai.py from line above
-            self.draw_game_board()
-            update = self.update_timerbox_and_moves_for_color()
-            update[0].insert(END, f"{time_taken:.5f}")
-            update[1].insert(END, selected_move[:3])
-            self.update_time(time_taken)
-            self.update_total_time()
+        result = search.result()
+        self.ai_search = None
+        self.Minimax.stop_event.clear()  # in case the search was stopped with Move Now
+        self.finish_ai_move(result)
 
-            self.initialize_game_board_pieces()
-            self.increment_turn_count()  # increments turn count of current turn turn_color
-            self.player_info()
+    def finish_ai_move(self, result: tuple):
+        """
+        Applies the AI's move, and then redraws the game board with the AI's new move.
+        :param result: a tuple, of the move in move notation, the updated game board, and the SearchStats of the search
+        """
+        self.game_board = result[1]  # ai selected board
+        selected_move = result[0]  # the move needs to print to the game console and show highlighted ai pieces
+        time_taken = time.perf_counter() - self.ai_start
 
-            self.highlight_ai_move(selected_move)  # highlights the AI move yellow
+        print("Ai selected move" + str(selected_move))
 
-            self.turn = Converter.get_opposite_color(self.turn)  # turn turn_color change
-            self.human_start = time.perf_counter()
+        # redraws new game board generated from AI within ai.py from line above
+        self.draw_game_board()
+        update = self.update_timerbox_and_moves_for_color()
+        update[0].insert(END, f"{time_taken:.5f}")
+        update[1].insert(END, selected_move[:3])
+        self.update_time(time_taken)
+        self.update_total_time()
 
-            self.update_piece_count()
-        else:  # handles Human vs Human
-            self.store_last_move()  # stores the last AI move
-            self.increment_turn_count()  # increments turn count of current turn turn_color
-            self.turn = Converter.get_opposite_color(self.turn)  # turn turn_color change
-            self.player_info()
+        self.initialize_game_board_pieces()
+        self.increment_turn_count()  # increments turn count of current turn turn_color
+        self.player_info()
+
+        self.highlight_ai_move(selected_move)  # highlights the AI move yellow
+
+        ai_color = self.turn
+        self.turn = Converter.get_opposite_color(self.turn)  # turn turn_color change
         self.human_start = time.perf_counter()
 
+        self.update_piece_count()
+        self.start_pondering(ai_color)
+
+        # the next AI's search is started once the GUI has redrawn the move
+        if self.settings_selections["mode_p1"] == "Computer" and self.settings_selections["mode_p2"] == "Computer":
+            self.turn = Converter.get_opposite_color(self.turn)
+            self.after(AI_POLL_INTERVAL, self.ai_vs_ai)
+
+    def move_now(self):
+        """
+        Stops the AI's search, so it plays the best move found by its last completed iteration.
+        """
+        if self.ai_search is not None:
+            self.Minimax.stop()
+
+    def cancel_ai(self):
+        """
+        Stops the AI's search and discards its move, without waiting for the search to stop. The stopped search keeps
+        its Minimax instance until it returns, and the AI carries on with a new instance with the same settings.
+        """
+        if self.ai_search is not None:
+            self.Minimax.stop()
+            self.ai_search = None  # poll_ai discards the move of the stopped search
+            self.Minimax = Minimax(**self.Minimax.get_settings())
+            self.ponderer = Ponderer(self.Minimax)
+
+    def close_window(self):
+        """
+        Stops the AI's search and pondering, and closes the window. The background thread of the AI's searches isn't
+        waited for, it's left to finish the node it's searching.
+        """
+        self.ponderer.stop()
+        self.Minimax.stop()
+        self.ai_executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
+    def start_pondering(self, ai_color: str):
+        """
+        Starts the AI searching on the human player's time, if a human player is playing against the AI.
+        :param ai_color: a string, the AI's turn_color
+        """
+        if "Human" in (self.settings_selections["mode_p1"], self.settings_selections["mode_p2"]):
+            self.ponderer.start(self.game_board, ai_color)
+
     def update_piece_count(self):
         """
         Updates the piece count (or pieces lost) for the human player when playing against the AI.
@@ -1046,150 +1136,21 @@ class GameBoard(tk.Tk):
         Initializes the game board array representing the game board with the game pieces of each turn_color in the standard,
         default, layout.
         """
-        lines_to_fill = 2
-
-        for row in range(lines_to_fill):
-            row_key = "row" + str(row)
-
-            for col in range(Converter.calculate_row_length(row)):
-                self.game_board.get(row_key)[col].update({"turn_color": "white"})
-
-                if row == 1:  # populates front 3 white pieces
-                    for nested_col in range(2, 5):
-                        self.game_board.get("row2")[nested_col].update({"turn_color": "white"})
-
-        for row in range(7, 9):
-            row_key = "row" + str(row)
-
-            if (row - 1) == 6:  # populates front 3 black pieces
-                for nested_col in range(2, 5):
-                    self.game_board.get("row6")[nested_col].update({"turn_color": "black"})
-            for col in range(Converter.calculate_row_length(row)):
-                self.game_board.get(row_key)[col].update({"turn_color": "black"})
+        initialize_default_layout(self.game_board)
 
     def initialize_german_layout(self):
         """
         Initializes the game board array representing the game board with the game pieces of each turn_color in the German
         daisy layout.
         """
-        ZERO_INDEX_OFFSET = 1
-        lines_to_fill = 2 + ZERO_INDEX_OFFSET
-
-        # populates top half of the game board (rows I to F)
-        for row in range(lines_to_fill):
-            row_key = "row" + str(row)
-
-            for col in range(Converter.calculate_row_length(row)):
-
-                if row == 0:  # populates game pieces on the first row (row I)
-                    if col in range(0, 1 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on first row (row I)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
-
-                    if col in range(3, 4 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on first row (row I)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-                if row == 1:  # populates game pieces on the second row (row H)
-                    if col in range(0, 2 + ZERO_INDEX_OFFSET):  # populates 3 white pieces on second row (row H)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
-
-                    if col in range(3, 5 + ZERO_INDEX_OFFSET):  # populates 3 black pieces on second row (row H)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-                if row == 2:  # populates game pieces on the third row (row G)
-                    if col in range(1, 2 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on third row (row G)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
-
-                    if col in range(4, 5 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on third row (row G)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-        # populates lower half of the game board (rows C to D)
-        for row in range(6, 8 + ZERO_INDEX_OFFSET):
-            row_key = "row" + str(row)
-
-            for col in range(Converter.calculate_row_length(row)):
-
-                if row == 6:  # populates game pieces on the seventh row (row C)
-                    if col in range(1, 2 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on seventh row (row C)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-                    if col in range(4, 5 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on seventh row (row C)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
-
-                if row == 7:  # populates game pieces on the eighth row (row B)
-                    if col in range(0, 2 + ZERO_INDEX_OFFSET):  # populates 3 black pieces on eighth row (row B)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-                    if col in range(3, 5 + ZERO_INDEX_OFFSET):  # populates 3 white pieces on eighth row (row B)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
-
-                if row == 8:  # populates game pieces on the ninth row (row A)
-                    if col in range(0, 1 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on ninth row (row A)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-                    if col in range(3, 4 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on ninth row (row A)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
+        initialize_german_layout(self.game_board)
 
     def initialize_belgian_layout(self):
         """
         Initializes the game board array representing the game board with the game pieces of each turn_color in the Belgian
         daisy layout.
         """
-        ZERO_INDEX_OFFSET = 1
-        lines_to_fill = 3 + ZERO_INDEX_OFFSET
-
-        # populates top half of the game board (rows I to F)
-        for row in range(1, lines_to_fill):
-            row_key = "row" + str(row)
-
-            for col in range(Converter.calculate_row_length(row)):
-
-                if row == 1:  # populates game pieces on the second row (row H)
-                    if col in range(0, 1 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on second row (row H)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
-
-                    if col in range(4, 5 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on second row (row H)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-                if row == 2:  # populates game pieces on the third row (row G)
-                    if col in range(0, 2 + ZERO_INDEX_OFFSET):  # populates 3 white pieces on second row (row HG)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
-
-                    if col in range(4, 6 + ZERO_INDEX_OFFSET):  # populates 3 black pieces on second row (row G)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-                if row == 3:  # populates game pieces on the fourth row (row F)
-                    if col in range(1, 2 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on second row (row F)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
-
-                    if col in range(5, 6 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on second row (row F)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-        # populates lower half of the game board (rows C to D)
-        for row in range(5, 7 + ZERO_INDEX_OFFSET):
-            row_key = "row" + str(row)
-
-            for col in range(Converter.calculate_row_length(row)):
-
-                if row == 5:  # populates game pieces on the sixth row (row D)
-                    if col in range(1, 2 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on second row (row D)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-                    if col in range(5, 6 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on second row (row D)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
-
-                if row == 6:  # populates game pieces on the seventh row (row C)
-                    if col in range(0, 2 + ZERO_INDEX_OFFSET):  # populates 3 black pieces on second row (row C)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-                    if col in range(4, 6 + ZERO_INDEX_OFFSET):  # populates 3 white pieces on second row (row C)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
-
-                if row == 7:  # populates game pieces on the eighth row (row B)
-                    if col in range(0, 1 + ZERO_INDEX_OFFSET):  # populates 2 black pieces on second row (row B)
-                        self.game_board[row_key][col].update({"turn_color": "black"})
-
-                    if col in range(4, 5 + ZERO_INDEX_OFFSET):  # populates 2 white pieces on second row (row B)
-                        self.game_board[row_key][col].update({"turn_color": "white"})
+        initialize_belgian_layout(self.game_board)
 
     def initialize_game_board_array(self):
         """
@@ -1254,12 +1215,13 @@ class GameBoard(tk.Tk):
         return random_state[0]
 
     def ai_vs_ai(self):
-        while True:
-            if self.check_win():
-                break
-            self.apply_ai()
-            self.turn = Converter.get_opposite_color(self.turn)
-            self.update()  # forces tkinter to re-draw the new board despite being blocked by the while-loop
+        """
+        Starts the next AI's search of a Computer vs Computer game, each AI's move starts the next search once it's
+        applied, see finish_ai_move.
+        """
+        if self.check_win():
+            return
+        self.apply_ai()
 
     def check_win(self):
 
@@ -1304,6 +1266,7 @@ class GameBoard(tk.Tk):
             selected_move = self.make_random_first_move()
             self.highlight_ai_move(selected_move)
             self.turn = "white"
+            self.start_pondering("black")
 
         elif p1_settings == "Human" and p2_settings == "Human":
             # P1 color selected is only applied in the Human vs Human game mode
@@ -1443,6 +1406,8 @@ class GameBoard(tk.Tk):
         undo = Button(frame, text="Undo Last", width=10, bg=self.bg, font=font2, fg=self.font_color, command=self.undo_last_move)
         settings = Button(frame, text="Settings", width=10, bg=self.bg, font=font2, fg=self.font_color,
                           command=self.settings_set_up)
+        move_now = Button(frame, text="Move Now", width=10, bg=self.bg, font=font2, fg=self.font_color,
+                          command=self.move_now)
 
         frame.grid(row=13, columnspan=5, sticky=W, padx=30)
         start.grid(row=13, column=2, padx=3)
@@ -1451,6 +1416,7 @@ class GameBoard(tk.Tk):
         reset.grid(row=13, column=5, padx=3)
         undo.grid(row=13, column=6, padx=3)
         settings.grid(row=13, column=7, padx=3)
+        move_now.grid(row=13, column=8, padx=3)
 
     def settings_set_up(self):
         """
@@ -1484,6 +1450,8 @@ class GameBoard(tk.Tk):
         self.apply_game_mode()
 
     def reset_game(self):
+        self.cancel_ai()
+        self.ponderer.stop()
         self.apply_draw_game_board_layout()
         self.white_move_count = self.settings_selections['turns']
         self.black_move_count = self.settings_selections['turns']
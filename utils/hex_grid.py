@@ -0,0 +1,127 @@
+from utils.converter import Converter
+
+NUM_OF_ROWS = 9
+NUM_OF_CELLS = 61
+OFF_BOARD = -1
+
+# the longest line of spaces used by a move, a grouping of 3 game pieces or a sumito of 3 game pieces pushing 2
+RAY_LENGTH = 3
+
+# directions are indexed in the same order as Move.directions
+DIRECTIONS = ("NE", "E", "SE", "SW", "W", "NW")
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(DIRECTIONS)}
+MOVE_DIRECTIONS = ((-1, 1), (0, 1), (1, 1), (1, -1), (0, -1), (-1, -1))
+OPPOSITE_DIRECTION = (3, 4, 5, 0, 1, 2)
+
+
+def _build_cell_tables() -> tuple:
+    """
+    Assigns every space on the game board a cell id, ordered from the top row (row I) to the bottom row (row A) and
+    from west to east within each row.
+
+    :return: a tuple of (row numbers, column numbers, row keys, external notation, cell id lookup)
+    """
+    cell_rows = []
+    cell_cols = []
+    cell_row_keys = []
+    cell_external = []
+    cell_ids = {}
+
+    for row in range(NUM_OF_ROWS):
+        row_key = Converter.convert_row_to_string_or_int(row)
+
+        for col in range(Converter.calculate_row_length(row)):
+            cell_ids[(row_key, col)] = len(cell_rows)
+            cell_rows.append(row)
+            cell_cols.append(col)
+            cell_row_keys.append(row_key)
+            cell_external.append(Converter.internal_notation_to_external(row, col))
+
+    return tuple(cell_rows), tuple(cell_cols), tuple(cell_row_keys), tuple(cell_external), cell_ids
+
+
+def _build_neighbor_table() -> tuple:
+    """
+    Calculates the cell id of the adjacent space in each of the six directions for every cell on the game board.
+
+    :return: a tuple of tuples, indexed by [cell][direction], containing the adjacent cell id or OFF_BOARD
+    """
+    neighbors = []
+
+    for cell in range(NUM_OF_CELLS):
+        row, col = CELL_ROW[cell], CELL_COL[cell]
+        cell_neighbors = []
+
+        for direction_tuple in MOVE_DIRECTIONS:
+            adjacent_space = Converter.simulate_game_piece_movement(row, col, direction_tuple)
+            cell_neighbors.append(CELL_ID.get(adjacent_space, OFF_BOARD))
+
+        neighbors.append(tuple(cell_neighbors))
+
+    return tuple(neighbors)
+
+
+def _build_ray_table() -> tuple:
+    """
+    Follows the adjacent spaces in each of the six directions for every cell on the game board, up to RAY_LENGTH
+    spaces away or until the edge of the game board.
+
+    :return: a tuple of tuples, indexed by [cell][direction], containing a tuple of the cell ids along the ray
+    """
+    rays = []
+
+    for cell in range(NUM_OF_CELLS):
+        cell_rays = []
+
+        for direction in range(len(DIRECTIONS)):
+            ray = []
+            space = NEIGHBORS[cell][direction]
+            while space != OFF_BOARD and len(ray) < RAY_LENGTH:
+                ray.append(space)
+                space = NEIGHBORS[space][direction]
+            cell_rays.append(tuple(ray))
+
+        rays.append(tuple(cell_rays))
+
+    return tuple(rays)
+
+
+CELL_ROW, CELL_COL, CELL_ROW_KEY, CELL_EXTERNAL, CELL_ID = _build_cell_tables()
+ROW_KEYS = tuple(Converter.convert_row_to_string_or_int(row) for row in range(NUM_OF_ROWS))
+EXTERNAL_TO_CELL = {external: cell for cell, external in enumerate(CELL_EXTERNAL)}
+NEIGHBORS = _build_neighbor_table()
+RAYS = _build_ray_table()
+
+
+def get_cell(row, col: int) -> int:
+    """
+    Gets the cell id of a space in internal notation.
+
+    :param row: a string of the row key, or an int of the row number
+    :param col: an int of the column number
+    :return: an int, the cell id, or OFF_BOARD if the space isn't on the game board
+    """
+    if type(row) == int:
+        if row not in range(NUM_OF_ROWS):
+            return OFF_BOARD
+        row = ROW_KEYS[row]
+    return CELL_ID.get((row, col), OFF_BOARD)
+
+
+def get_adjacent_space(row, col: int, direction: str):
+    """
+    Gets the space adjacent to a space in internal notation, in the specified direction.
+
+    :param row: a string of the row key, or an int of the row number
+    :param col: an int of the column number
+    :param direction: a string, the cardinal direction (e.g. "NE")
+    :return: a tuple (str, int) of the row key and column number, or None if the space is off the game board
+    """
+    cell = get_cell(row, col)
+    if cell == OFF_BOARD:
+        return None
+
+    adjacent_cell = NEIGHBORS[cell][DIRECTION_INDEX[direction]]
+    if adjacent_cell == OFF_BOARD:
+        return None
+    return CELL_ROW_KEY[adjacent_cell], CELL_COL[adjacent_cell]
@@ -1,4 +1,5 @@
 from utils.converter import Converter
+from utils.hex_grid import *
 from copy import deepcopy
 
 
@@ -61,27 +62,9 @@ class Move:
         :param num_pieces_selected: an int, the number of currently selected game pieces
         :return: a set, of the adjacent game spaces
         """
-        adjacent_spaces = set()
-
-        # if the row key is passed, then it is converted to the row number
-        if type(row) != int:
-            row = Converter.convert_row_to_string_or_int(row)
-
-        # iterates through all possible directions around a given game piece
-        for direction in self.directions:
-            # gets the direction coordinate tuple, and gets the adjusted direction tuple
-            direction_tuple = self.move_directions[direction]
-            adjusted_direction_tuple = Converter.calculate_adjusted_direction_tuple(row, direction_tuple)
-
-            # gets the internal notation of the adjacent piece
-            adjacent_space_internal = Converter.simulate_game_piece_movement(row, col, adjusted_direction_tuple)
-
-            # converts the internal notation to external notation
-            adjacent_space_external = Converter.internal_notation_to_external(adjacent_space_internal[0], adjacent_space_internal[1])
-
-            adjacent_spaces.add(adjacent_space_external)
-
-        adjacent_spaces = self.clean_adjacent_space_set(adjacent_spaces)
+        # gets the adjacent spaces within the game board from the precomputed neighbour table
+        cell = get_cell(row, col)
+        adjacent_spaces = {CELL_EXTERNAL[adjacent_cell] for adjacent_cell in NEIGHBORS[cell] if adjacent_cell != OFF_BOARD}
         return adjacent_spaces
 
     def get_dir_of_selected_pieces(self, selected_pieces: list) -> list:
@@ -176,22 +159,9 @@ class Move:
             # iterates over all adjacent spaces and filters out spaces that are occupied
             for space in adjacent_spaces:
                 # converts external notation of current space on game board to internal notation
-                space_internal_tuple = Converter.external_notation_to_internal(space)
-
-                try:
-                    # extracts the row key and column number from the tuple
-                    row_key = space_internal_tuple[0]
-                    col_num = space_internal_tuple[1]
-
-                    adjacent_space_color = game_board[row_key][col_num]["turn_color"]
-
-                    # means the adjacent space is unoccupied, if column number is < 0 then it is off the game board
-                    if adjacent_space_color == None and col_num >= 0:
-                        unoccupied_game_spaces.add(space)
-
-                # means the adjacent space is off the game board
-                except (IndexError, KeyError, TypeError):
-                    pass
+                cell = EXTERNAL_TO_CELL[space]
+                if game_board[CELL_ROW_KEY[cell]][CELL_COL[cell]]["turn_color"] is None:
+                    unoccupied_game_spaces.add(space)
 
         return unoccupied_game_spaces
 
@@ -240,17 +210,14 @@ class Move:
                 row = piece[0]
                 col = piece[1]
 
-                # gets the adjusted direction tuple and then gets the piece adjacent to the selected piece(s)
-                adjusted_dir_tuple = self.get_adjusted_tuple_or_cardinal_dir(row, cardinal_dir=dir)
-                adjacent_space = Converter.simulate_game_piece_movement(row, col, adjusted_dir_tuple)
+                # gets the piece adjacent to the selected piece(s), or None if it's off the game board
+                adjacent_space = get_adjacent_space(row, col, dir)
 
                 # checks if the grouping can make a valid sidestep to spaces that are unoccupied
-                try:
-                    if is_valid_move and game_board[adjacent_space[0]][adjacent_space[1]]["turn_color"] == None:
-                        temp_grouping.append(adjacent_space)
-                    else:
-                        is_valid_move = False
-                except (IndexError, KeyError):
+                if is_valid_move and adjacent_space is not None \
+                        and game_board[adjacent_space[0]][adjacent_space[1]]["turn_color"] == None:
+                    temp_grouping.append(adjacent_space)
+                else:
                     is_valid_move = False
 
             # if all selected pieces have unoccupied spaces in the direction of movement, it's added as a valid sidestep
@@ -275,65 +242,25 @@ class Move:
         """
         valid_moves = {}
 
-        # gets the row and column number, and direction tuple for both the first and last selected game piece
-        first_selected_row_num = Converter.convert_row_to_string_or_int(first_selected[0])
-        first_selected_col_num = first_selected[1]
-        last_selected_row_num = Converter.convert_row_to_string_or_int(last_selected[0])
-        last_selected_col_num = last_selected[1]
-
-        # get the space in front of the first and last selected piece
-        first_dir_tuple = self.get_adjusted_tuple_or_cardinal_dir(first_selected_row_num, cardinal_dir=vector_of_dir[0])
-
-        space_infront_first = Converter.simulate_game_piece_movement(first_selected_row_num, first_selected_col_num, first_dir_tuple)
-        space_infront_first_row_key = space_infront_first[0]
-        space_infront_first_col_num = space_infront_first[1]
-        # ensures column number isn't off the game board
-        if space_infront_first_col_num >= 0:
+        # gets the space in front of the first and last selected piece, in their direction of movement
+        for selected, direction in ((first_selected, vector_of_dir[0]), (last_selected, vector_of_dir[1])):
+            space_infront = get_adjacent_space(selected[0], selected[1], direction)
 
-            # if IndexError or KeyError is raised, then space is off the game board
-            try:
-                # gets the value of the space to move to
-                infront_first_val = game_board[space_infront_first_row_key][space_infront_first_col_num]["turn_color"]
-
-                # ensures that the space isn't occupied by piece of current turn turn_color
-                if infront_first_val != turn_color:
-                    valid_piece = Converter.internal_notation_to_external(space_infront_first_row_key,
-                                                                          space_infront_first_col_num)
-
-                    # if space is unoccupied, then it is added as an inline move
-                    if infront_first_val == None:
-                        valid_moves.update({valid_piece: "inline"})
-                    # if space is occupied by opposing turn_color, then it is added as a sumito
-                    elif infront_first_val == Converter.get_opposite_color(turn_color):
-                        valid_moves.update({valid_piece: "sumito"})
-            except (IndexError, KeyError):
-                pass
-
-        last_dir_tuple = self.get_adjusted_tuple_or_cardinal_dir(last_selected_row_num, cardinal_dir=vector_of_dir[1])
-        space_infront_last = Converter.simulate_game_piece_movement(last_selected_row_num, last_selected_col_num,
-                                                                    last_dir_tuple)
-        space_infront_last_row_key = space_infront_last[0]
-        space_infront_last_col_num = space_infront_last[1]
-        # ensures column number isn't off the game board
-        if space_infront_last_col_num >= 0:
-            # if IndexError or KeyError is raised, then space is off the game board
-            try:
+            # ensures the space isn't off the game board
+            if space_infront is not None:
                 # gets the value of the space to move to
-                infront_last_val = game_board[space_infront_last_row_key][space_infront_last_col_num]["turn_color"]
+                infront_val = game_board[space_infront[0]][space_infront[1]]["turn_color"]
 
                 # ensures that the space isn't occupied by piece of current turn turn_color
-                if infront_last_val != turn_color:
-                    valid_piece = Converter.internal_notation_to_external(space_infront_last_row_key,
-                                                                          space_infront_last_col_num)
+                if infront_val != turn_color:
+                    valid_piece = CELL_EXTERNAL[CELL_ID[space_infront]]
 
                     # if space is unoccupied, then it is added as an inline move
-                    if infront_last_val == None:
+                    if infront_val == None:
                         valid_moves.update({valid_piece: "inline"})
                     # if space is occupied by opposing turn_color, then it is added as a sumito
-                    elif infront_last_val == Converter.get_opposite_color(turn_color):
+                    elif infront_val == Converter.get_opposite_color(turn_color):
                         valid_moves.update({valid_piece: "sumito"})
-            except (IndexError, KeyError):
-                pass
 
         return valid_moves
 